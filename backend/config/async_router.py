@@ -0,0 +1,23 @@
+from django.urls import path
+
+from portfolio import async_views as portfolio_views
+from users import async_views as users_views
+
+# Асинхронні версії публічних ендпоінтів читання (config.async_views),
+# підключені під /api/v1/async/
+urlpatterns = [
+    # users
+    path('profiles/by-username/<str:username>/', users_views.ProfileByUsernameView.as_view(),
+         name='async-profile-by-username'),
+
+    # portfolio
+    path('projects/', portfolio_views.ProjectListView.as_view(), name='async-project-list'),
+    path('projects/<int:pk>/', portfolio_views.ProjectDetailView.as_view(), name='async-project-detail'),
+    path('experience/', portfolio_views.ExperienceListView.as_view(), name='async-experience-list'),
+    path('experience/<int:pk>/', portfolio_views.ExperienceDetailView.as_view(), name='async-experience-detail'),
+    path('education/', portfolio_views.EducationListView.as_view(), name='async-education-list'),
+    path('education/<int:pk>/', portfolio_views.EducationDetailView.as_view(), name='async-education-detail'),
+    path('technologies/', portfolio_views.TechnologyListView.as_view(), name='async-technology-list'),
+    path('technologies/<int:pk>/', portfolio_views.TechnologyDetailView.as_view(),
+         name='async-technology-detail'),
+]
@@ -0,0 +1,97 @@
+"""
+Base for the async read-only API (``config.async_router``).
+
+DRF views are synchronous, so under ASGI every request to them occupies a
+thread. ``AsyncAPIView`` is a plain Django view whose handlers are
+coroutines: data is loaded with the async ORM (``aget``, ``acount``,
+``async for`` with ``select_related``/``prefetch_related``) and the existing
+DRF serializers only turn already loaded objects into JSON, so no query runs
+in the event loop.
+
+The views are anonymous and read-only. Writes and reads that depend on the
+current user stay on the DRF views.
+"""
+import math
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class AsyncAPIView(View):
+    http_method_names = ['get', 'head', 'options']
+    # Клас DRF-пагінації, чиї page_size/page_size_query_param/max_page_size
+    # повторює paginate()
+    pagination_class = None
+    page_query_param = 'page'
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except Http404 as e:
+            # Як DRF: {"detail": "..."} замість HTML-сторінки
+            return self.render({'detail': str(e) or "Not found."}, status=404)
+        except APIException as e:
+            detail = e.detail if isinstance(e.detail, (dict, list)) else {'detail': e.detail}
+            return self.render(detail, status=e.status_code)
+
+    def render(self, data, status=200):
+        return HttpResponse(JSONRenderer().render(data), status=status, content_type='application/json')
+
+    def serialize(self, serializer_class, instance, many=False):
+        return serializer_class(instance, many=many, context={'request': self.request, 'view': self}).data
+
+    def get_page_size(self):
+        pagination = self.pagination_class
+        param = pagination.page_size_query_param
+        try:
+            size = int(self.request.GET[param])
+        except (KeyError, ValueError, TypeError):
+            return pagination.page_size
+        if size <= 0:
+            return pagination.page_size
+        return min(size, pagination.max_page_size) if pagination.max_page_size else size
+
+    async def paginate(self, queryset, serializer_class):
+        """
+        Same body as PageNumberPagination: {"count", "next", "previous", "results"}.
+        """
+        page_size = self.get_page_size()
+        try:
+            number = int(self.request.GET.get(self.page_query_param, 1))
+        except ValueError:
+            number = 0
+        count = await queryset.acount()
+        pages = max(1, math.ceil(count / page_size))
+        if not 1 <= number <= pages:
+            raise Http404("Invalid page.")
+
+        offset = (number - 1) * page_size
+        rows = [obj async for obj in queryset[offset:offset + page_size]]
+
+        url = self.request.build_absolute_uri()
+        if number == 1:
+            previous = None
+        elif number == 2:
+            previous = remove_query_param(url, self.page_query_param)
+        else:
+            previous = replace_query_param(url, self.page_query_param, number - 1)
+        return {
+            'count': count,
+            'next': replace_query_param(url, self.page_query_param, number + 1) if number < pages else None,
+            'previous': previous,
+            'results': self.serialize(serializer_class, rows, many=True),
+        }
+
+    async def paginate_keyset(self, queryset, serializer_class, paginator):
+        """
+        Same body as ``paginator`` (a DRF cursor pagination, e.g.
+        KeysetPagination): {"next", "previous", "results"}.
+        """
+        # Пагінатор читає query_params і сам виконує запит — у потоці
+        rows = await sync_to_async(paginator.paginate_queryset)(queryset, Request(self.request), self)
+        return paginator.get_paginated_response(self.serialize(serializer_class, rows, many=True)).data
@@ -0,0 +1,53 @@
+"""
+Minimal in-process background task runner.
+
+Tasks run on a shared thread pool after the surrounding transaction commits.
+With ``BACKGROUND_TASKS_EAGER = True`` (tests) they run inline instead.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'BACKGROUND_TASKS_WORKERS', 4),
+                thread_name_prefix='background',
+            )
+    return _executor
+
+
+def _run(func, args, kwargs):
+    try:
+        return func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed", getattr(func, '__name__', func))
+    finally:
+        close_old_connections()
+
+
+def submit(func, *args, **kwargs):
+    """
+    Runs ``func`` in the background (inline if BACKGROUND_TASKS_EAGER).
+    """
+    if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+        return func(*args, **kwargs)
+    return get_executor().submit(_run, func, args, kwargs)
+
+
+def submit_on_commit(func, *args, **kwargs):
+    """
+    Schedules ``func`` once the current transaction commits.
+    """
+    transaction.on_commit(lambda: submit(func, *args, **kwargs))
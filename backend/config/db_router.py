@@ -0,0 +1,143 @@
+"""
+Read-replica routing.
+
+``ReplicaRoutingMiddleware`` lets the reads of a GET/HEAD/OPTIONS request go
+to one of ``DATABASE_REPLICAS['ALIASES']``; everything else uses
+``default``:
+
+* unsafe methods, management commands, background tasks — no request
+  state, so the primary;
+* the first write of a request pins its remaining reads to the primary;
+* reads inside ``transaction.atomic()`` on the primary (``select_for_update``
+  and the like) stay on the primary;
+* after a request that wrote, the client's reads stay on the primary for
+  ``STICKY_SECONDS`` — replication lag must not hide the client's own
+  writes. The client is pinned in the shared ``CACHE_ALIAS`` cache by the
+  user id of its JWT (by IP address without one, see
+  ``config.throttling.throttle_ident``), which works for the SPA on another
+  origin that sends no cookies; same-origin clients also get a cookie.
+
+Without replica aliases the middleware and the router do nothing.
+"""
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from config.throttling import throttle_ident
+
+DEFAULTS = {
+    'ALIASES': [],
+    # Скільки секунд після запису клієнт читає з primary (затримка реплікації)
+    'STICKY_SECONDS': 5,
+    'COOKIE_NAME': 'db_primary',
+    # Спільний для всіх процесів кеш (Redis з REDIS_URL) для закріплення за primary
+    'CACHE_ALIAS': 'throttle',
+}
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_current = ContextVar('db_routing', default=None)
+
+
+def replica_settings():
+    return {**DEFAULTS, **getattr(settings, 'DATABASE_REPLICAS', {})}
+
+
+def replica_aliases():
+    return [alias for alias in replica_settings()['ALIASES'] if alias in settings.DATABASES]
+
+
+def sticky_key(request):
+    return f'db_primary:{throttle_ident(request)}'
+
+
+class RoutingState:
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.wrote = False
+        self.alias = None
+
+    def replica(self):
+        # Одна репліка на весь запит — послідовні читання бачать один знімок
+        if self.alias is None:
+            self.alias = random.choice(replica_aliases())
+        return self.alias
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _current.get()
+        if state is None or not state.use_replica or state.wrote or not replica_aliases():
+            return None
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            # Пов'язані об'єкти читаємо з тієї ж бази, що й сам об'єкт
+            return instance._state.db
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return state.replica()
+
+    def db_for_write(self, model, **hints):
+        state = _current.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Репліки містять ті самі дані, що й primary
+        aliases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = self.start(request)
+        token = _current.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, state)
+
+    async def __acall__(self, request):
+        # start()/finish() звертаються до кешу (Redis) — не блокуємо цикл подій
+        state = await sync_to_async(self.start)(request)
+        # sync_to_async копіює контекст, тож запити async ORM бачать цей стан
+        token = _current.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return await sync_to_async(self.finish)(request, response, state)
+
+    def start(self, request):
+        if request.method not in SAFE_METHODS or not replica_aliases():
+            return RoutingState(use_replica=False)
+        config = replica_settings()
+        sticky = (config['COOKIE_NAME'] in request.COOKIES
+                  or caches[config['CACHE_ALIAS']].get(sticky_key(request)) is not None)
+        return RoutingState(use_replica=not sticky)
+
+    def finish(self, request, response, state):
+        if state.wrote and replica_aliases():
+            config = replica_settings()
+            caches[config['CACHE_ALIAS']].set(sticky_key(request), 1, timeout=config['STICKY_SECONDS'])
+            response.set_cookie(config['COOKIE_NAME'], '1', max_age=config['STICKY_SECONDS'],
+                                httponly=True, samesite='Lax')
+        return response
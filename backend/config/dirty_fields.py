@@ -0,0 +1,115 @@
+"""
+Dirty-field tracking for models.
+
+``DirtyFieldsMixin`` remembers the column values an instance was loaded (or
+last saved) with. A plain ``save()`` of an existing row then writes only the
+changed columns (``update_fields``) and, when nothing changed, runs no
+UPDATE and sends no ``pre_save``/``post_save`` at all — so receivers that
+re-save related rows stop cascading.
+
+An explicit ``update_fields``, ``force_insert``/``force_update``, another
+``using`` or an instance that was never loaded from / saved to the database
+(``bulk_create``) fall back to Django's behaviour.
+"""
+import copy
+
+from django.core.files import File
+from django.db import models
+from django.db.models.fields.files import FieldFile
+
+
+class _Uncommitted:
+    """
+    A newly assigned file: never equal to a stored name.
+    """
+
+    def __eq__(self, other):
+        return False
+
+    def __ne__(self, other):
+        return True
+
+
+class DirtyFieldsMixin:
+    """
+        class Project(DirtyFieldsMixin, models.Model): ...
+
+        project.title = 'New'
+        project.get_dirty_fields()   # ['title']
+        project.save()               # UPDATE ... SET title = ... only
+        project.save()               # no query
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_values()
+        return instance
+
+    def _tracked_fields(self, names=None):
+        fields = [field for field in self._meta.concrete_fields if not field.primary_key]
+        if names is not None:
+            names = set(names)
+            fields = [field for field in fields if field.name in names or field.attname in names]
+        # Відкладені (defer/only) і ще не завантажені поля не відстежуються
+        return [field for field in fields if field.attname in self.__dict__]
+
+    def _tracked_value(self, field):
+        value = self.__dict__[field.attname]
+        if isinstance(field, models.FileField):
+            if isinstance(value, FieldFile):
+                return value.name or '' if value._committed else _Uncommitted()
+            if isinstance(value, File):
+                return _Uncommitted()
+            return value or ''
+        if isinstance(field, models.JSONField):
+            return copy.deepcopy(value)
+        return value
+
+    def _remember_values(self, names=None):
+        if names is None or getattr(self, '_saved_values', None) is None:
+            self._saved_values = {}
+        for field in self._tracked_fields(names):
+            self._saved_values[field.attname] = self._tracked_value(field)
+
+    def get_dirty_fields(self):
+        """
+        Names of the fields changed since the instance was loaded or saved.
+        """
+        saved = getattr(self, '_saved_values', None)
+        if saved is None:
+            return [field.name for field in self._tracked_fields()]
+        return [
+            field.name for field in self._tracked_fields()
+            if field.attname not in saved or self._tracked_value(field) != saved[field.attname]
+        ]
+
+    def is_dirty(self):
+        return bool(self.get_dirty_fields())
+
+    def save(self, *args, **kwargs):
+        tracked = (
+            not args
+            and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+            and not kwargs.get('force_update')
+            and kwargs.get('using') in (None, self._state.db)
+            and not self._state.adding
+            and self.pk is not None
+            and getattr(self, '_saved_values', None) is not None
+        )
+        if tracked:
+            dirty = self.get_dirty_fields()
+            if not dirty:
+                return
+            # auto_now оновлюється при кожному збереженні
+            kwargs['update_fields'] = dirty + [
+                field.name for field in self._meta.concrete_fields
+                if getattr(field, 'auto_now', False) and field.name not in dirty
+            ]
+        super().save(*args, **kwargs)
+        self._remember_values(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._remember_values(fields)
@@ -0,0 +1,154 @@
+"""
+Image derivative pipeline.
+
+After an image is uploaded, resized WebP/AVIF variants are generated in the
+background (``config.background``) and their storage names are written to a
+JSON "variants" field next to the image field:
+
+    {"source": "project_images/cat.png",
+     "webp": {"320": "project_images/variants/cat-320w.webp", ...},
+     "avif": {...}}
+
+``SrcsetField`` turns that manifest into ``srcset`` strings for the API.
+"""
+import io
+import logging
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.dispatch import Signal
+from PIL import Image, ImageOps, features
+from rest_framework import serializers
+
+from .background import submit_on_commit
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'WIDTHS': [320, 640, 1280],
+    'FORMATS': ['avif', 'webp'],
+    'QUALITY': {'avif': 60, 'webp': 80},
+}
+
+# Надсилається після запису нового маніфесту (sender — клас моделі)
+variants_generated = Signal()
+
+
+def variant_settings():
+    return {**DEFAULTS, **getattr(settings, 'IMAGE_VARIANTS', {})}
+
+
+def supported_formats():
+    return [fmt for fmt in variant_settings()['FORMATS'] if features.check(fmt)]
+
+
+def _variant_name(source_name, width, fmt):
+    directory, filename = os.path.split(source_name)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, 'variants', f'{stem}-{width}w.{fmt}')
+
+
+def render_variants(field_file):
+    """
+    Generates and stores all variants of ``field_file``.
+    Returns the manifest.
+    """
+    config = variant_settings()
+    storage = field_file.storage
+    with field_file.open('rb') as source:
+        image = ImageOps.exif_transpose(Image.open(source))
+        image.load()
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+
+    # Не збільшуємо зображення; якщо воно вужче за всі ширини — лише оригінальна ширина
+    widths = [width for width in config['WIDTHS'] if width < image.width] or [image.width]
+
+    manifest = {'source': field_file.name}
+    for fmt in supported_formats():
+        manifest[fmt] = {}
+        for width in widths:
+            resized = image.copy()
+            resized.thumbnail((width, width * 10), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            resized.save(buffer, format=fmt.upper(), quality=config['QUALITY'].get(fmt, 75))
+            name = storage.save(_variant_name(field_file.name, width, fmt), ContentFile(buffer.getvalue()))
+            manifest[fmt][str(width)] = name
+    return manifest
+
+
+def delete_variants(manifest, storage):
+    for fmt, names in manifest.items():
+        if fmt == 'source':
+            continue
+        for name in names.values():
+            try:
+                storage.delete(name)
+            except OSError:
+                logger.warning("Could not delete image variant %s", name)
+
+
+def needs_variants(instance, image_field, variants_field):
+    image = getattr(instance, image_field)
+    manifest = getattr(instance, variants_field) or {}
+    return (image.name or None) != manifest.get('source')
+
+
+def process_instance(model, pk, image_field, variants_field):
+    """
+    Background task: (re)generates variants of one object's image.
+    The manifest is written only if the image did not change meanwhile.
+    """
+    instance = model._default_manager.filter(pk=pk).first()
+    if instance is None or not needs_variants(instance, image_field, variants_field):
+        return False
+
+    image = getattr(instance, image_field)
+    old_manifest = getattr(instance, variants_field) or {}
+    manifest = render_variants(image) if image.name else {}
+
+    if image.name:
+        unchanged = Q(**{image_field: image.name})
+    else:
+        unchanged = Q(**{image_field: ''}) | Q(**{f'{image_field}__isnull': True})
+    updated = model._default_manager.filter(unchanged, pk=pk).update(**{variants_field: manifest})
+    if not updated:
+        # Зображення встигли замінити — ці варіанти вже нікому не потрібні
+        delete_variants(manifest, image.storage)
+        return False
+
+    delete_variants(old_manifest, image.storage)
+    variants_generated.send(sender=model, pk=pk)
+    return True
+
+
+def schedule_variants(instance, image_field, variants_field):
+    """
+    Called from post_save: queues generation when the image changed.
+    """
+    if needs_variants(instance, image_field, variants_field):
+        submit_on_commit(process_instance, type(instance), instance.pk, image_field, variants_field)
+
+
+class SrcsetField(serializers.ReadOnlyField):
+    """
+    Manifest -> {"avif": "<url> 320w, <url> 640w", "webp": "..."}.
+    """
+
+    def to_representation(self, manifest):
+        request = self.context.get('request')
+        srcset = {}
+        for fmt, names in (manifest or {}).items():
+            if fmt == 'source':
+                continue
+            candidates = []
+            for width, name in sorted(names.items(), key=lambda item: int(item[0])):
+                url = default_storage.url(name)
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                candidates.append(f'{url} {width}w')
+            srcset[fmt] = ', '.join(candidates)
+        return srcset
@@ -0,0 +1,225 @@
+"""
+Serving user uploads (resumes, profile pictures, project images).
+
+``HashedFileSystemStorage`` puts a hash of the content into every stored
+name (``resumes/<uuid>.<hash>.pdf``), so a URL never changes its body and
+can be cached forever.
+
+``serve_media`` only authorizes the path and answers conditional requests
+from ``stat()``; the body is sent by the front web server:
+
+* ``x-accel-redirect`` — nginx, through an ``internal`` location that
+  points at ``MEDIA_ROOT``;
+* ``x-sendfile`` — Apache mod_xsendfile, lighttpd;
+* ``stream`` — ``FileResponse`` with single-range support. Under gunicorn
+  ``wsgi.file_wrapper`` hands the descriptor to ``sendfile(2)``; only dev
+  servers and ASGI read the file in Python.
+
+The front server handles Range requests itself in the first two modes.
+"""
+import hashlib
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_safe
+
+DEFAULTS = {
+    # 'x-accel-redirect', 'x-sendfile' або 'stream'
+    'BACKEND': 'stream',
+    # internal location nginx, що відповідає MEDIA_ROOT
+    'ACCEL_PREFIX': '/protected-media/',
+    # Для імен з хешем вмісту
+    'IMMUTABLE_MAX_AGE': 365 * 24 * 60 * 60,
+    # Для старих імен без хешу
+    'MAX_AGE': 60 * 60,
+}
+
+BACKENDS = ('x-accel-redirect', 'x-sendfile', 'stream')
+HASH_LENGTH = 16
+HASHED_NAME_RE = re.compile(r'\.([0-9a-f]{%d})(\.[^./]+)?$' % HASH_LENGTH)
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def media_settings():
+    config = {**DEFAULTS, **getattr(settings, 'MEDIA_SERVING', {})}
+    if config['BACKEND'] not in BACKENDS:
+        raise ValueError(f"MEDIA_SERVING['BACKEND'] must be one of {', '.join(BACKENDS)}")
+    return config
+
+
+def content_hash(content):
+    digest = hashlib.sha256()
+    content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk)
+    content.seek(0)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(name, digest):
+    root, ext = os.path.splitext(name)
+    return f'{root}.{digest}{ext}'
+
+
+class HashedFileSystemStorage(FileSystemStorage):
+    """
+    ``FileSystemStorage`` that adds a content hash to every name. A hash
+    already in the name is kept only if it matches the content.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        digest = content_hash(content)
+        match = HASHED_NAME_RE.search(name)
+        if match and match.group(1) == digest:
+            return super().save(name, content, max_length=max_length)
+        if match:
+            # Чужий хеш в імені: інакше файл віддавався б як immutable на рік
+            name = name[:match.start()] + (match.group(2) or '')
+        name = hashed_name(name, digest)
+        return super().save(name, content, max_length=max_length)
+
+
+def parse_range(header, size):
+    """
+    ``Range`` header -> (start, end) inclusive, ``None`` to send the whole
+    file (no header, several ranges, bad syntax). Raises ``ValueError`` if
+    the range is not satisfiable.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        # bytes=-N — останні N байтів
+        length = int(last)
+        if not length:
+            raise ValueError(header)
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+class FileSlice:
+    """
+    ``length`` bytes of ``file`` from its current position. Keeps
+    ``fileno()`` so gunicorn's ``wsgi.file_wrapper`` can ``sendfile()`` it
+    (bounded by ``Content-Length``).
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def cache_control(path):
+    config = media_settings()
+    if HASHED_NAME_RE.search(path):
+        return f"public, max-age={config['IMMUTABLE_MAX_AGE']}, immutable"
+    return f"public, max-age={config['MAX_AGE']}"
+
+
+def file_etag(path, st):
+    match = HASHED_NAME_RE.search(path)
+    if match:
+        return quote_etag(match.group(1))
+    return quote_etag(f'{st.st_mtime_ns:x}-{st.st_size:x}')
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    GET/HEAD <MEDIA_URL><path>
+    """
+    config = media_settings()
+    try:
+        fullpath = safe_join(settings.MEDIA_ROOT, path)
+        st = os.stat(fullpath)
+    except (SuspiciousFileOperation, ValueError, OSError):
+        raise Http404("Файл не знайдено.")
+    if not stat.S_ISREG(st.st_mode):
+        raise Http404("Файл не знайдено.")
+
+    etag = file_etag(path, st)
+    headers = {
+        'Cache-Control': cache_control(path),
+        'ETag': etag,
+        'Last-Modified': http_date(st.st_mtime),
+    }
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(st.st_mtime))
+    if not_modified is not None:
+        for name, value in headers.items():
+            not_modified.headers[name] = value
+        return not_modified
+
+    content_type, encoding = mimetypes.guess_type(fullpath)
+    if encoding:
+        content_type = 'application/octet-stream'
+    headers['Content-Type'] = content_type or 'application/octet-stream'
+
+    if config['BACKEND'] != 'stream':
+        # Тіло віддає веб-сервер (разом з Range); Content-Type він бере з нашої відповіді
+        response = HttpResponse(headers=headers)
+        if config['BACKEND'] == 'x-accel-redirect':
+            response.headers['X-Accel-Redirect'] = config['ACCEL_PREFIX'].rstrip('/') + '/' + quote(path.lstrip('/'))
+        else:
+            response.headers['X-Sendfile'] = fullpath
+        return response
+
+    headers['Accept-Ranges'] = 'bytes'
+    start, end = 0, st.st_size - 1
+    status = 200
+    range_header = request.headers.get('Range')
+    # If-Range з іншим ETag — файл змінився, віддаємо повністю
+    if range_header and request.headers.get('If-Range', etag) == etag:
+        try:
+            byte_range = parse_range(range_header, st.st_size)
+        except ValueError:
+            response = HttpResponse(status=416, headers=headers)
+            response.headers['Content-Range'] = f'bytes */{st.st_size}'
+            return response
+        if byte_range is not None:
+            start, end = byte_range
+            status = 206
+            headers['Content-Range'] = f'bytes {start}-{end}/{st.st_size}'
+    headers['Content-Length'] = str(end - start + 1)
+
+    if request.method == 'HEAD':
+        return HttpResponse(status=status, headers=headers)
+
+    file = open(fullpath, 'rb')
+    file.seek(start)
+    response = FileResponse(FileSlice(file, end - start + 1), status=status)
+    for name, value in headers.items():
+        response.headers[name] = value
+    return response
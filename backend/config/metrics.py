@@ -0,0 +1,323 @@
+"""
+Per-request instrumentation and Prometheus metrics.
+
+``MetricsMiddleware`` records, per view and action (``ProjectViewSet.list``,
+``ProjectViewSet.increment_views``, ``PortfolioView.get`` ...):
+
+* request latency,
+* number of SQL queries and time spent in them (a connection ``execute_wrapper``),
+* serializer time (``TimedSerializerMixin``),
+* response size.
+
+The values go to in-process histograms served in the Prometheus text format
+by ``metrics_view``, and the current request's breakdown is sent back in a
+``Server-Timing`` header. Metrics are per process: with several workers
+every worker has to be scraped (or aggregated by the scraper).
+"""
+import bisect
+import contextvars
+import ipaddress
+import threading
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+DEFAULTS = {
+    'ENABLED': True,
+    'SERVER_TIMING': True,
+    # Доступ до /metrics/: "Authorization: Bearer <TOKEN>" або запит з
+    # ALLOWED_IPS (адреси й мережі, REMOTE_ADDR). Без жодного — лише з DEBUG.
+    'TOKEN': None,
+    'ALLOWED_IPS': [],
+}
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def metrics_settings():
+    return {**DEFAULTS, **getattr(settings, 'METRICS', {})}
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}' if pairs else ''
+
+
+class Histogram:
+    def __init__(self, name, documentation, labels, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # [лічильники по кошиках (+Inf останній), сума]
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def collect(self):
+        with self._lock:
+            return {labels: (list(counts), total) for labels, (counts, total) in self._series.items()}
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for label_values, (counts, total) in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += count
+                labels = _format_labels(self.labels, label_values, [('le', bound)])
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f'{self.name}_sum{labels} {total}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, documentation, labels):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def collect(self):
+        with self._lock:
+            return dict(self._values)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        for label_values, value in sorted(self.collect().items()):
+            lines.append(f'{self.name}{_format_labels(self.labels, label_values)} {value}')
+        return lines
+
+
+VIEW_LABELS = ('view', 'method')
+
+# Метод приходить від клієнта: довільні значення давали б нові ряди без меж
+KNOWN_METHODS = frozenset({'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'})
+
+
+def method_label(method):
+    return method if method in KNOWN_METHODS else 'other'
+
+REQUESTS = Counter('http_requests_total', "Requests by view and status code.", ('view', 'method', 'status'))
+REQUEST_DURATION = Histogram('http_request_duration_seconds', "Request latency.", VIEW_LABELS, LATENCY_BUCKETS)
+DB_QUERIES = Histogram('http_request_db_queries', "SQL queries per request.", VIEW_LABELS, QUERY_BUCKETS)
+DB_DURATION = Histogram('http_request_db_duration_seconds', "Time spent in SQL per request.",
+                        VIEW_LABELS, LATENCY_BUCKETS)
+SERIALIZER_DURATION = Histogram('http_request_serializer_duration_seconds', "Time spent in serializers per request.",
+                                VIEW_LABELS, LATENCY_BUCKETS)
+RESPONSE_SIZE = Histogram('http_response_size_bytes', "Response body size.", VIEW_LABELS, SIZE_BUCKETS)
+
+REGISTRY = [REQUESTS, REQUEST_DURATION, DB_QUERIES, DB_DURATION, SERIALIZER_DURATION, RESPONSE_SIZE]
+
+
+class RequestMetrics:
+    __slots__ = ('view', 'queries', 'db_time', 'serializer_time', 'serializer_depth')
+
+    def __init__(self):
+        self.view = '<unresolved>'
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+
+def current_metrics():
+    return _current.get()
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics.record_query(execute, sql, params, many, context)
+
+
+def instrument_connections():
+    """
+    Installs the query counter on the calling thread's connections, once per
+    connection. It reads the request from the context, so it also counts
+    queries that ``sync_to_async`` runs in a worker thread.
+    """
+    for connection in connections.all():
+        if _record_query not in connection.execute_wrappers:
+            # Першим у списку: execute_wrapper() інших знімає останній елемент
+            connection.execute_wrappers.insert(0, _record_query)
+
+
+def view_name(view_func, method):
+    """
+    ``ProjectViewSet.list`` for DRF viewsets/views and class-based views,
+    dotted path otherwise.
+    """
+    cls = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    if cls is None:
+        return f'{view_func.__module__}.{getattr(view_func, "__qualname__", type(view_func).__name__)}'
+    method = method_label(method).lower()
+    actions = getattr(view_func, 'actions', None)
+    action = actions.get(method, method) if actions else method
+    return f'{cls.__name__}.{action}'
+
+
+class TimedSerializerMixin:
+    """
+    Adds the serializer's ``to_representation`` time to the current request's
+    metrics. Nested serializers and list items are counted once.
+    """
+
+    def to_representation(self, instance):
+        metrics = _current.get()
+        if metrics is None:
+            return super().to_representation(instance)
+
+        outermost = metrics.serializer_depth == 0
+        metrics.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics.serializer_depth -= 1
+            if outermost:
+                metrics.serializer_time += time.perf_counter() - started
+
+
+def _response_size(response):
+    if response.streaming:
+        return None
+    return len(response.content)
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not metrics_settings()['ENABLED']:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            instrument_connections()
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, started)
+
+    async def __acall__(self, request):
+        if not metrics_settings()['ENABLED']:
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            # Async ORM виконує запити через sync_to_async в окремому потоці зі
+            # своїми з'єднаннями — лічильник ставимо саме там
+            await sync_to_async(instrument_connections)()
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, started)
+
+    def finish(self, request, response, metrics, started):
+        duration = time.perf_counter() - started
+
+        labels = (metrics.view, method_label(request.method))
+        REQUESTS.inc((*labels, str(response.status_code)))
+        REQUEST_DURATION.observe(labels, duration)
+        DB_QUERIES.observe(labels, metrics.queries)
+        DB_DURATION.observe(labels, metrics.db_time)
+        SERIALIZER_DURATION.observe(labels, metrics.serializer_time)
+        size = _response_size(response)
+        if size is not None:
+            RESPONSE_SIZE.observe(labels, size)
+
+        if metrics_settings()['SERVER_TIMING']:
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.queries} queries"',
+                f'serialize;dur={metrics.serializer_time * 1000:.2f}',
+                f'total;dur={duration * 1000:.2f}',
+            ])
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.view = view_name(view_func, request.method)
+
+
+def render_metrics():
+    lines = []
+    for metric in REGISTRY:
+        lines += metric.render()
+    return '\n'.join(lines) + '\n'
+
+
+def _ip_allowed(address, networks):
+    try:
+        address = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(network, strict=False) for network in networks)
+
+
+def metrics_allowed(request):
+    config = metrics_settings()
+    token, networks = config['TOKEN'], config['ALLOWED_IPS']
+    if token and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return True
+    if networks and _ip_allowed(request.META.get('REMOTE_ADDR', ''), networks):
+        return True
+    # Нічого не налаштовано: відкрито лише для розробки
+    return not token and not networks and settings.DEBUG
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint.
+    """
+    if not metrics_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
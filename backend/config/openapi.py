@@ -0,0 +1,254 @@
+"""
+Precomputed OpenAPI schema.
+
+drf-spectacular introspects every view and serializer to build the schema,
+which takes hundreds of milliseconds per request. ``schema_view`` serves
+the rendered YAML and JSON documents from memory instead, gzipped ahead of
+time, with an ``ETag`` (``If-None-Match`` -> 304).
+
+The documents are tied to a fingerprint of the code: project sources,
+versions of the libraries that shape the schema and the relevant settings.
+``build_openapi_schema`` renders them at deploy time into
+``OPENAPI_SCHEMA['DIR']``; a process loads the files of the current
+fingerprint on first use, or generates and writes them itself when they
+are missing. Changed code means another fingerprint, so a stale schema is
+never served.
+
+``?lang=`` and ``?version=`` requests are passed to ``SpectacularAPIView``.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from dataclasses import dataclass
+from importlib import import_module, metadata
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    # None — лише в пам'яті процесу
+    'DIR': None,
+}
+
+# Формат -> (тип за замовчуванням, типи з Accept, які його обирають)
+FORMATS = {
+    'yaml': ('application/vnd.oai.openapi', ('application/vnd.oai.openapi', 'application/yaml')),
+    'json': ('application/vnd.oai.openapi+json', ('application/vnd.oai.openapi+json', 'application/json')),
+}
+
+# Бібліотеки, від яких залежить вигляд схеми
+PACKAGES = ('django', 'djangorestframework', 'drf-spectacular', 'djangorestframework-simplejwt')
+
+re_accepts_gzip = re.compile(r'\bgzip\b')
+
+_live_view = SpectacularAPIView.as_view()
+
+
+def schema_settings():
+    return {**DEFAULTS, **getattr(settings, 'OPENAPI_SCHEMA', {})}
+
+
+def _source_dirs():
+    """
+    Directories of the project's own apps and of the URLconf package.
+    """
+    base_dir = Path(settings.BASE_DIR).resolve()
+    dirs = {Path(import_module(settings.ROOT_URLCONF).__file__).resolve().parent}
+    for app_config in apps.get_app_configs():
+        path = Path(app_config.path).resolve()
+        # Пакети з віртуального середовища всередині проєкту враховано версіями
+        if path.is_relative_to(base_dir) and 'site-packages' not in path.parts:
+            dirs.add(path)
+    return sorted(dirs)
+
+
+def code_fingerprint():
+    """
+    Hash of the project's Python sources, library versions and schema
+    settings.
+    """
+    digest = hashlib.sha256()
+    base_dir = Path(settings.BASE_DIR).resolve()
+    sources = sorted({
+        path for directory in _source_dirs() for path in directory.rglob('*.py')
+        if '__pycache__' not in path.parts
+    })
+    for path in sources:
+        digest.update(str(path.relative_to(base_dir)).encode())
+        digest.update(b'\0')
+        digest.update(path.read_bytes())
+        digest.update(b'\0')
+    for package in PACKAGES:
+        try:
+            version = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            version = ''
+        digest.update(f'{package}=={version}\0'.encode())
+    config = {
+        'REST_FRAMEWORK': getattr(settings, 'REST_FRAMEWORK', {}),
+        'SPECTACULAR_SETTINGS': getattr(settings, 'SPECTACULAR_SETTINGS', {}),
+        'LANGUAGE_CODE': settings.LANGUAGE_CODE,
+    }
+    digest.update(json.dumps(config, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+def render_schema():
+    """
+    {format: bytes} of a freshly generated schema.
+    """
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=spectacular_settings.SERVE_PUBLIC)
+    return {
+        'yaml': OpenApiYamlRenderer().render(schema, renderer_context={}),
+        'json': OpenApiJsonRenderer().render(schema, renderer_context={}),
+    }
+
+
+@dataclass(frozen=True)
+class Document:
+    body: bytes
+    gzipped: bytes
+    etag: str
+
+    @classmethod
+    def from_body(cls, body):
+        return cls(body, gzip.compress(body, compresslevel=9, mtime=0),
+                   '"%s"' % hashlib.sha256(body).hexdigest()[:32])
+
+
+def _path(directory, fingerprint, fmt):
+    return Path(directory) / f'openapi.{fingerprint}.{fmt}'
+
+
+def _write_atomic(path, content):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def write_schema(directory, fingerprint, bodies):
+    """
+    Writes the documents of ``fingerprint`` and removes the other ones.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for fmt, body in bodies.items():
+        path = _path(directory, fingerprint, fmt)
+        _write_atomic(path, body)
+        paths.append(path)
+    for stale in directory.glob('openapi.*.*'):
+        if stale not in paths and not stale.name.startswith('.'):
+            stale.unlink(missing_ok=True)
+    return paths
+
+
+def read_schema(directory, fingerprint):
+    try:
+        return {fmt: _path(directory, fingerprint, fmt).read_bytes() for fmt in FORMATS}
+    except FileNotFoundError:
+        return None
+
+
+class SchemaCache:
+    """
+    The documents of the current code, loaded once per process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._documents = None
+        self.fingerprint = None
+
+    def documents(self):
+        documents = self._documents
+        if documents is None:
+            with self._lock:
+                if self._documents is None:
+                    self._documents = self._load()
+                documents = self._documents
+        return documents
+
+    def _load(self):
+        self.fingerprint = code_fingerprint()
+        directory = schema_settings()['DIR']
+        bodies = read_schema(directory, self.fingerprint) if directory else None
+        if bodies is None:
+            bodies = render_schema()
+            if directory:
+                try:
+                    write_schema(directory, self.fingerprint, bodies)
+                except OSError:
+                    logger.warning("Could not write the OpenAPI schema to %s", directory, exc_info=True)
+        return {fmt: Document.from_body(body) for fmt, body in bodies.items()}
+
+    def clear(self):
+        with self._lock:
+            self._documents = None
+            self.fingerprint = None
+
+
+schema_cache = SchemaCache()
+
+
+def negotiate(request):
+    """
+    (format, content type) from ``?format=`` or ``Accept``; YAML by default,
+    as in ``SpectacularAPIView``.
+    """
+    fmt = request.GET.get('format')
+    if fmt in FORMATS:
+        return fmt, FORMATS[fmt][0]
+    accept = request.headers.get('Accept', '')
+    for media_type in (part.split(';')[0].strip() for part in accept.split(',')):
+        for fmt, (_, media_types) in FORMATS.items():
+            if media_type in media_types:
+                return fmt, media_type
+    return 'yaml', FORMATS['yaml'][0]
+
+
+def schema_view(request):
+    """
+    GET /api/v1/schema/ — OpenAPI schema from memory.
+    """
+    if request.method not in ('GET', 'HEAD') or request.GET.get('lang') or request.GET.get('version'):
+        return _live_view(request)
+
+    fmt, content_type = negotiate(request)
+    document = schema_cache.documents()[fmt]
+    compressed = bool(re_accepts_gzip.search(request.headers.get('Accept-Encoding', '')))
+    # Різні представлення — різні ETag
+    etag = document.etag[:-1] + ('-gzip"' if compressed else '"')
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(document.gzipped if compressed else document.body,
+                                content_type=f'{content_type}; charset=utf-8')
+        if compressed:
+            response['Content-Encoding'] = 'gzip'
+        response['Content-Disposition'] = f'inline; filename="{spectacular_settings.TITLE or "schema"}.{fmt}"'
+    response['ETag'] = etag
+    # Клієнт перевіряє актуальність через If-None-Match
+    response['Cache-Control'] = 'public, no-cache'
+    patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+    return response
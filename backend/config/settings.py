@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -38,6 +39,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     'corsheaders',
 
@@ -49,6 +51,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Першим — щоб час запиту включав усі інші middleware
+    'config.metrics.MetricsMiddleware',
+    # Читання безпечних запитів — з реплік (config.db_router)
+    'config.db_router.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -82,15 +88,106 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
+# DB_ENGINE=sqlite — локальна перевірка маршрутизації на файлах SQLite
+# (DB_NAME — primary, DB_REPLICAS — копії файлу замість реплік)
+DB_ENGINE = os.environ.get('DB_ENGINE', 'postgresql')
+
+if DB_ENGINE == 'sqlite':
+    PRIMARY_DATABASE = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('DB_NAME', str(BASE_DIR / 'db.sqlite3')),
+    }
+else:
+    PRIMARY_DATABASE = {
         'ENGINE': 'django.db.backends.postgresql',
-        'NAME': 'portfolio_db',
-        'USER': 'portfolio_user',
-        'PASSWORD': 'admin',
-        'HOST': 'localhost',
-        'PORT': '5432',
+        'NAME': os.environ.get('DB_NAME', 'portfolio_db'),
+        'USER': os.environ.get('DB_USER', 'portfolio_user'),
+        'PASSWORD': os.environ.get('DB_PASSWORD', 'admin'),
+        'HOST': os.environ.get('DB_HOST', 'localhost'),
+        'PORT': os.environ.get('DB_PORT', '5432'),
+        # Постійні з'єднання замість нового на кожен запит; перед повторним
+        # використанням з'єднання перевіряється (CONN_HEALTH_CHECKS).
+        # Це не пул: psycopg2 тримає одне з'єднання на потік воркера, тож
+        # з'єднань з базою стільки, скільки потоків у всіх процесах. Для
+        # справжнього пулу потрібен PgBouncer (або psycopg 3 з OPTIONS['pool'])
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'connect_timeout': 5,
+            # Розірвані з'єднання помічаються ядром, а не висять до таймауту
+            'keepalives': 1,
+            'keepalives_idle': 30,
+        },
     }
+
+DATABASES = {'default': PRIMARY_DATABASE}
+
+# Репліки для читання (config.db_router): "host[:port],..." для PostgreSQL,
+# шляхи до файлів для SQLite
+for index, location in enumerate(filter(None, os.environ.get('DB_REPLICAS', '').split(',')), start=1):
+    replica = {**PRIMARY_DATABASE, 'TEST': {'MIRROR': 'default'}}
+    if DB_ENGINE == 'sqlite':
+        replica['NAME'] = location
+    else:
+        host, _, port = location.partition(':')
+        replica.update(HOST=host, PORT=port or PRIMARY_DATABASE['PORT'])
+    DATABASES[f'replica{index}'] = replica
+
+DATABASE_ROUTERS = ['config.db_router.ReplicaRouter']
+
+DATABASE_REPLICAS = {
+    'ALIASES': [alias for alias in DATABASES if alias != 'default'],
+    # Після запису клієнт стільки секунд читає з primary (затримка реплікації)
+    'STICKY_SECONDS': 5,
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Якщо задано REDIS_URL, буфер лічильника переглядів живе в Redis і
+# спільний для всіх воркерів; інакше кожен процес має власний LocMemCache.
+REDIS_URL = os.environ.get('REDIS_URL')
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'counters': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    } if REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'view-counters',
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+    # Кеш публічних відповідей профілів (users.cache). PROFILE_CACHE_DIR
+    # перемикає його на файловий бекенд.
+    'portfolio': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ['PROFILE_CACHE_DIR'],
+    } if os.environ.get('PROFILE_CACHE_DIR') else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'profile-responses',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    # Лічильники обмежень частоти запитів (config.throttling): спільні для
+    # всіх процесів з REDIS_URL, інакше — у пам'яті процесу
+    'throttle': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    } if REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'throttle',
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+    # Користувачі з профілями для JWT-автентифікації (users.authentication).
+    # Локальний LRU з TTL: без мережевого запиту на кожен запит до API.
+    'auth': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'auth-users',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
 }
 
 
@@ -132,6 +229,21 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+STORAGES = {
+    # Хеш вмісту в іменах файлів — незмінні URL (config.media)
+    'default': {'BACKEND': 'config.media.HashedFileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+# Віддача медіафайлів (config.media): тіло файлу віддає nginx/Apache, а не воркер
+MEDIA_SERVING = {
+    # 'x-accel-redirect' (nginx), 'x-sendfile' (Apache, lighttpd) або 'stream'
+    'BACKEND': os.environ.get('MEDIA_SERVING_BACKEND', 'stream'),
+    'ACCEL_PREFIX': '/protected-media/',
+    'IMMUTABLE_MAX_AGE': 365 * 24 * 60 * 60,
+    'MAX_AGE': 60 * 60,
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -140,10 +252,19 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
 
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+
+    # Ліміти для throttle_scope (config.throttling); None вимикає ліміт
+    'DEFAULT_THROTTLE_RATES': {
+        'increment_views': '60/min',
+        'sync_github': '5/hour',
+        'export': '30/hour',
+    },
+    # Скільки проксі (nginx) стоїть перед Django: IP клієнта з X-Forwarded-For
+    'NUM_PROXIES': int(os.environ['NUM_PROXIES']) if os.environ.get('NUM_PROXIES') else None,
 }
 
 
@@ -162,6 +283,12 @@ SPECTACULAR_SETTINGS = {
     'SECURITY': [{'simple-jwt': []}], # Глобально застосовуємо її
 }
 
+# Готова схема OpenAPI (config.openapi): файли для поточного коду
+# генерує build_openapi_schema під час розгортання або перший запит
+OPENAPI_SCHEMA = {
+    'DIR': os.environ.get('OPENAPI_SCHEMA_DIR', str(BASE_DIR / 'openapi')),
+}
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
 
@@ -176,3 +303,100 @@ CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
     "http://127.0.0.1:5173",
 ]
+
+# Write-behind лічильник переглядів (portfolio.counters)
+VIEW_COUNTER = {
+    'CACHE_ALIAS': 'counters',
+    # Один відвідувач рахується не частіше ніж раз на це вікно (секунди)
+    'DEDUP_WINDOW': 30 * 60,
+    # Як часто фоновий потік скидає буфер у БД; 0 — лише командою flush_views
+    'FLUSH_INTERVAL': 10,
+    'BATCH_SIZE': 500,
+}
+
+# Рейтинг популярних проєктів (portfolio.trending), оновлюється при скиданні переглядів
+TRENDING = {
+    # Вага перегляду зменшується вдвічі за цей час (секунди)
+    'HALF_LIFE': 3 * 24 * 60 * 60,
+    'LIMIT': 20,
+    'MAX_LIMIT': 100,
+}
+
+# Кеш публічних відповідей профілів (users.cache)
+PROFILE_CACHE = {
+    'CACHE_ALIAS': 'portfolio',
+    'TIMEOUT': 5 * 60,
+    # False вимикає кешування ендпоінта: 'projects', 'experience', 'profile', 'portfolio'
+    'ENDPOINTS': {
+        'projects': True,
+        'experience': True,
+        'profile': True,
+        'portfolio': True,
+    },
+}
+
+# Кеш користувачів для JWT (users.authentication). Зміни User/UserProfile
+# скидають запис одразу в цьому процесі, в інших — не пізніше TIMEOUT.
+AUTH_USER_CACHE = {
+    'CACHE_ALIAS': 'auth',
+    'TIMEOUT': 60,
+}
+
+# Обмеження частоти запитів (config.throttling)
+THROTTLING = {
+    'ENABLED': True,
+    'CACHE_ALIAS': 'throttle',
+}
+
+# Фонові задачі (config.background): синхронізація з GitHub тощо
+BACKGROUND_TASKS_WORKERS = 4
+
+# Зменшені копії зображень (config.images)
+IMAGE_VARIANTS = {
+    'WIDTHS': [320, 640, 1280],
+    'FORMATS': ['avif', 'webp'],
+    'QUALITY': {'avif': 60, 'webp': 80},
+}
+
+GITHUB_API_URL = os.environ.get('GITHUB_API_URL', 'https://api.github.com')
+GITHUB_API_TOKEN = os.environ.get('GITHUB_API_TOKEN')
+GITHUB_API_TIMEOUT = 10
+# Скільки сторінок репозиторіїв AsyncGitHubClient завантажує одночасно
+GITHUB_API_CONCURRENCY = 4
+# Секунди без прогресу, після яких незавершена синхронізація вважається завислою
+GITHUB_SYNC_STALE_AFTER = 600
+
+# Інструментування запитів і /metrics/ для Prometheus (config.metrics)
+METRICS = {
+    'ENABLED': True,
+    'SERVER_TIMING': True,
+    'TOKEN': os.environ.get('METRICS_TOKEN'),
+    # "10.0.0.5,10.1.0.0/16" — звідки Prometheus може забирати метрики без токена
+    'ALLOWED_IPS': list(filter(None, os.environ.get('METRICS_ALLOWED_IPS', '').split(','))),
+}
+
+# Автодоповнення технологій (portfolio.autocomplete)
+TECHNOLOGY_AUTOCOMPLETE = {
+    'LIMIT': 10,
+    'MAX_LIMIT': 50,
+    # Повна перебудова індексу з БД (зміни з інших процесів)
+    'REBUILD_INTERVAL': 5 * 60,
+}
+
+# Потокове вивантаження даних (portfolio.export)
+EXPORT = {
+    # Рядків на одну вибірку серверного курсора
+    'CHUNK_SIZE': 2000,
+    'GZIP_FLUSH_SIZE': 64 * 1024,
+}
+
+# Готові знімки портфоліо на диску (portfolio.snapshots); nginx/CDN віддає
+# їх без Django. Без PORTFOLIO_SNAPSHOTS_DIR і PORTFOLIO_SNAPSHOTS_BASE_URL вимкнено.
+PORTFOLIO_SNAPSHOTS = {
+    'DIR': os.environ.get('PORTFOLIO_SNAPSHOTS_DIR'),
+    # Перегенерація через стільки секунд після останньої зміни профілю
+    'DEBOUNCE': 2,
+    'MAX_DELAY': 30,
+    # Публічна адреса API: з неї будуються URL зображень, як у живій відповіді
+    'BASE_URL': os.environ.get('PORTFOLIO_SNAPSHOTS_BASE_URL', ''),
+}
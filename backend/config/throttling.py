@@ -0,0 +1,175 @@
+"""
+Sliding-window rate limits for expensive and abusable endpoints.
+
+``SlidingWindowThrottle`` keeps two counters per client and scope — the
+current and the previous fixed window — in ``THROTTLING['CACHE_ALIAS']``
+(Redis when ``REDIS_URL`` is set, a local in-memory cache otherwise) and
+weights the previous one by the part of it that still overlaps the sliding
+window. A check is one atomic ``incr`` and one ``get``; memory does not
+grow with the rate, unlike DRF's per-request timestamp lists.
+
+Views opt in with ``throttle_scope`` (also per ``@action``); the rates are
+``REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']``. With ``RateLimitMixin`` the
+limits are checked before authentication and clients are identified by the
+signed JWT claim or the IP address, so a rejected request never reaches
+the database. Responses carry ``RateLimit-Limit``, ``RateLimit-Remaining``
+and ``RateLimit-Reset``; 429 adds ``Retry-After``. While the shared cache is
+unavailable the counters are kept in the memory of each process.
+"""
+import logging
+import math
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle, ScopedRateThrottle
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+DEFAULTS = {
+    'ENABLED': True,
+    'CACHE_ALIAS': 'throttle',
+}
+
+logger = logging.getLogger(__name__)
+
+_jwt = JWTAuthentication()
+
+# Лічильники на час недоступності спільного кешу
+_fallback_cache = LocMemCache('throttle-fallback', {'OPTIONS': {'MAX_ENTRIES': 100000}})
+
+
+def throttle_settings():
+    return {**DEFAULTS, **getattr(settings, 'THROTTLING', {})}
+
+
+def get_cache():
+    return caches[throttle_settings()['CACHE_ALIAS']]
+
+
+def throttle_ident(request):
+    """
+    'user:<id>' from a valid access token (signature only, no query),
+    'ip:<address>' otherwise.
+    """
+    header = _jwt.get_header(request)
+    raw_token = _jwt.get_raw_token(header) if header else None
+    if raw_token:
+        try:
+            token = _jwt.get_validated_token(raw_token)
+            return f'user:{token[jwt_settings.USER_ID_CLAIM]}'
+        except (InvalidToken, KeyError):
+            # Невалідний токен — запит однаково отримає 401; рахуємо за IP
+            pass
+    return f'ip:{BaseThrottle().get_ident(request)}'
+
+
+class SlidingWindowThrottle(ScopedRateThrottle):
+    cache_format = 'throttle:%(scope)s:%(ident)s'
+
+    def get_rate(self):
+        # Читаємо налаштування щоразу (THROTTLE_RATES фіксується при імпорті)
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': throttle_ident(request)}
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope or not throttle_settings()['ENABLED']:
+            return True
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        key = self.get_cache_key(request, view)
+
+        now = self.timer()
+        window = int(now // self.duration)
+        self.elapsed = now - window * self.duration
+        try:
+            self.current, self.previous = self.hits(get_cache(), key, window)
+        except Exception:
+            # Збій Redis не має валити запити — рахуємо в пам'яті процесу
+            logger.warning("Rate limit cache unavailable, counting in process memory", exc_info=True)
+            self.current, self.previous = self.hits(_fallback_cache, key, window)
+
+        weight = 1 - self.elapsed / self.duration
+        estimate = self.previous * weight + self.current
+        allowed = estimate <= self.num_requests
+        remaining = max(0, math.floor(self.num_requests - estimate))
+        self.record(request, remaining)
+        return allowed
+
+    def hits(self, cache, key, window):
+        """
+        (requests in the current window including this one, requests in the
+        previous window).
+        """
+        current_key = f'{key}:{window}'
+        # Відхилені запити теж рахуються: клієнт, що не чекає, лишається заблокованим
+        try:
+            current = cache.incr(current_key)
+        except ValueError:
+            if cache.add(current_key, 1, timeout=2 * self.duration):
+                current = 1
+            else:
+                current = cache.incr(current_key)
+        return current, cache.get(f'{key}:{window - 1}', 0)
+
+    def wait(self):
+        """
+        Seconds until one more request fits into the window.
+        """
+        free = self.num_requests - self.current
+        if free >= 1 and self.previous:
+            # Достатньо, щоб вага попереднього вікна зменшилась
+            weight = (free - 1) / self.previous
+            return max(0.0, self.duration * (1 - weight) - self.elapsed)
+        # Чекаємо наступного вікна, де поточне стане попереднім
+        weight = (self.num_requests - 1) / self.current
+        return self.duration - self.elapsed + self.duration * (1 - weight)
+
+    def reset(self):
+        """
+        Seconds until the counted requests leave the window (full quota).
+        """
+        return self.duration - self.elapsed + (self.duration if self.current else 0)
+
+    def record(self, request, remaining):
+        # Для заголовків — найжорсткіше з обмежень запиту
+        previous = getattr(request, 'rate_limit', None)
+        if previous is None or remaining < previous[1]:
+            request.rate_limit = (self.num_requests, remaining, math.ceil(self.reset()))
+
+
+class RateLimitMixin:
+    """
+    For views with ``throttle_scope``: limits are checked before
+    authentication and reported in response headers.
+    """
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = None
+
+    def perform_authentication(self, request):
+        # Відхилений запит не читає користувача з БД
+        self.check_throttles(request)
+        super().perform_authentication(request)
+
+    def check_throttles(self, request):
+        if getattr(request, '_throttles_checked', False):
+            return
+        request._throttles_checked = True
+        super().check_throttles(request)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        rate_limit = getattr(request, 'rate_limit', None)
+        if rate_limit is not None:
+            limit, remaining, reset = rate_limit
+            response['RateLimit-Limit'] = limit
+            response['RateLimit-Remaining'] = remaining
+            response['RateLimit-Reset'] = reset
+        return response
@@ -1,31 +1,45 @@
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
+
+from config.media import serve_media
+from config.metrics import metrics_view
+from config.openapi import schema_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
 
     path('api/v1/', include('config.api_router')),
     path('api/v1/', include('users.urls')),
+    path('api/v1/', include('portfolio.urls')),
+    # Async-версії ендпоінтів читання для ASGI (config.async_views)
+    path('api/v1/async/', include('config.async_router')),
 
     # Endpoints for JWT
     path('api/v1/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/v1/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
 
-    # URL for Swagger / OpenAPI
-    path('api/v1/schema/', SpectacularAPIView.as_view(), name='schema'),
+    # URL for Swagger / OpenAPI (готова схема з пам'яті, config.openapi)
+    path('api/v1/schema/', schema_view, name='schema'),
 
     path('api/v1/swagger/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
 
     path('api/v1/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+
+    # Prometheus
+    path('metrics/', metrics_view, name='metrics'),
 ]
 
 from django.conf import settings
-from django.conf.urls.static import static
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Медіа через config.media (X-Accel-Redirect/X-Sendfile або sendfile), не лише в DEBUG
+if settings.MEDIA_URL.startswith('/'):
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.+)$' % re.escape(settings.MEDIA_URL.lstrip('/')), serve_media, name='media'),
+    ]
@@ -1,7 +1,8 @@
 from django.contrib import admin
-from .models import Technology, Project, Experience, Education
+from .models import Technology, Project, Experience, Education, GitHubSyncJob
 
 admin.site.register(Technology)
 admin.site.register(Project)
 admin.site.register(Experience)
 admin.site.register(Education)
+admin.site.register(GitHubSyncJob)
@@ -0,0 +1,46 @@
+"""
+Whole-portfolio reads: profile, projects with technologies, experience
+and education of one user in a fixed number of queries.
+"""
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+
+from users.models import UserProfile
+
+from .models import Project
+from .pagination import StandardResultsSetPagination
+
+DEFAULT_PROJECTS_LIMIT = StandardResultsSetPagination.page_size
+MAX_PROJECTS_LIMIT = StandardResultsSetPagination.max_page_size
+
+
+def portfolio_queryset(projects_limit=DEFAULT_PROJECTS_LIMIT, with_counts=False):
+    """
+    1 запит на профіль з користувачем + по одному на проєкти, їхні
+    технології, досвід і освіту. Проєкти обмежені першими projects_limit
+    у порядку стрічки (-views, -created_at).
+    """
+    projects = Project.objects.prefetch_related('technologies').order_by('-views', '-created_at')
+    if projects_limit is not None:
+        projects = projects[:projects_limit]
+
+    queryset = UserProfile.objects.select_related('user').prefetch_related(
+        Prefetch('projects', queryset=projects, to_attr='portfolio_projects'),
+        'experience',
+        'education',
+    )
+    if with_counts:
+        projects_count = (
+            Project.objects.filter(profile=OuterRef('pk'))
+            .values('profile')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        queryset = queryset.annotate(
+            projects_count=Coalesce(Subquery(projects_count), 0, output_field=IntegerField())
+        )
+    return queryset
+
+
+def get_portfolio(username, projects_limit=DEFAULT_PROJECTS_LIMIT, with_counts=False):
+    return portfolio_queryset(projects_limit, with_counts).filter(user__username=username).first()
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class PortfolioConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'portfolio'
+
+    def ready(self):
+        import portfolio.signals
+        from portfolio.counters import check_store
+
+        check_store()
@@ -0,0 +1,120 @@
+"""
+Async versions of the public read endpoints (config.async_router).
+
+Responses match the DRF viewsets for anonymous clients; see
+config.async_views for what is and is not covered.
+"""
+from asgiref.sync import sync_to_async
+from django.shortcuts import aget_object_or_404
+from rest_framework.request import Request
+
+from config.async_views import AsyncAPIView
+from users.cache import cache_async_profile_response
+
+from .models import Education, Experience, Project, Technology
+from .filters import RankedOrderingFilter
+from .pagination import ProjectPagination
+from .search import search_projects
+from .serializers import EducationSerializer, ExperienceSerializer, ProjectSerializer, TechnologySerializer
+from .views import ProjectViewSet
+
+
+def project_queryset():
+    return Project.objects.select_related('profile__user').prefetch_related('technologies')
+
+
+class ProjectListView(AsyncAPIView):
+    """
+    GET /api/v1/async/projects/?username=&search=&search_mode=&ordering=
+    &page=&page_size=&pagination=cursor&cursor=
+    """
+    pagination_class = ProjectPagination
+
+    def get_ordering(self, queryset):
+        param = self.request.GET.get('ordering')
+        requested = [
+            field.strip() for field in (param or '').split(',')
+            if field.strip().lstrip('-') in ProjectViewSet.ordering_fields
+        ]
+        # Як RankedOrderingFilter: без ?ordering= пошук сортується за релевантністю
+        if not param and RankedOrderingFilter.rank_field in queryset.query.annotations:
+            return [f'-{RankedOrderingFilter.rank_field}', *ProjectViewSet.ordering]
+        return requested or ProjectViewSet.ordering
+
+    @cache_async_profile_response('projects')
+    async def get(self, request):
+        queryset = project_queryset()
+        username = request.GET.get('username')
+        if username is not None:
+            queryset = queryset.filter(profile__user__username=username)
+        search = request.GET.get('search')
+        if search:
+            # Виправлення опечаток у search_projects читає словник технологій одразу
+            queryset = await sync_to_async(search_projects)(queryset, search, mode=request.GET.get('search_mode'))
+        queryset = queryset.order_by(*self.get_ordering(queryset))
+
+        pagination = self.pagination_class()
+        if pagination.use_cursor(Request(request)):
+            data = await self.paginate_keyset(queryset, ProjectSerializer, pagination.cursor_pagination_class())
+        else:
+            data = await self.paginate(queryset, ProjectSerializer)
+        return self.render(data)
+
+
+class ProjectDetailView(AsyncAPIView):
+    async def get(self, request, pk):
+        project = await aget_object_or_404(project_queryset(), pk=pk)
+        return self.render(self.serialize(ProjectSerializer, project))
+
+
+def experience_queryset(request):
+    # Як ExperienceViewSet для аноніма: без ?username= — нічого
+    username = request.GET.get('username')
+    if username is None:
+        return Experience.objects.none()
+    return Experience.objects.filter(profile__user__username=username)
+
+
+class ExperienceListView(AsyncAPIView):
+    @cache_async_profile_response('experience')
+    async def get(self, request):
+        rows = [obj async for obj in experience_queryset(request)]
+        return self.render(self.serialize(ExperienceSerializer, rows, many=True))
+
+
+class ExperienceDetailView(AsyncAPIView):
+    async def get(self, request, pk):
+        experience = await aget_object_or_404(experience_queryset(request), pk=pk)
+        return self.render(self.serialize(ExperienceSerializer, experience))
+
+
+class EducationListView(AsyncAPIView):
+    async def get(self, request):
+        rows = [obj async for obj in Education.objects.all()]
+        return self.render(self.serialize(EducationSerializer, rows, many=True))
+
+
+class EducationDetailView(AsyncAPIView):
+    async def get(self, request, pk):
+        education = await aget_object_or_404(Education, pk=pk)
+        return self.render(self.serialize(EducationSerializer, education))
+
+
+class TechnologyListView(AsyncAPIView):
+    """
+    GET /api/v1/async/technologies/?search=
+    """
+
+    async def get(self, request):
+        queryset = Technology.objects.all()
+        # Як SearchFilter: кожне слово має входити в назву
+        for term in request.GET.get('search', '').replace(',', ' ').split():
+            queryset = queryset.filter(name__icontains=term)
+        rows = [obj async for obj in queryset]
+        return self.render(self.serialize(TechnologySerializer, rows, many=True))
+
+
+class TechnologyDetailView(AsyncAPIView):
+    async def get(self, request, pk):
+        technology = await aget_object_or_404(Technology, pk=pk)
+        return self.render(self.serialize(TechnologySerializer, technology))
@@ -0,0 +1,186 @@
+"""
+In-process prefix index for technology autocomplete.
+
+Technology names are kept in a sorted array of ``(term, id)`` pairs, where
+terms are the lower-cased name and its suffixes starting at every word
+("node.js" -> "node.js", "js"), so a prefix lookup is a ``bisect`` plus a
+short scan. Matches are ranked by how many projects use the technology.
+
+``portfolio.signals`` keeps the index up to date incrementally within the
+process; a full rebuild from the database happens on first use and, in the
+background, every ``TECHNOLOGY_AUTOCOMPLETE['REBUILD_INTERVAL']`` seconds,
+which also picks up changes made by other processes.
+"""
+import bisect
+import heapq
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import Count
+
+from config.background import submit
+
+from .models import Technology
+
+DEFAULTS = {
+    'LIMIT': 10,
+    'MAX_LIMIT': 50,
+    'REBUILD_INTERVAL': 5 * 60,
+}
+
+WORD_RE = re.compile(r'\w+')
+
+
+def autocomplete_settings():
+    return {**DEFAULTS, **getattr(settings, 'TECHNOLOGY_AUTOCOMPLETE', {})}
+
+
+def normalize(text):
+    return text.casefold().strip()
+
+
+def terms(name):
+    normalized = normalize(name)
+    return {normalized} | {normalized[match.start():] for match in WORD_RE.finditer(normalized)}
+
+
+class TechnologyIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        self._keys = []
+        self._names = {}
+        self._usage = {}
+        self._built_at = None
+        # Зміни, що надійшли, поки rebuild() читає БД (None — перебудови немає)
+        self._pending = None
+        self._refreshing = False
+
+    @property
+    def is_built(self):
+        return self._built_at is not None
+
+    @property
+    def is_active(self):
+        """
+        Built or being built: changes have to be passed to the index.
+        """
+        return self.is_built or self._pending is not None
+
+    def rebuild(self):
+        """
+        Reloads the index from the database. Changes that arrive while the
+        query runs are replayed on the new data, so they are not lost.
+        """
+        with self._rebuild_lock:
+            with self._lock:
+                self._pending = []
+            try:
+                rows = list(Technology.objects.annotate(usage=Count('projects')).values_list('pk', 'name', 'usage'))
+            except Exception:
+                with self._lock:
+                    self._pending = None
+                raise
+            names, usage, keys = {}, {}, []
+            for pk, name, count in rows:
+                names[pk] = name
+                usage[pk] = count
+                keys += [(term, pk) for term in terms(name)]
+            keys.sort()
+            with self._lock:
+                self._keys, self._names, self._usage = keys, names, usage
+                for change, args in self._pending:
+                    change(*args)
+                self._pending = None
+                self._built_at = time.monotonic()
+
+    def _refresh(self):
+        try:
+            self.rebuild()
+        finally:
+            self._refreshing = False
+
+    def ensure_fresh(self):
+        """
+        Builds the index on first use; later rebuilds run in the background
+        while the current index keeps answering.
+        """
+        if self._built_at is None:
+            self.rebuild()
+            return
+        interval = autocomplete_settings()['REBUILD_INTERVAL']
+        if time.monotonic() - self._built_at > interval:
+            with self._lock:
+                if self._refreshing:
+                    return
+                self._refreshing = True
+            submit(self._refresh)
+
+    def _change(self, change, *args):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((change, args))
+            if self.is_built:
+                change(*args)
+
+    def _remove_terms(self, pk):
+        for term in terms(self._names[pk]):
+            i = bisect.bisect_left(self._keys, (term, pk))
+            if i < len(self._keys) and self._keys[i] == (term, pk):
+                del self._keys[i]
+
+    def _upsert(self, pk, name):
+        if pk in self._names:
+            self._remove_terms(pk)
+        self._names[pk] = name
+        self._usage.setdefault(pk, 0)
+        for term in terms(name):
+            bisect.insort(self._keys, (term, pk))
+
+    def _remove(self, pk):
+        if pk in self._names:
+            self._remove_terms(pk)
+            del self._names[pk]
+            del self._usage[pk]
+
+    def _add_usage(self, deltas):
+        for pk, delta in deltas.items():
+            if pk in self._usage:
+                self._usage[pk] = max(0, self._usage[pk] + delta)
+
+    def upsert(self, pk, name):
+        self._change(self._upsert, pk, name)
+
+    def remove(self, pk):
+        self._change(self._remove, pk)
+
+    def add_usage(self, deltas):
+        """
+        ``deltas`` — {technology id: change in the number of projects}.
+        """
+        self._change(self._add_usage, deltas)
+
+    def search(self, prefix, limit=None):
+        config = autocomplete_settings()
+        limit = max(1, min(limit or config['LIMIT'], config['MAX_LIMIT']))
+        prefix = normalize(prefix)
+        self.ensure_fresh()
+
+        with self._lock:
+            if prefix:
+                matches = set()
+                i = bisect.bisect_left(self._keys, (prefix,))
+                while i < len(self._keys) and self._keys[i][0].startswith(prefix):
+                    matches.add(self._keys[i][1])
+                    i += 1
+            else:
+                matches = self._names.keys()
+            top = heapq.nsmallest(
+                limit, matches, key=lambda pk: (-self._usage[pk], normalize(self._names[pk]), pk)
+            )
+            return [{'id': pk, 'name': self._names[pk], 'projects_count': self._usage[pk]} for pk in top]
+
+
+technology_index = TechnologyIndex()
@@ -0,0 +1,262 @@
+"""
+In-process HTTP benchmark of the API.
+
+Scenarios are executed through DRF's test client (the full middleware and
+view stack, without a network hop) so that SQL queries of every request can
+be counted with ``connection.execute_wrapper``. Results are plain dicts,
+ready to be dumped as JSON and compared between runs.
+
+``ConcurrencyBenchmark`` instead drives the WSGI or the ASGI application
+(``httpx`` transports) with many simultaneous connections, to compare how
+one worker of each stack handles concurrency.
+"""
+import asyncio
+import math
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable
+
+import httpx
+from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from rest_framework.test import APIClient
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: str
+    # Тіло запиту або функція, що повертає нове тіло для кожного запиту
+    data: dict | Callable | None = None
+    # Запит від імені користувача бенчмарку (JWT)
+    auth: bool = False
+    # Для router-ендпоінтів — basename з config/api_router.py
+    basename: str | None = None
+    expected_status: tuple = (200,)
+
+
+@dataclass
+class ScenarioResult:
+    timings: list = field(default_factory=list)
+    queries: list = field(default_factory=list)
+    writes: list = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+
+
+class QueryCounter:
+    """
+    ``connection.execute_wrapper`` that counts executed statements and,
+    separately, INSERT/UPDATE/DELETE.
+    """
+    WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE')
+
+    def __init__(self):
+        self.count = 0
+        self.writes = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        if sql.lstrip().upper().startswith(self.WRITE_STATEMENTS):
+            self.writes += 1
+        return execute(sql, params, many, context)
+
+
+def percentile(sorted_values, p):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(result, elapsed, scenario):
+    timings = sorted(result.timings)
+    errors = sum(count for status, count in result.statuses.items() if status not in scenario.expected_status)
+    return {
+        'method': scenario.method.upper(),
+        'path': scenario.path,
+        'requests': len(timings),
+        'errors': errors,
+        'status_codes': {str(status): count for status, count in sorted(result.statuses.items())},
+        'throughput_rps': round(len(timings) / elapsed, 2) if elapsed else None,
+        'latency_ms': {
+            'mean': round(statistics.fmean(timings), 3) if timings else None,
+            'p50': _round(percentile(timings, 50)),
+            'p95': _round(percentile(timings, 95)),
+            'p99': _round(percentile(timings, 99)),
+            'max': _round(timings[-1] if timings else None),
+        },
+        'queries': {
+            'mean': round(statistics.fmean(result.queries), 2) if result.queries else None,
+            'max': max(result.queries, default=None),
+        },
+        'writes': {
+            'mean': round(statistics.fmean(result.writes), 2) if result.writes else None,
+            'max': max(result.writes, default=None),
+        },
+    }
+
+
+def _round(value):
+    return None if value is None else round(value, 3)
+
+
+class BenchmarkRunner:
+    """
+        runner = BenchmarkRunner(access_token, requests=200, concurrency=4)
+        report = runner.run(scenarios)
+    """
+
+    def __init__(self, access_token=None, requests=100, concurrency=1, warmup=1):
+        self.access_token = access_token
+        self.requests = requests
+        self.concurrency = max(1, concurrency)
+        self.warmup = warmup
+        self._lock = threading.Lock()
+
+    def client(self, auth):
+        client = APIClient()
+        if auth and self.access_token:
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+        return client
+
+    def call(self, client, scenario):
+        data = scenario.data() if callable(scenario.data) else scenario.data
+        return getattr(client, scenario.method.lower())(scenario.path, data, format='json')
+
+    def _worker(self, scenario, count, result):
+        client = self.client(scenario.auth)
+        counter = QueryCounter()
+        timings, queries, writes, statuses = [], [], [], Counter()
+        try:
+            with connection.execute_wrapper(counter):
+                for _ in range(count):
+                    before, writes_before = counter.count, counter.writes
+                    started = time.perf_counter()
+                    response = self.call(client, scenario)
+                    timings.append((time.perf_counter() - started) * 1000)
+                    queries.append(counter.count - before)
+                    writes.append(counter.writes - writes_before)
+                    statuses[response.status_code] += 1
+        finally:
+            if threading.current_thread() is not threading.main_thread():
+                connection.close()
+        with self._lock:
+            result.timings += timings
+            result.queries += queries
+            result.writes += writes
+            result.statuses.update(statuses)
+
+    def run_scenario(self, scenario):
+        client = self.client(scenario.auth)
+        for _ in range(self.warmup):
+            self.call(client, scenario)
+
+        result = ScenarioResult()
+        shares = [self.requests // self.concurrency + (i < self.requests % self.concurrency)
+                  for i in range(self.concurrency)]
+        started = time.perf_counter()
+        if self.concurrency == 1:
+            self._worker(scenario, self.requests, result)
+        else:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                for future in [executor.submit(self._worker, scenario, share, result) for share in shares]:
+                    future.result()
+        return summarize(result, time.perf_counter() - started, scenario)
+
+    def run(self, scenarios, progress=None):
+        report = {}
+        for scenario in scenarios:
+            report[scenario.name] = self.run_scenario(scenario)
+            if progress:
+                progress(scenario.name, report[scenario.name])
+        return report
+
+
+class ConcurrencyBenchmark:
+    """
+    ``concurrency`` clients send ``requests`` GETs in total to one path.
+
+    ``run_wsgi`` models a sync worker with ``threads`` threads (gunicorn
+    ``--threads``): connections beyond that wait for a free thread, and the
+    wait is part of the latency. ``run_asgi`` serves every connection on one
+    event loop, as a single uvicorn worker does. It has to be called from a
+    plain event loop (``asyncio.run``), so that Django gives every request
+    its own thread for sync code as it does under a real ASGI server.
+    """
+    base_url = 'http://testserver'
+
+    def __init__(self, requests=200, concurrency=20, threads=1, warmup=1):
+        self.requests = requests
+        self.concurrency = max(1, concurrency)
+        self.threads = max(1, threads)
+        self.warmup = warmup
+        self._lock = threading.Lock()
+        self._wsgi = None
+        self._asgi = None
+
+    def shares(self):
+        return [self.requests // self.concurrency + (i < self.requests % self.concurrency)
+                for i in range(self.concurrency)]
+
+    def run_wsgi(self, scenario):
+        self._wsgi = self._wsgi or get_wsgi_application()
+        transport = httpx.WSGITransport(app=self._wsgi)
+        slots = threading.BoundedSemaphore(self.threads)
+        result = ScenarioResult()
+
+        def client(count):
+            timings, statuses = [], Counter()
+            try:
+                with httpx.Client(transport=transport, base_url=self.base_url) as http:
+                    for _ in range(count):
+                        started = time.perf_counter()
+                        with slots:
+                            response = http.get(scenario.path)
+                        timings.append((time.perf_counter() - started) * 1000)
+                        statuses[response.status_code] += 1
+            finally:
+                if threading.current_thread() is not threading.main_thread():
+                    connection.close()
+            with self._lock:
+                result.timings += timings
+                result.statuses.update(statuses)
+
+        with httpx.Client(transport=transport, base_url=self.base_url) as http:
+            for _ in range(self.warmup):
+                http.get(scenario.path)
+
+        started = time.perf_counter()
+        if self.concurrency == 1:
+            client(self.requests)
+        else:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                for future in [executor.submit(client, share) for share in self.shares()]:
+                    future.result()
+        return summarize(result, time.perf_counter() - started, scenario)
+
+    async def run_asgi(self, scenario):
+        self._asgi = self._asgi or get_asgi_application()
+        result = ScenarioResult()
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=self._asgi), base_url=self.base_url) as http:
+            async def client(count):
+                for _ in range(count):
+                    started = time.perf_counter()
+                    response = await http.get(scenario.path)
+                    result.timings.append((time.perf_counter() - started) * 1000)
+                    result.statuses[response.status_code] += 1
+
+            for _ in range(self.warmup):
+                await http.get(scenario.path)
+            started = time.perf_counter()
+            await asyncio.gather(*(client(share) for share in self.shares()))
+        return summarize(result, time.perf_counter() - started, scenario)
@@ -0,0 +1,220 @@
+"""
+Bulk create/update/delete for profile-owned records (projects, experience,
+education).
+
+``BulkListSerializer`` is the ``many=True`` serializer: it validates every
+item, reports errors per item (a list aligned with the request body, ``{}``
+for valid items) and writes the whole batch with ``bulk_create`` /
+``bulk_update`` in one transaction. Child serializers hook in through
+``BulkSerializerMixin``. ``BulkWriteMixin`` adds ``/<prefix>/bulk/`` to a
+viewset.
+
+Bulk writes do not send ``post_save``/``m2m_changed``; the batched
+equivalents of the ``portfolio.signals`` receivers run in ``bulk_saved``.
+"""
+from django.db import IntegrityError, transaction
+from rest_framework import permissions, serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from users.cache import invalidate_profiles
+
+from .signals import skip_row_signals
+
+MAX_BULK_ITEMS = 1000
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('max_length', MAX_BULK_ITEMS)
+        super().__init__(*args, **kwargs)
+        self.matched_instances = []
+
+    def to_internal_value(self, data):
+        if self.instance is not None and isinstance(data, list):
+            # Оновлення: усі записи батчу одним запитом
+            ids = [_as_int(item.get('id')) for item in data if isinstance(item, dict)]
+            self._instances = self.instance.in_bulk([pk for pk in ids if pk is not None])
+            self._seen_ids = set()
+            self.matched_instances = []
+
+        attrs_list = super().to_internal_value(data)
+        errors = self.child.bulk_validate(attrs_list, self.matched_instances or None)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return attrs_list
+
+    def run_child_validation(self, data):
+        if self.instance is None:
+            return super().run_child_validation(data)
+
+        pk = _as_int(data.get('id')) if isinstance(data, dict) else None
+        instance = self._instances.get(pk)
+        if instance is None:
+            raise serializers.ValidationError({'id': ["Запис не знайдено."]})
+        if pk in self._seen_ids:
+            raise serializers.ValidationError({'id': ["Запис повторюється в запиті."]})
+        self._seen_ids.add(pk)
+
+        self.child.instance = instance
+        self.child.initial_data = data
+        try:
+            attrs = super().run_child_validation(data)
+        finally:
+            self.child.instance = None
+        self.matched_instances.append(instance)
+        return attrs
+
+    def _split_related(self, validated_data):
+        related_fields = self.child.bulk_related_fields
+        rows, related = [], []
+        for attrs in validated_data:
+            attrs = dict(attrs)
+            related.append({name: attrs.pop(name) for name in related_fields if name in attrs})
+            rows.append(attrs)
+        return rows, related
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        rows, related = self._split_related(validated_data)
+        try:
+            with transaction.atomic():
+                instances = model.objects.bulk_create([model(**attrs) for attrs in rows])
+                self.child.bulk_write_related(instances, related, created=True)
+                self.child.bulk_saved(instances)
+        except IntegrityError:
+            self.raise_conflicts(validated_data)
+        return instances
+
+    def update(self, queryset, validated_data):
+        model = self.child.Meta.model
+        rows, related = self._split_related(validated_data)
+        instances = self.matched_instances
+        try:
+            with transaction.atomic():
+                self.child.bulk_prepare_update(instances, rows)
+                fields = set()
+                for instance, attrs in zip(instances, rows):
+                    for name, value in attrs.items():
+                        setattr(instance, name, value)
+                    fields.update(attrs)
+                if fields:
+                    model.objects.bulk_update(instances, sorted(fields))
+                self.child.bulk_write_related(instances, related, created=False)
+                self.child.bulk_saved(instances)
+        except IntegrityError:
+            self.raise_conflicts(validated_data)
+        return instances
+
+    def raise_conflicts(self, validated_data):
+        """
+        Called on ``IntegrityError``: a concurrent request committed a
+        conflicting record after ``bulk_validate`` passed. Validates the batch
+        again, so the conflicting items get per-item errors (400 instead of
+        500); re-raises the ``IntegrityError`` if nothing is found.
+        """
+        errors = self.child.bulk_validate(validated_data, self.matched_instances or None)
+        if not any(errors):
+            raise
+        raise serializers.ValidationError(errors)
+
+
+class BulkSerializerMixin:
+    """
+    Hooks for ``BulkListSerializer`` (set it as ``Meta.list_serializer_class``).
+    """
+    # Поля, які не є колонками моделі й пишуться в bulk_write_related
+    bulk_related_fields = ()
+
+    def bulk_validate(self, attrs_list, instances=None):
+        """
+        Cross-item validation with one query per check.
+        Returns per-item errors (``{}`` for valid items).
+        """
+        return [{} for _ in attrs_list]
+
+    def bulk_prepare_update(self, instances, rows):
+        """
+        Runs in the update transaction before ``bulk_update``, while
+        ``instances`` still hold the old values.
+        """
+
+    def bulk_write_related(self, instances, related, created):
+        """
+        ``related`` — values of ``bulk_related_fields`` per instance.
+        """
+
+    def bulk_saved(self, instances):
+        profile_ids = {instance.profile_id for instance in instances}
+        transaction.on_commit(lambda: invalidate_profiles(profile_ids))
+
+    def bulk_deleted(self, rows):
+        """
+        Called before ``rows`` (a queryset of the records to delete) are deleted.
+        """
+        profile_ids = set(rows.values_list('profile_id', flat=True))
+        transaction.on_commit(lambda: invalidate_profiles(profile_ids))
+
+
+class BulkWriteMixin:
+    """
+    POST   /<prefix>/bulk/  — list of new records
+    PATCH  /<prefix>/bulk/  — list of partial updates, each with "id"
+    DELETE /<prefix>/bulk/  — {"ids": [...]}
+
+    Only the current user's records can be changed. The whole batch is
+    rejected if any item is invalid.
+    """
+
+    def get_bulk_queryset(self):
+        model = self.get_serializer_class().Meta.model
+        return model.objects.filter(profile=self.request.user.profile)
+
+    def bulk_response(self, instances, status_code):
+        # Перечитуємо з тими ж select/prefetch, що й у списку, у порядку запиту
+        positions = {instance.pk: i for i, instance in enumerate(instances)}
+        fresh = sorted(self.get_queryset().filter(pk__in=positions), key=lambda obj: positions[obj.pk])
+        return Response(self.get_serializer(fresh, many=True).data, status=status_code)
+
+    @action(detail=False, methods=['post'], url_path='bulk', permission_classes=[permissions.IsAuthenticated])
+    def bulk(self, request):
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        instances = serializer.save(profile=request.user.profile)
+        return self.bulk_response(instances, status.HTTP_201_CREATED)
+
+    @bulk.mapping.patch
+    def bulk_update(self, request):
+        serializer = self.get_serializer(self.get_bulk_queryset(), data=request.data, many=True, partial=True)
+        serializer.is_valid(raise_exception=True)
+        instances = serializer.save()
+        return self.bulk_response(instances, status.HTTP_200_OK)
+
+    @bulk.mapping.delete
+    def bulk_destroy(self, request):
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if not isinstance(ids, list) or not ids:
+            return Response({'ids': ["Очікується непорожній список id."]}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > MAX_BULK_ITEMS:
+            return Response({'ids': [f"Не більше {MAX_BULK_ITEMS} записів за раз."]},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        parsed = [_as_int(pk) for pk in ids]
+        existing = set(self.get_bulk_queryset().filter(pk__in=[pk for pk in parsed if pk]).values_list('pk', flat=True))
+        errors = [{} if pk in existing else {'id': ["Запис не знайдено."]} for pk in parsed]
+        if any(errors):
+            return Response({'ids': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = self.get_bulk_queryset().filter(pk__in=existing)
+        # Побічні ефекти видалення — одним пакетом замість сигналів на кожен рядок
+        with transaction.atomic(), skip_row_signals():
+            self.get_serializer().bulk_deleted(rows)
+            rows.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,382 @@
+"""
+Write-behind counter for project views.
+
+Increments are collected in a fast store (the ``VIEW_COUNTER['CACHE_ALIAS']``
+cache, Redis in production) with an in-process buffer as a fallback, and are
+periodically flushed to ``Project.views`` with batched ``F()`` updates
+(and to the trending leaderboard, ``portfolio.trending``).
+"""
+import atexit
+import hashlib
+import importlib.util
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import close_old_connections, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.dispatch import Signal
+from rest_framework.throttling import BaseThrottle
+
+from .models import Project
+from .trending import record_views
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'CACHE_ALIAS': 'counters',
+    'DEDUP_WINDOW': 30 * 60,
+    'FLUSH_INTERVAL': 10,
+    'BATCH_SIZE': 500,
+    'BASE_TIMEOUT': 60 * 60,
+}
+
+
+def counter_settings():
+    return {**DEFAULTS, **getattr(settings, 'VIEW_COUNTER', {})}
+
+
+# Після запису переглядів у БД: counts = {project_id: приріст}
+views_flushed = Signal()
+
+REDIS_BACKEND = 'django.core.cache.backends.redis.RedisCache'
+
+
+def check_store():
+    """
+    Called at startup: a store that can never work (RedisCache without the
+    ``redis`` package) is a configuration error, not a reason to buffer
+    locally on every call. Temporary outages still fall back to the
+    in-process buffer.
+    """
+    alias = counter_settings()['CACHE_ALIAS']
+    backend = settings.CACHES.get(alias, {}).get('BACKEND')
+    if backend == REDIS_BACKEND and importlib.util.find_spec('redis') is None:
+        raise ImproperlyConfigured(
+            f"VIEW_COUNTER cache '{alias}' uses RedisCache, but the redis package is not installed."
+        )
+
+
+def visitor_fingerprint(request):
+    """
+    Ідентифікатор відвідувача для дедуплікації: id користувача,
+    а для анонімів — IP разом з User-Agent.
+    """
+    if request.user.is_authenticated:
+        ident = f'user:{request.user.pk}'
+    else:
+        ip = BaseThrottle().get_ident(request)
+        ident = f"anon:{ip}:{request.META.get('HTTP_USER_AGENT', '')}"
+    return hashlib.sha1(ident.encode()).hexdigest()
+
+
+class LocalViewBuffer:
+    """
+    Pending increments kept in the memory of the current process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = defaultdict(int)
+
+    def incr(self, project_id, amount=1):
+        with self._lock:
+            self._pending[project_id] += amount
+            return self._pending[project_id]
+
+    def pending(self, project_id):
+        with self._lock:
+            return self._pending.get(project_id, 0)
+
+    def drain(self):
+        with self._lock:
+            drained, self._pending = dict(self._pending), defaultdict(int)
+        return drained
+
+    def restore(self, counts):
+        with self._lock:
+            for project_id, amount in counts.items():
+                self._pending[project_id] += amount
+
+
+class CacheViewBuffer:
+    """
+    Pending increments kept in a shared cache.
+
+    A project is registered in a numbered "dirty" slot whenever its counter
+    goes up from zero, so the flusher finds the projects to write without
+    scanning keys. Only atomic ``incr``/``decr``/``add`` are used on counters.
+    """
+    prefix = 'views'
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def _key(self, *parts):
+        return ':'.join([self.prefix, *map(str, parts)])
+
+    def _incr(self, key, amount=1):
+        try:
+            return self.cache.incr(key, amount)
+        except ValueError:
+            if self.cache.add(key, amount, timeout=None):
+                return amount
+            return self.cache.incr(key, amount)
+
+    def _register(self, project_id):
+        slot = self._incr(self._key('dirty', 'seq'))
+        self.cache.set(self._key('dirty', slot), project_id, timeout=None)
+
+    def incr(self, project_id, amount=1):
+        value = self._incr(self._key('pending', project_id), amount)
+        if value == amount:
+            self._register(project_id)
+        return value
+
+    def pending(self, project_id):
+        return self.cache.get(self._key('pending', project_id), 0)
+
+    def _dirty_projects(self):
+        seq = self.cache.get(self._key('dirty', 'seq'), 0)
+        cursor = self.cache.get(self._key('dirty', 'cursor'), 0)
+        # Слоти, видані ще до попереднього скидання, вже мали бути записані;
+        # новіші пропуски можуть бути ще "в дорозі", тож на них зупиняємось.
+        horizon = self.cache.get(self._key('dirty', 'horizon'), 0)
+
+        slots = {n: self._key('dirty', n) for n in range(cursor + 1, seq + 1)}
+        found = self.cache.get_many(list(slots.values()))
+        project_ids = set()
+        for n, key in slots.items():
+            if key not in found and n > horizon:
+                break
+            if key in found:
+                project_ids.add(found[key])
+            cursor = n
+
+        self.cache.delete_many([slots[n] for n in slots if n <= cursor])
+        self.cache.set_many({
+            self._key('dirty', 'cursor'): cursor,
+            self._key('dirty', 'horizon'): seq,
+        }, timeout=None)
+        return project_ids
+
+    def drain(self):
+        project_ids = self._dirty_projects()
+        keys = {project_id: self._key('pending', project_id) for project_id in project_ids}
+        values = self.cache.get_many(list(keys.values()))
+
+        counts = {}
+        for project_id, key in keys.items():
+            amount = values.get(key, 0)
+            if amount <= 0:
+                continue
+            left = self.cache.decr(key, amount)
+            counts[project_id] = amount
+            # Поки ми читали, прийшли нові інкременти: лічильник не пройшов
+            # через нуль, тож реєструємо проєкт знову самі.
+            if left > 0:
+                self._register(project_id)
+        return counts
+
+    def restore(self, counts):
+        for project_id, amount in counts.items():
+            self.incr(project_id, amount)
+
+    def lock(self, timeout):
+        return self.cache.add(self._key('flush-lock'), 1, timeout=timeout)
+
+    def unlock(self):
+        self.cache.delete(self._key('flush-lock'))
+
+
+def apply_view_counts(counts, batch_size=500):
+    """
+    Writes accumulated increments with one ``UPDATE ... CASE`` per batch.
+    Ids are sorted so concurrent flushers lock rows in the same order.
+    """
+    items = sorted(counts.items())
+    with transaction.atomic():
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            delta = Case(
+                *[When(pk=project_id, then=Value(amount)) for project_id, amount in batch],
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+            Project.objects.filter(pk__in=[project_id for project_id, _ in batch]).update(
+                views=F('views') + delta
+            )
+
+
+class ViewCounter:
+    """
+    Facade used by the API: deduplicates visits, buffers increments,
+    estimates the current count and flushes the buffer to the database.
+    """
+
+    def __init__(self):
+        self.local = LocalViewBuffer()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._flusher = None
+
+    @property
+    def config(self):
+        return counter_settings()
+
+    @property
+    def cache(self):
+        return caches[self.config['CACHE_ALIAS']]
+
+    @property
+    def shared(self):
+        return CacheViewBuffer(self.cache)
+
+    def _base_key(self, project_id):
+        return f'views:base:{project_id}'
+
+    def base_views(self, project_id):
+        """
+        Кількість переглядів, що вже записана в БД. Кешується, тож
+        звернення до бази відбувається лише при першому читанні.
+        """
+        key = self._base_key(project_id)
+        try:
+            views = self.cache.get(key)
+        except Exception:
+            views = None
+        if views is not None:
+            return views
+
+        views = Project.objects.filter(pk=project_id).values_list('views', flat=True).first()
+        if views is not None:
+            try:
+                self.cache.add(key, views, timeout=self.config['BASE_TIMEOUT'])
+            except Exception:
+                pass
+        return views
+
+    def pending(self, project_id):
+        try:
+            shared = self.shared.pending(project_id)
+        except Exception:
+            shared = 0
+        return shared + self.local.pending(project_id)
+
+    def _first_visit(self, project_id, visitor):
+        key = f'views:seen:{project_id}:{visitor}'
+        try:
+            return self.cache.add(key, 1, timeout=self.config['DEDUP_WINDOW'])
+        except Exception:
+            # Без спільного сховища дедуплікація неможлива — рахуємо візит.
+            return True
+
+    def increment(self, project_id, amount=1):
+        try:
+            self.shared.incr(project_id, amount)
+        except Exception:
+            logger.warning("View counter store unavailable, buffering locally", exc_info=True)
+            self.local.incr(project_id, amount)
+        self.ensure_flusher()
+
+    def record(self, project_id, visitor):
+        """
+        Registers a visit and returns the estimated views count,
+        or ``None`` if the project does not exist.
+        """
+        base = self.base_views(project_id)
+        if base is None:
+            return None
+        if self._first_visit(project_id, visitor):
+            self.increment(project_id)
+        return base + self.pending(project_id)
+
+    def flush(self):
+        """
+        Drains both buffers into ``Project.views`` and the trending scores.
+        Returns the number of views written.
+        """
+        if not self._flush_lock.acquire(blocking=False):
+            return 0
+        try:
+            counts = self.local.drain()
+            shared = self.shared
+            try:
+                if shared.lock(timeout=max(self.config['FLUSH_INTERVAL'], 10) * 6):
+                    try:
+                        for project_id, amount in shared.drain().items():
+                            counts[project_id] = counts.get(project_id, 0) + amount
+                    finally:
+                        shared.unlock()
+            except Exception:
+                logger.warning("Could not drain the shared view counter store", exc_info=True)
+
+            if not counts:
+                return 0
+            try:
+                apply_view_counts(counts, self.config['BATCH_SIZE'])
+            except Exception:
+                logger.exception("Failed to flush %d project view counters", len(counts))
+                self.local.restore(counts)
+                return 0
+
+            try:
+                record_views(counts)
+            except Exception:
+                logger.exception("Failed to update the trending leaderboard")
+
+            try:
+                views_flushed.send(sender=self.__class__, counts=counts)
+            except Exception:
+                logger.exception("views_flushed receiver failed")
+
+            for project_id, amount in counts.items():
+                try:
+                    self.cache.incr(self._base_key(project_id), amount)
+                except Exception:
+                    pass
+            return sum(counts.values())
+        finally:
+            self._flush_lock.release()
+
+    def ensure_flusher(self):
+        """
+        Starts the periodic background flush for this process.
+        """
+        interval = self.config['FLUSH_INTERVAL']
+        if not interval or (self._flusher and self._flusher.is_alive()):
+            return
+        with self._start_lock:
+            if self._flusher and self._flusher.is_alive():
+                return
+            self._flusher = threading.Thread(
+                target=self._run_flusher, args=(interval,), name='view-counter-flusher', daemon=True
+            )
+            self._flusher.start()
+
+    def _run_flusher(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Periodic view counter flush failed")
+            finally:
+                close_old_connections()
+
+
+view_counter = ViewCounter()
+
+
+@atexit.register
+def _flush_on_exit():
+    # Локальний буфер живе лише в пам'яті процесу — не губимо його при зупинці.
+    if view_counter._flusher is not None:
+        try:
+            view_counter.flush()
+        except Exception:
+            logger.exception("Final view counter flush failed")
@@ -0,0 +1,194 @@
+"""
+Streaming export of projects, experience and education (NDJSON or CSV).
+
+Rows are read with ``values().iterator(chunk_size=...)`` — a server-side
+cursor on PostgreSQL — and rendered one chunk at a time, so memory does not
+grow with the size of the table. Technologies of a chunk of projects are
+loaded with one query per chunk. Output can be gzipped on the fly.
+
+Used by ``ExportView`` (``/api/v1/export/<dataset>.<format>[.gz]``) and the
+``export_data`` command.
+"""
+import csv
+import datetime
+import io
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import islice
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Education, Experience, Project
+
+DEFAULTS = {
+    'CHUNK_SIZE': 2000,
+    # Розмір стиснутого блоку, який віддається клієнту
+    'GZIP_FLUSH_SIZE': 64 * 1024,
+}
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def export_settings():
+    return {**DEFAULTS, **getattr(settings, 'EXPORT', {})}
+
+
+@dataclass(frozen=True)
+class Dataset:
+    model: type
+    columns: tuple
+    # Поле для фільтра since/until
+    date_field: str
+
+
+DATASETS = {
+    'projects': Dataset(
+        Project,
+        ('id', 'username', 'title', 'description', 'github_link', 'live_link', 'views', 'created_at',
+         'technologies'),
+        'created_at',
+    ),
+    'experience': Dataset(
+        Experience,
+        ('id', 'username', 'company', 'role', 'start_date', 'end_date', 'description'),
+        'start_date',
+    ),
+    'education': Dataset(
+        Education,
+        ('id', 'username', 'institution', 'degree', 'field_of_study', 'start_date', 'end_date'),
+        'start_date',
+    ),
+}
+
+
+def parse_date(value, name):
+    """
+    'YYYY-MM-DD' -> date; ``ValueError`` with the parameter name otherwise.
+    """
+    if not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(name)
+
+
+def export_queryset(name, username=None, since=None, until=None):
+    dataset = DATASETS[name]
+    columns = [column for column in dataset.columns if column not in ('username', 'technologies')]
+    queryset = dataset.model.objects.order_by('pk').values(*columns, username=F('profile__user__username'))
+    if username:
+        queryset = queryset.filter(profile__user__username=username)
+
+    field = dataset.model._meta.get_field(dataset.date_field)
+    if since:
+        if field.get_internal_type() == 'DateTimeField':
+            since = timezone.make_aware(datetime.datetime.combine(since, datetime.time.min))
+        queryset = queryset.filter(**{f'{dataset.date_field}__gte': since})
+    if until:
+        # until включно
+        if field.get_internal_type() == 'DateTimeField':
+            end = timezone.make_aware(datetime.datetime.combine(until + datetime.timedelta(days=1), datetime.time.min))
+            queryset = queryset.filter(**{f'{dataset.date_field}__lt': end})
+        else:
+            queryset = queryset.filter(**{f'{dataset.date_field}__lte': until})
+    return queryset
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _attach_technologies(rows):
+    names = defaultdict(list)
+    for project_id, name in (
+            Project.technologies.through.objects
+            .filter(project_id__in=[row['id'] for row in rows])
+            .order_by('technology__name')
+            .values_list('project_id', 'technology__name')):
+        names[project_id].append(name)
+    for row in rows:
+        row['technologies'] = names[row['id']]
+
+
+def export_chunks(name, username=None, since=None, until=None, chunk_size=None):
+    """
+    Yields lists of row dicts (columns of ``DATASETS[name]``) of at most
+    ``chunk_size`` rows.
+    """
+    chunk_size = chunk_size or export_settings()['CHUNK_SIZE']
+    rows = export_queryset(name, username, since, until).iterator(chunk_size=chunk_size)
+    for batch in _batches(rows, chunk_size):
+        if name == 'projects':
+            _attach_technologies(batch)
+        yield batch
+
+
+def render_ndjson(chunks, columns):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for rows in chunks:
+        yield ''.join(encoder.encode({column: row[column] for column in columns}) + '\n' for row in rows)
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+
+def render_csv(chunks, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in chunks:
+        for row in rows:
+            values = [row[column] for column in columns]
+            if 'technologies' in row:
+                values[columns.index('technologies')] = ';'.join(row['technologies'])
+            writer.writerow([_csv_value(value) for value in values])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def gzip_stream(chunks):
+    """
+    bytes -> gzip bytes, flushed in blocks of ``GZIP_FLUSH_SIZE``.
+    """
+    flush_size = export_settings()['GZIP_FLUSH_SIZE']
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    pending = []
+    pending_size = 0
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            pending.append(data)
+            pending_size += len(data)
+        if pending_size >= flush_size:
+            yield b''.join(pending)
+            pending, pending_size = [], 0
+    pending.append(compressor.flush())
+    yield b''.join(pending)
+
+
+def export_stream(name, fmt, compress=False, **filters):
+    """
+    Encoded output of one dataset: an iterator of bytes.
+    """
+    columns = DATASETS[name].columns
+    render = render_ndjson if fmt == 'ndjson' else render_csv
+    stream = (text.encode() for text in render(export_chunks(name, **filters), columns))
+    return gzip_stream(stream) if compress else stream
@@ -0,0 +1,15 @@
+from rest_framework import filters
+
+
+class RankedOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter, який для ранжованого пошуку за замовчуванням сортує
+    за релевантністю (search_rank), а не за view.ordering.
+    Явний ?ordering= від клієнта має пріоритет.
+    """
+    rank_field = 'search_rank'
+
+    def get_ordering(self, request, queryset, view):
+        if not request.query_params.get(self.ordering_param) and self.rank_field in queryset.query.annotations:
+            return [f'-{self.rank_field}', *self.get_default_ordering(view)]
+        return super().get_ordering(request, queryset, view)
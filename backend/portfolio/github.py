@@ -0,0 +1,366 @@
+"""
+GitHub repositories sync.
+
+``GitHubClient`` follows ``Link`` header pagination and sends conditional
+requests (``If-None-Match``) with the ETags stored on the previous
+``GitHubSyncJob``, so unchanged pages cost no rate limit. Each changed page
+is written with one bulk upsert. ``AsyncGitHubClient`` (httpx) does the same
+but downloads pages 2..N concurrently; the sync API action uses it.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import requests
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.utils.urls import replace_query_param
+
+from users.cache import invalidate_profiles
+from users.models import UserProfile
+
+from .models import GitHubSyncJob, Project
+from .search import update_search_vectors
+from .trending import sync_projects
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_URL = 'https://api.github.com'
+DEFAULT_TIMEOUT = 10
+PER_PAGE = 100
+DEFAULT_CONCURRENCY = 4
+DEFAULT_STALE_AFTER = 600
+
+# Статуси, за яких задача ще має завершитися
+ACTIVE_STATUSES = (GitHubSyncJob.Status.PENDING, GitHubSyncJob.Status.RUNNING)
+PROGRESS_FIELDS = ['pages_fetched', 'pages_not_modified', 'total_synced', 'newly_created', 'updated_at']
+
+
+class GitHubError(Exception):
+    pass
+
+
+def github_username_from_url(github_url):
+    """
+    'https://github.com/octocat/' -> 'octocat'
+    """
+    path_parts = [part for part in urlparse(github_url).path.split('/') if part]
+    if not path_parts:
+        raise ValueError(f"no username in {github_url!r}")
+    return path_parts[-1]
+
+
+@dataclass
+class RepoPage:
+    url: str
+    repos: list | None  # None — сторінка не змінилась (304)
+    etag: str | None
+    next_url: str | None
+    last_url: str | None = None
+
+    def cache_entry(self):
+        # Що запам'ятати для умовного запиту наступного разу (GitHubSyncJob.etags)
+        return {'etag': self.etag, 'next': self.next_url, 'last': self.last_url}
+
+
+class BaseGitHubClient:
+    def __init__(self, base_url=None, token=None, timeout=None):
+        self.base_url = (base_url or getattr(settings, 'GITHUB_API_URL', DEFAULT_API_URL)).rstrip('/')
+        self.timeout = timeout or getattr(settings, 'GITHUB_API_TIMEOUT', DEFAULT_TIMEOUT)
+        self.headers = {'Accept': 'application/vnd.github.v3+json'}
+        token = token or getattr(settings, 'GITHUB_API_TOKEN', None)
+        if token:
+            self.headers['Authorization'] = f'Bearer {token}'
+        self.rate_limit_remaining = None
+
+    def repos_url(self, username):
+        return f'{self.base_url}/users/{username}/repos?per_page={PER_PAGE}'
+
+    def conditional_headers(self, cached):
+        return {'If-None-Match': cached['etag']} if cached.get('etag') else {}
+
+    def to_page(self, url, response, cached):
+        """
+        ``response`` — requests або httpx: обидва мають status_code, headers, links і json().
+        """
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is not None:
+            self.rate_limit_remaining = int(remaining)
+
+        links = response.links
+        if response.status_code == 304:
+            return RepoPage(
+                url, None, cached['etag'],
+                links.get('next', {}).get('url', cached.get('next')),
+                links.get('last', {}).get('url', cached.get('last')),
+            )
+        if response.status_code >= 400:
+            raise GitHubError(f"GitHub API відповів {response.status_code} для {url}")
+        return RepoPage(
+            url,
+            response.json(),
+            response.headers.get('ETag'),
+            links.get('next', {}).get('url'),
+            links.get('last', {}).get('url'),
+        )
+
+
+class GitHubClient(BaseGitHubClient):
+    def __init__(self, base_url=None, token=None, timeout=None, session=None):
+        super().__init__(base_url, token, timeout)
+        self.session = session or requests.Session()
+        self.session.headers.update(self.headers)
+
+    def fetch_page(self, url, cached=None):
+        cached = cached or {}
+        try:
+            response = self.session.get(url, headers=self.conditional_headers(cached), timeout=self.timeout)
+        except requests.RequestException as e:
+            raise GitHubError(f"Помилка при зверненні до GitHub API: {e}") from e
+        return self.to_page(url, response, cached)
+
+    def iter_repo_pages(self, username, etags=None):
+        etags = etags or {}
+        url = self.repos_url(username)
+        while url:
+            page = self.fetch_page(url, etags.get(url))
+            yield page
+            url = page.next_url
+
+
+def remaining_page_urls(first_page):
+    """
+    URLs of pages 2..N built from the ``last`` link of page 1, or None if
+    the response had no such link (then pages are followed one by one).
+    """
+    if not first_page.last_url:
+        return None
+    try:
+        last = int(parse_qs(urlparse(first_page.last_url).query)['page'][0])
+    except (KeyError, ValueError):
+        return None
+    return [replace_query_param(first_page.last_url, 'page', number) for number in range(2, last + 1)]
+
+
+class AsyncGitHubClient(BaseGitHubClient):
+    """
+    httpx-based client. Once page 1 is known, the remaining pages are
+    requested concurrently (``GITHUB_API_CONCURRENCY`` at a time) instead of
+    following ``next`` links one request after another.
+
+        async with AsyncGitHubClient() as client:
+            async for page in client.iter_repo_pages('octocat'):
+                ...
+    """
+
+    def __init__(self, base_url=None, token=None, timeout=None, concurrency=None, http=None):
+        super().__init__(base_url, token, timeout)
+        self.concurrency = concurrency or getattr(settings, 'GITHUB_API_CONCURRENCY', DEFAULT_CONCURRENCY)
+        self.http = http or httpx.AsyncClient(timeout=self.timeout)
+        self.http.headers.update(self.headers)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.http.aclose()
+
+    async def fetch_page(self, url, cached=None):
+        cached = cached or {}
+        try:
+            response = await self.http.get(url, headers=self.conditional_headers(cached))
+        except httpx.HTTPError as e:
+            raise GitHubError(f"Помилка при зверненні до GitHub API: {e}") from e
+        return self.to_page(url, response, cached)
+
+    async def iter_repo_pages(self, username, etags=None):
+        """
+        Yields pages in order.
+        """
+        etags = etags or {}
+        url = self.repos_url(username)
+        first = await self.fetch_page(url, etags.get(url))
+        yield first
+
+        urls = remaining_page_urls(first)
+        if urls is None:
+            url = first.next_url
+            while url:
+                page = await self.fetch_page(url, etags.get(url))
+                yield page
+                url = page.next_url
+            return
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(url):
+            async with semaphore:
+                return await self.fetch_page(url, etags.get(url))
+
+        tasks = [asyncio.ensure_future(fetch(url)) for url in urls]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+def upsert_repos(profile, repos):
+    """
+    Writes one page of repositories: a single lookup of the existing
+    projects, then bulk_create for new ones and bulk_update for the rest.
+    Forks are skipped. Returns (synced, created).
+    """
+    rows = {
+        repo['html_url']: {
+            'title': repo['name'][:100],
+            'description': repo['description'] or "",
+            'live_link': repo['homepage'] or "",
+        }
+        for repo in repos
+        if not repo['fork']
+    }
+    if not rows:
+        return 0, 0
+
+    with transaction.atomic():
+        # Дві синхронізації одного профілю не повинні вставити той самий
+        # репозиторій двічі (project_unique_github_link) — серіалізуємо їх
+        UserProfile.objects.select_for_update().only('pk').get(pk=profile.pk)
+        existing = {
+            project.github_link: project
+            for project in Project.objects.filter(profile=profile, github_link__in=rows)
+        }
+        to_create, to_update = [], []
+        for link, fields in rows.items():
+            project = existing.get(link)
+            if project is None:
+                to_create.append(Project(profile=profile, github_link=link, **fields))
+                continue
+            if any(getattr(project, name) != value for name, value in fields.items()):
+                for name, value in fields.items():
+                    setattr(project, name, value)
+                to_update.append(project)
+
+        created = Project.objects.bulk_create(to_create)
+        Project.objects.bulk_update(to_update, ['title', 'description', 'live_link'])
+
+    # bulk-операції не надсилають сигналів — оновлюємо пошуковий вектор самі
+    changed = [project.pk for project in created + to_update if project.pk]
+    if changed:
+        update_search_vectors(changed)
+        sync_projects(changed)
+        invalidate_profiles([profile.pk])
+    return len(rows), len(to_create)
+
+
+def previous_etags(job):
+    last = (
+        GitHubSyncJob.objects
+        .filter(profile_id=job.profile_id, github_username=job.github_username,
+                status=GitHubSyncJob.Status.SUCCEEDED)
+        .exclude(pk=job.pk)
+        .values_list('etags', flat=True)
+        .first()
+    )
+    return last or {}
+
+
+def start_job(job_id):
+    job = GitHubSyncJob.objects.select_related('profile').get(pk=job_id)
+    job.status = GitHubSyncJob.Status.RUNNING
+    job.save(update_fields=['status', 'updated_at'])
+    return job, previous_etags(job)
+
+
+def apply_page(job, page, etags):
+    etags[page.url] = page.cache_entry()
+    job.pages_fetched += 1
+    if page.repos is None:
+        job.pages_not_modified += 1
+    else:
+        synced, created = upsert_repos(job.profile, page.repos)
+        job.total_synced += synced
+        job.newly_created += created
+    # Прогрес для опитування і ознака того, що воркер живий (updated_at)
+    job.save(update_fields=PROGRESS_FIELDS)
+
+
+def active_job(profile):
+    """
+    The profile's unfinished sync job or None. Jobs without progress for
+    ``GITHUB_SYNC_STALE_AFTER`` seconds (their worker died) are marked failed.
+    """
+    now = timezone.now()
+    stale_after = getattr(settings, 'GITHUB_SYNC_STALE_AFTER', DEFAULT_STALE_AFTER)
+    jobs = GitHubSyncJob.objects.filter(profile=profile, status__in=ACTIVE_STATUSES)
+    jobs.filter(updated_at__lt=now - timedelta(seconds=stale_after)).update(
+        status=GitHubSyncJob.Status.FAILED,
+        error="Синхронізацію перервано: задача надто довго не відповідала",
+        finished_at=now,
+    )
+    return jobs.first()
+
+
+def finish_job(job, client, etags, error=None):
+    if isinstance(error, GitHubError):
+        job.status = GitHubSyncJob.Status.FAILED
+        job.error = str(error)
+    elif error is not None:
+        logger.error("GitHub sync job %s failed", job.pk, exc_info=error)
+        job.status = GitHubSyncJob.Status.FAILED
+        job.error = "Внутрішня помилка синхронізації"
+    else:
+        job.status = GitHubSyncJob.Status.SUCCEEDED
+        job.etags = etags
+
+    job.rate_limit_remaining = client.rate_limit_remaining
+    job.finished_at = timezone.now()
+    job.save()
+    return job
+
+
+def run_sync_job(job_id, client=None):
+    """
+    Background task: syncs every page of the user's repositories.
+    """
+    job, previous = start_job(job_id)
+    client = client or GitHubClient()
+    etags = {}
+    try:
+        for page in client.iter_repo_pages(job.github_username, previous):
+            apply_page(job, page, etags)
+    except Exception as e:
+        return finish_job(job, client, etags, e)
+    return finish_job(job, client, etags)
+
+
+async def arun_sync_job(job_id, client=None):
+    """
+    The same with ``AsyncGitHubClient``: pages are downloaded concurrently,
+    each one is written (in a thread, via the sync ORM) as soon as it arrives.
+    """
+    job, previous = await sync_to_async(start_job)(job_id)
+    client = client or AsyncGitHubClient()
+    etags = {}
+    try:
+        async with client:
+            async for page in client.iter_repo_pages(job.github_username, previous):
+                await sync_to_async(apply_page)(job, page, etags)
+    except Exception as e:
+        return await sync_to_async(finish_job)(job, client, etags, e)
+    return await sync_to_async(finish_job)(job, client, etags)
+
+
+def run_sync_job_async(job_id):
+    """
+    Background task entry point for ``arun_sync_job`` (config.background runs
+    tasks in threads); database work stays in the calling thread.
+    """
+    return async_to_sync(arun_sync_job)(job_id)
@@ -0,0 +1,351 @@
+"""
+Bulk import of projects, experience and education (``import_data``).
+
+Input is the format written by ``portfolio.export``: NDJSON, CSV or a JSON
+array (optionally gzipped), one record per row with ``username``.
+
+Every batch runs in one transaction:
+
+* users, profiles and technologies are resolved with one query per batch;
+  unknown users are created with their profiles (``bulk_create``);
+* rows are loaded with ``COPY ... FROM STDIN`` on PostgreSQL (ids are
+  reserved from the table's sequence first, so technology links can be
+  written the same way) and with ``bulk_create`` elsewhere;
+* instead of per-row ``post_save``/``m2m_changed`` receivers, their batched
+  equivalents run once: search vectors, trending leaderboard, technology
+  autocomplete usage and cached profile responses.
+"""
+import csv
+import datetime
+import gzip
+import io
+import json
+from collections import Counter
+from pathlib import Path
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, models, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from users.cache import invalidate_profiles
+from users.models import UserProfile
+from users.search import profile_names
+
+from .autocomplete import technology_index
+from .models import Education, Experience, Project, Technology
+from .search import update_search_vectors
+from .trending import sync_projects
+
+FORMATS = ('ndjson', 'csv', 'json')
+
+# Поля рядка -> (обов'язкове, перетворення)
+FIELDS = {
+    'projects': {
+        'title': (True, str),
+        'description': (True, str),
+        'github_link': (False, str),
+        'live_link': (False, str),
+        'views': (False, int),
+        'created_at': (False, 'datetime'),
+    },
+    'experience': {
+        'company': (True, str),
+        'role': (True, str),
+        'start_date': (True, 'date'),
+        'end_date': (False, 'date'),
+        'description': (False, str),
+    },
+    'education': {
+        'institution': (True, str),
+        'degree': (True, str),
+        'field_of_study': (True, str),
+        'start_date': (True, 'date'),
+        'end_date': (False, 'date'),
+    },
+}
+
+MODELS = {'projects': Project, 'experience': Experience, 'education': Education}
+
+
+class InvalidRow(ValueError):
+    pass
+
+
+def detect_format(path):
+    suffixes = [suffix.lower() for suffix in Path(path).suffixes if suffix.lower() != '.gz']
+    fmt = suffixes[-1].lstrip('.') if suffixes else ''
+    if fmt == 'jsonl':
+        return 'ndjson'
+    if fmt not in FORMATS:
+        raise ValueError(f"Cannot detect the format of {path}; pass --format.")
+    return fmt
+
+
+def read_rows(path, fmt):
+    """
+    Yields row dicts. JSON arrays are loaded whole — use NDJSON or CSV for
+    large files.
+    """
+    opener = gzip.open if str(path).endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', newline='') as f:
+        if fmt == 'ndjson':
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif fmt == 'csv':
+            for row in csv.DictReader(f):
+                if 'technologies' in row:
+                    row['technologies'] = [name for name in (row['technologies'] or '').split(';') if name]
+                yield row
+        else:
+            yield from json.load(f)
+
+
+def _convert(value, kind):
+    if kind == 'date':
+        return value if isinstance(value, datetime.date) else parse_date(value)
+    if kind == 'datetime':
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValueError(value)
+        return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+    return kind(value)
+
+
+def clean_row(dataset, row):
+    """
+    Row -> (username, {field: value}, technology names). Raises ``InvalidRow``.
+    """
+    username = (row.get('username') or '').strip()
+    if not username:
+        raise InvalidRow("username is required")
+    values = {}
+    for name, (required, kind) in FIELDS[dataset].items():
+        value = row.get(name)
+        if value in (None, ''):
+            if required:
+                raise InvalidRow(f"{name} is required")
+            continue
+        try:
+            values[name] = _convert(value, kind)
+        except (TypeError, ValueError):
+            raise InvalidRow(f"invalid {name}: {value!r}")
+        max_length = MODELS[dataset]._meta.get_field(name).max_length
+        if values[name] is None or (max_length and len(values[name]) > max_length) \
+                or (kind is int and values[name] < 0):
+            raise InvalidRow(f"invalid {name}: {value!r}")
+    technologies = []
+    if dataset == 'projects':
+        technologies = sorted({name.strip()[:100] for name in row.get('technologies') or [] if name.strip()})
+    return username, values, technologies
+
+
+def resolve_profiles(usernames, create=True):
+    """
+    {username: profile id}; missing users (and profiles) are created.
+    Returns (mapping, number of created users).
+    """
+    profiles = dict(
+        UserProfile.objects.filter(user__username__in=usernames).values_list('user__username', 'pk')
+    )
+    missing = sorted(set(usernames) - set(profiles))
+    if missing and create:
+        # Без пароля: користувачі входять після скидання пароля
+        password = make_password(None)
+        existing_users = dict(User.objects.filter(username__in=missing).values_list('username', 'pk'))
+        users = User.objects.bulk_create(
+            [User(username=username, password=password) for username in missing if username not in existing_users]
+        )
+        user_ids = {**existing_users, **{user.username: user.pk for user in users}}
+        new_profiles = []
+        for username in missing:
+            profile = UserProfile(user_id=user_ids[username])
+            profile.display_name, profile.search_name = profile_names(username, '', '')
+            new_profiles.append(profile)
+        UserProfile.objects.bulk_create(new_profiles)
+        profiles.update(
+            UserProfile.objects.filter(user__username__in=missing).values_list('user__username', 'pk')
+        )
+        return profiles, len(users)
+    return profiles, 0
+
+
+def resolve_technologies(names):
+    """
+    {name: technology id}; missing technologies are created.
+    Returns (mapping, created names).
+    """
+    if not names:
+        return {}, []
+    technologies = dict(Technology.objects.filter(name__in=names).values_list('name', 'pk'))
+    missing = [name for name in names if name not in technologies]
+    if missing:
+        Technology.objects.bulk_create([Technology(name=name) for name in missing], ignore_conflicts=True)
+        technologies.update(Technology.objects.filter(name__in=missing).values_list('name', 'pk'))
+    return technologies, missing
+
+
+def _copy_value(field, value):
+    if value is None:
+        return '\\N'
+    if isinstance(field, models.JSONField):
+        value = json.dumps(value)
+    elif isinstance(value, (datetime.date, datetime.datetime)):
+        value = value.isoformat()
+    elif isinstance(value, bool):
+        value = 't' if value else 'f'
+    else:
+        value = str(value)
+    return value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def copy_insert(model, objs):
+    """
+    Inserts ``objs`` with PostgreSQL ``COPY`` and sets their ids.
+    """
+    table = model._meta.db_table
+    fields = list(model._meta.concrete_fields)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+            [table, model._meta.pk.column, len(objs)],
+        )
+        for obj, (pk,) in zip(objs, cursor.fetchall()):
+            obj.pk = pk
+
+        buffer = io.StringIO()
+        for obj in objs:
+            buffer.write('\t'.join(_copy_value(field, _copy_field_value(field, obj)) for field in fields))
+            buffer.write('\n')
+        columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+        sql = f"COPY {connection.ops.quote_name(table)} ({columns}) FROM STDIN"
+        raw = cursor.cursor
+        if hasattr(raw, 'copy_expert'):
+            buffer.seek(0)
+            raw.copy_expert(sql, buffer)
+        else:
+            # psycopg 3
+            with raw.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+    for obj in objs:
+        obj._state.adding = False
+        obj._state.db = connection.alias
+    return objs
+
+
+def _copy_field_value(field, obj):
+    value = getattr(obj, field.attname)
+    if value is None and getattr(field, 'auto_now_add', False):
+        return timezone.now()
+    if isinstance(field, models.FileField):
+        return value.name or ''
+    return value
+
+
+class Importer:
+    """
+        importer = Importer('projects')
+        stats = importer.import_batch(rows)
+    """
+
+    def __init__(self, dataset, use_copy=None, create_users=True):
+        self.dataset = dataset
+        self.model = MODELS[dataset]
+        self.use_copy = connection.vendor == 'postgresql' if use_copy is None else use_copy
+        self.create_users = create_users
+
+    def insert(self, objs, dates=None):
+        if self.use_copy:
+            return copy_insert(self.model, objs)
+        created = self.model.objects.bulk_create(objs)
+        if dates:
+            # bulk_create перезаписує auto_now_add — повертаємо дати з файлу
+            for obj in created:
+                if id(obj) in dates:
+                    obj.created_at = dates[id(obj)]
+            self.model.objects.bulk_update([obj for obj in created if id(obj) in dates], ['created_at'])
+        return created
+
+    def link_technologies(self, links):
+        through = Project.technologies.through
+        objs = [through(project_id=project_id, technology_id=technology_id) for project_id, technology_id in links]
+        if not objs:
+            return
+        if self.use_copy:
+            copy_insert(through, objs)
+        else:
+            through.objects.bulk_create(objs)
+
+    def import_batch(self, rows):
+        """
+        Imports already cleaned rows (``clean_row``) in one transaction.
+        Returns counters.
+        """
+        stats = Counter()
+        if not rows:
+            return stats
+        with transaction.atomic():
+            profiles, stats['users'] = resolve_profiles({username for username, _, _ in rows}, self.create_users)
+            technologies, created_technologies = resolve_technologies(
+                sorted({name for _, _, names in rows for name in names})
+            )
+            stats['technologies'] = len(created_technologies)
+
+            # Репозиторій GitHub уже є в профілі (повторний імпорт) — пропускаємо
+            seen_links = set()
+            if self.dataset == 'projects':
+                seen_links = set(Project.objects.filter(
+                    profile_id__in=profiles.values(),
+                    github_link__in={values['github_link'] for _, values, _ in rows if values.get('github_link')},
+                ).values_list('profile_id', 'github_link'))
+
+            objs, names_per_obj, dates = [], [], {}
+            for username, values, names in rows:
+                if username not in profiles:
+                    stats['skipped'] += 1
+                    continue
+                if values.get('github_link'):
+                    key = (profiles[username], values['github_link'])
+                    if key in seen_links:
+                        stats['duplicates'] += 1
+                        continue
+                    seen_links.add(key)
+                obj = self.model(profile_id=profiles[username], **values)
+                if not self.use_copy and 'created_at' in values:
+                    dates[id(obj)] = values['created_at']
+                objs.append(obj)
+                names_per_obj.append(names)
+            created = self.insert(objs, dates)
+            stats['rows'] = len(created)
+
+            links = [
+                (obj.pk, technologies[name])
+                for obj, names in zip(created, names_per_obj)
+                for name in names if name in technologies
+            ]
+            self.link_technologies(links)
+            self.after_batch(created, links, created_technologies, technologies)
+        return stats
+
+    def after_batch(self, created, links, created_technologies, technologies):
+        """
+        Batched side effects of the skipped row signals.
+        """
+        profile_ids = {obj.profile_id for obj in created}
+        transaction.on_commit(lambda: invalidate_profiles(profile_ids))
+        if self.dataset != 'projects':
+            return
+        project_ids = [obj.pk for obj in created]
+        update_search_vectors(project_ids)
+        usage = Counter(technology_id for _, technology_id in links)
+        new_technologies = [(technologies[name], name) for name in created_technologies if name in technologies]
+
+        def refresh_indexes():
+            sync_projects(project_ids)
+            for pk, name in new_technologies:
+                technology_index.upsert(pk, name)
+            technology_index.add_usage(dict(usage))
+
+        transaction.on_commit(refresh_indexes)
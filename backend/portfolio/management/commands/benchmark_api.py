@@ -0,0 +1,218 @@
+import json
+import platform
+import uuid
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from config.api_router import router
+from users.cache import CACHED_ENDPOINTS
+from portfolio.benchmark import BenchmarkRunner, Scenario
+from portfolio.models import Education, Experience, GitHubSyncJob, Project, Technology
+from portfolio.seeding import SEED_PREFIX, seed, seeded_usernames
+from portfolio.testing import FakeGitHubServer, make_repo
+
+API = '/api/v1'
+BENCH_USERNAME = f'{SEED_PREFIX}bench'
+BENCH_PASSWORD = 'bench-password-123'
+BENCH_PROJECT_TITLE = 'Benchmark project'
+
+
+def registration_data():
+    username = f'{SEED_PREFIX}reg-{uuid.uuid4().hex[:12]}'
+    return {
+        'username': username, 'password': BENCH_PASSWORD, 'confirm_password': BENCH_PASSWORD,
+        'email': f'{username}@example.com', 'first_name': 'Bench', 'last_name': 'User',
+    }
+
+
+def build_scenarios(username, project_id, technology_id, experience_id, education_id,
+                    profile_id, job_id, refresh_token, own_project_id):
+    """
+    Every route of config.api_router (basename set) plus token, registration,
+    current user, portfolio and GitHub sync paths.
+    """
+    return [
+        # profiles
+        Scenario('profiles-list', 'get', f'{API}/profiles/', basename='userprofile'),
+        Scenario('profiles-search', 'get', f'{API}/profiles/?search={SEED_PREFIX}1', basename='userprofile'),
+        Scenario('profiles-detail', 'get', f'{API}/profiles/{profile_id}/', basename='userprofile'),
+        Scenario('profiles-by-username', 'get', f'{API}/profiles/by-username/{username}/', basename='userprofile'),
+        # technologies
+        Scenario('technologies-list', 'get', f'{API}/technologies/', basename='technology'),
+        Scenario('technologies-search', 'get', f'{API}/technologies/?search=py', basename='technology'),
+        Scenario('technologies-autocomplete', 'get', f'{API}/technologies/autocomplete/?q=py', basename='technology'),
+        Scenario('technologies-detail', 'get', f'{API}/technologies/{technology_id}/', basename='technology'),
+        # projects
+        Scenario('projects-list', 'get', f'{API}/projects/', basename='project'),
+        Scenario('projects-by-username', 'get', f'{API}/projects/?username={username}', basename='project'),
+        Scenario('projects-search', 'get', f'{API}/projects/?search=api dashboard', basename='project'),
+        Scenario('projects-cursor', 'get', f'{API}/projects/?pagination=cursor', basename='project'),
+        Scenario('projects-trending', 'get', f'{API}/projects/trending/', basename='project'),
+        Scenario('projects-trending-technology', 'get', f'{API}/projects/trending/?technology={technology_id}',
+                 basename='project'),
+        Scenario('projects-detail', 'get', f'{API}/projects/{project_id}/', basename='project'),
+        # Після першого запиту — без змін: UPDATE не виконується (DirtyFieldsMixin)
+        Scenario('projects-update', 'patch', f'{API}/projects/{own_project_id}/', auth=True,
+                 data={'title': BENCH_PROJECT_TITLE}, basename='project'),
+        Scenario('projects-increment-views', 'post', f'{API}/projects/{project_id}/increment_views/',
+                 basename='project'),
+        Scenario('projects-sync-github', 'post', f'{API}/projects/sync_github/', auth=True,
+                 basename='project', expected_status=(202,)),
+        Scenario('projects-sync-github-status', 'get', f'{API}/projects/sync_github/{job_id}/', auth=True,
+                 basename='project'),
+        # experience / education
+        Scenario('experience-by-username', 'get', f'{API}/experience/?username={username}', basename='experience'),
+        Scenario('experience-detail', 'get', f'{API}/experience/{experience_id}/?username={username}',
+                 basename='experience'),
+        Scenario('education-list', 'get', f'{API}/education/', basename='education'),
+        Scenario('education-detail', 'get', f'{API}/education/{education_id}/', basename='education'),
+        # auth, current user, portfolio
+        Scenario('token-obtain', 'post', f'{API}/token/',
+                 data={'username': BENCH_USERNAME, 'password': BENCH_PASSWORD}),
+        Scenario('token-refresh', 'post', f'{API}/token/refresh/', data={'refresh': refresh_token}),
+        Scenario('register', 'post', f'{API}/register/', data=registration_data, expected_status=(201,)),
+        Scenario('me', 'get', f'{API}/me/', auth=True),
+        Scenario('portfolio', 'get', f'{API}/portfolio/{username}/?counts=1'),
+    ]
+
+
+def uncovered_routes(scenarios):
+    covered = {scenario.basename for scenario in scenarios}
+    return [basename for prefix, viewset, basename in router.registry if basename not in covered]
+
+
+class Command(BaseCommand):
+    help = (
+        "Навантажувальний тест API: усі ендпоінти config/api_router.py, токени та sync_github "
+        "(проти локальної заглушки GitHub). Виводить JSON з пропускною здатністю, "
+        "p50/p95/p99 і кількістю SQL-запитів."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100, help="Запитів на сценарій")
+        parser.add_argument('--concurrency', type=int, default=1, help="Паралельних клієнтів")
+        parser.add_argument('--warmup', type=int, default=1, help="Запитів прогріву (не враховуються)")
+        parser.add_argument('--only', action='append', default=[], help="Запустити лише ці сценарії")
+        parser.add_argument('--skip', action='append', default=[], help="Пропустити ці сценарії")
+        parser.add_argument('--seed', type=int, default=0,
+                            help="Спершу згенерувати стільки профілів (див. seed_data)")
+        parser.add_argument('--github-repos', type=int, default=100,
+                            help="Скільки репозиторіїв віддає заглушка GitHub")
+        parser.add_argument('--no-cache', action='store_true',
+                            help="Вимкнути кеш публічних відповідей профілю")
+        parser.add_argument('--output', help="Записати JSON у файл замість stdout")
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            seed(profiles=options['seed'])
+        usernames = [name for name in seeded_usernames()[:100] if name != BENCH_USERNAME]
+        if not usernames:
+            raise CommandError("No seeded data: run seed_data first or pass --seed N.")
+        username = usernames[0]
+
+        bench_user = self.bench_user()
+        refresh = RefreshToken.for_user(bench_user)
+        repos = [make_repo(BENCH_USERNAME, n) for n in range(options['github_repos'])]
+
+        overrides = {
+            'BACKGROUND_TASKS_EAGER': True,
+            # DRF test client ходить на "testserver"
+            'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver'],
+            # Міряємо самі ендпоінти, а не відмови 429
+            'THROTTLING': {**getattr(settings, 'THROTTLING', {}), 'ENABLED': False},
+        }
+        if options['no_cache']:
+            overrides['PROFILE_CACHE'] = {
+                **getattr(settings, 'PROFILE_CACHE', {}),
+                'ENDPOINTS': {endpoint: False for endpoint in CACHED_ENDPOINTS},
+            }
+
+        with FakeGitHubServer({BENCH_USERNAME: repos}, per_page=100) as github, \
+                override_settings(GITHUB_API_URL=github.url, **overrides):
+            job = GitHubSyncJob.objects.filter(profile=bench_user.profile).first() or GitHubSyncJob.objects.create(
+                profile=bench_user.profile, github_username=BENCH_USERNAME,
+                status=GitHubSyncJob.Status.SUCCEEDED,
+            )
+            scenarios = build_scenarios(
+                username=username,
+                project_id=Project.objects.filter(profile__user__username=username).values_list('pk', flat=True).first(),
+                technology_id=Technology.objects.values_list('pk', flat=True).first(),
+                experience_id=Experience.objects.filter(profile__user__username=username).values_list('pk', flat=True).first(),
+                education_id=Education.objects.values_list('pk', flat=True).first(),
+                profile_id=User.objects.get(username=username).profile.pk,
+                job_id=job.pk,
+                refresh_token=str(refresh),
+                own_project_id=self.bench_project(bench_user).pk,
+            )
+            missing = uncovered_routes(scenarios)
+            if missing:
+                self.stderr.write(f"Router routes without scenarios: {', '.join(missing)}")
+            scenarios = [
+                scenario for scenario in scenarios
+                if (not options['only'] or scenario.name in options['only'])
+                and scenario.name not in options['skip']
+            ]
+
+            runner = BenchmarkRunner(
+                access_token=str(refresh.access_token),
+                requests=options['requests'],
+                concurrency=options['concurrency'],
+                warmup=options['warmup'],
+            )
+            results = runner.run(scenarios, progress=self.progress)
+
+        report = {
+            'meta': {
+                'started_at': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'response_cache': not options['no_cache'],
+                'rows': {
+                    'users': User.objects.count(),
+                    'projects': Project.objects.count(),
+                    'technologies': Technology.objects.count(),
+                    'experience': Experience.objects.count(),
+                    'education': Education.objects.count(),
+                },
+            },
+            'endpoints': results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    def bench_user(self):
+        user, created = User.objects.get_or_create(username=BENCH_USERNAME)
+        if created or not user.check_password(BENCH_PASSWORD):
+            user.set_password(BENCH_PASSWORD)
+            user.save()
+        profile = user.profile
+        profile.github_url = f'https://github.com/{BENCH_USERNAME}'
+        profile.save()
+        return user
+
+    def bench_project(self, user):
+        project = Project.objects.filter(profile=user.profile, title=BENCH_PROJECT_TITLE).first()
+        return project or Project.objects.create(
+            profile=user.profile, title=BENCH_PROJECT_TITLE, description="Project updated by the benchmark",
+        )
+
+    def progress(self, name, result):
+        latency = result['latency_ms']
+        self.stderr.write(
+            f"{name}: {result['throughput_rps']} req/s, p50 {latency['p50']} ms, "
+            f"p99 {latency['p99']} ms, {result['queries']['mean']} queries ({result['writes']['mean']} writes), {result['errors']} errors"
+        )
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import platform
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from users.cache import CACHED_ENDPOINTS
+from portfolio.benchmark import ConcurrencyBenchmark, Scenario
+from portfolio.models import Education, Experience, Project, Technology
+from portfolio.seeding import seed, seeded_usernames
+
+API = '/api/v1'
+STACKS = ['wsgi', 'asgi-sync', 'asgi-async']
+
+
+def build_endpoints(username, project_id, technology_id, experience_id, education_id):
+    """
+    name -> path relative to /api/v1/ (sync) and /api/v1/async/ (async).
+    """
+    return {
+        'projects-list': 'projects/',
+        'projects-by-username': f'projects/?username={username}',
+        'projects-detail': f'projects/{project_id}/',
+        'profiles-by-username': f'profiles/by-username/{username}/',
+        'experience-by-username': f'experience/?username={username}',
+        'experience-detail': f'experience/{experience_id}/?username={username}',
+        'education-detail': f'education/{education_id}/',
+        'technologies-list': 'technologies/',
+        'technologies-detail': f'technologies/{technology_id}/',
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Порівнює пропускну здатність одного воркера при багатьох одночасних з'єднаннях: "
+        "синхронний стек (WSGI з --threads потоками), ті самі DRF-в'юшки під ASGI "
+        "та асинхронні ендпоінти /api/v1/async/ під ASGI."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Запитів на ендпоінт і стек")
+        parser.add_argument('--concurrency', type=int, default=20, help="Одночасних з'єднань")
+        parser.add_argument('--threads', type=int, default=1,
+                            help="Потоків WSGI-воркера (як gunicorn --threads)")
+        parser.add_argument('--warmup', type=int, default=1, help="Запитів прогріву (не враховуються)")
+        parser.add_argument('--stack', action='append', choices=STACKS, default=[],
+                            help="Лише ці стеки (за замовчуванням усі)")
+        parser.add_argument('--only', action='append', default=[], help="Лише ці ендпоінти")
+        parser.add_argument('--seed', type=int, default=0,
+                            help="Спершу згенерувати стільки профілів (див. seed_data)")
+        parser.add_argument('--no-cache', action='store_true',
+                            help="Вимкнути кеш публічних відповідей профілю")
+        parser.add_argument('--output', help="Записати JSON у файл замість stdout")
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            seed(profiles=options['seed'])
+        usernames = seeded_usernames()[:1]
+        if not usernames:
+            raise CommandError("No seeded data: run seed_data first or pass --seed N.")
+        username = usernames[0]
+
+        endpoints = build_endpoints(
+            username=username,
+            project_id=Project.objects.filter(profile__user__username=username).values_list('pk', flat=True).first(),
+            technology_id=Technology.objects.values_list('pk', flat=True).first(),
+            experience_id=Experience.objects.filter(profile__user__username=username).values_list('pk', flat=True).first(),
+            education_id=Education.objects.values_list('pk', flat=True).first(),
+        )
+        if options['only']:
+            endpoints = {name: path for name, path in endpoints.items() if name in options['only']}
+        stacks = options['stack'] or STACKS
+
+        overrides = {'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver']}
+        if options['no_cache']:
+            overrides['PROFILE_CACHE'] = {
+                **getattr(settings, 'PROFILE_CACHE', {}),
+                'ENDPOINTS': {endpoint: False for endpoint in CACHED_ENDPOINTS},
+            }
+
+        benchmark = ConcurrencyBenchmark(
+            requests=options['requests'],
+            concurrency=options['concurrency'],
+            threads=options['threads'],
+            warmup=options['warmup'],
+        )
+        results = {}
+        with override_settings(**overrides):
+            # Наступні з'єднання відкриються в потоках запитів
+            connection.close()
+            for name, path in endpoints.items():
+                results[name] = {}
+                for stack in stacks:
+                    prefix = f'{API}/async/' if stack == 'asgi-async' else f'{API}/'
+                    scenario = Scenario(name, 'get', prefix + path)
+                    if stack == 'wsgi':
+                        result = benchmark.run_wsgi(scenario)
+                    else:
+                        result = asyncio.run(benchmark.run_asgi(scenario))
+                    results[name][stack] = result
+                    self.progress(name, stack, result)
+
+        report = {
+            'meta': {
+                'started_at': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'wsgi_threads': options['threads'],
+                'response_cache': not options['no_cache'],
+                'rows': {
+                    'users': User.objects.count(),
+                    'projects': Project.objects.count(),
+                },
+            },
+            'endpoints': results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    def progress(self, name, stack, result):
+        latency = result['latency_ms']
+        self.stderr.write(
+            f"{name} [{stack}]: {result['throughput_rps']} req/s, p50 {latency['p50']} ms, "
+            f"p99 {latency['p99']} ms, {result['errors']} errors"
+        )
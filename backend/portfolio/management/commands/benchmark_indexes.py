@@ -0,0 +1,132 @@
+import json
+import statistics
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+
+from portfolio.models import Education, Experience, Project
+from portfolio.seeding import seed, seeded_usernames
+from users.models import UserProfile
+
+FEED_ORDERING = ['-views', '-created_at', '-id']
+
+
+def hot_queries(username, profile_id, github_links):
+    """
+    Access patterns covered by portfolio 0006_hot_path_indexes.
+    """
+    return {
+        'project_feed': Project.objects.order_by(*FEED_ORDERING)[:15],
+        'projects_by_username': Project.objects.filter(profile__user__username=username).order_by(*FEED_ORDERING)[:15],
+        'github_link_lookup': Project.objects.filter(profile_id=profile_id, github_link__in=github_links),
+        'experience_by_username': Experience.objects.filter(profile__user__username=username),
+        'education_by_username': Education.objects.filter(profile__user__username=username),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Порівнює плани (EXPLAIN) і час гарячих запитів до і після міграції з індексами "
+        "на згенерованих даних. Мігрує БД туди й назад — не запускайте на продакшені!"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', type=int, default=2000, help="Скільки профілів згенерувати")
+        parser.add_argument('--projects', type=int, default=25, help="Проєктів на профіль")
+        parser.add_argument('--no-seed', action='store_true', help="Використати вже згенеровані дані")
+        parser.add_argument('--repeat', type=int, default=50, help="Скільки разів виконати кожен запит")
+        parser.add_argument('--before', default='0005_project_image_variants',
+                            help="Міграція portfolio без нових індексів")
+        parser.add_argument('--after', default='0006_hot_path_indexes',
+                            help="Міграція portfolio з індексами")
+        parser.add_argument('--no-migrate', action='store_true',
+                            help="Лише виміряти поточну схему, без міграцій")
+        parser.add_argument('--json', dest='json_path', help="Зберегти результати у JSON-файл")
+        parser.add_argument('--noinput', '--no-input', action='store_false', dest='interactive')
+
+    def handle(self, *args, **options):
+        if not options['no_migrate'] and options['interactive']:
+            answer = input(
+                f"Database '{connection.settings_dict['NAME']}' will be migrated to portfolio "
+                f"{options['before']} and back. Continue? [y/N] "
+            )
+            if answer.lower() != 'y':
+                raise CommandError("Cancelled.")
+
+        if not options['no_seed']:
+            started = time.monotonic()
+            totals = seed(profiles=options['profiles'], projects=options['projects'])
+            self.stdout.write(f"Seeded {totals} in {time.monotonic() - started:.1f}s")
+
+        usernames = list(seeded_usernames())
+        if not usernames:
+            raise CommandError("No seeded data, run without --no-seed first.")
+        username = usernames[len(usernames) // 2]
+        profile_id = UserProfile.objects.get(user__username=username).pk
+        github_links = list(
+            Project.objects.filter(profile_id=profile_id, github_link__isnull=False)
+            .values_list('github_link', flat=True)
+        )
+
+        results = {}
+        if options['no_migrate']:
+            stages = [('current', None)]
+        else:
+            applied = MigrationLoader(connection).applied_migrations
+            latest = max(name for app, name in applied if app == 'portfolio')
+            stages = [('before', options['before']), ('after', options['after'])]
+        for stage, target in stages:
+            if target:
+                call_command('migrate', 'portfolio', target, verbosity=0)
+            self.analyze()
+            results[stage] = self.measure(hot_queries(username, profile_id, github_links), options['repeat'])
+        if not options['no_migrate']:
+            call_command('migrate', 'portfolio', latest, verbosity=0)
+
+        self.report(results)
+        if options['json_path']:
+            with open(options['json_path'], 'w') as f:
+                json.dump(results, f, indent=2)
+
+    def analyze(self):
+        # Свіжа статистика, інакше планувальник не знає про нові індекси й обсяг даних
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+    def measure(self, queries, repeat):
+        results = {}
+        for name, queryset in queries.items():
+            plan = queryset.explain(analyze=True) if connection.vendor == 'postgresql' else queryset.explain()
+            list(queryset.all())  # прогрів
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            results[name] = {
+                'plan': plan,
+                'p50_ms': round(statistics.median(timings), 3),
+                'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+            }
+        return results
+
+    def report(self, results):
+        for stage, queries in results.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f"== {stage} =="))
+            for name, result in queries.items():
+                self.stdout.write(self.style.MIGRATE_LABEL(
+                    f"{name}: p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms"
+                ))
+                self.stdout.write(result['plan'])
+
+        if {'before', 'after'} <= set(results):
+            self.stdout.write(self.style.MIGRATE_HEADING("== summary (p50) =="))
+            for name, before in results['before'].items():
+                after = results['after'][name]
+                speedup = before['p50_ms'] / after['p50_ms'] if after['p50_ms'] else float('inf')
+                self.stdout.write(f"{name}: {before['p50_ms']} -> {after['p50_ms']} ms (x{speedup:.1f})")
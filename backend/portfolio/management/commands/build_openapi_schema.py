@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from config.openapi import code_fingerprint, render_schema, schema_settings, write_schema
+
+
+class Command(BaseCommand):
+    help = (
+        "Генерує схему OpenAPI (YAML і JSON) для поточного коду в OPENAPI_SCHEMA['DIR'] — "
+        "під час розгортання, щоб /api/v1/schema/ не будував її на першому запиті"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', help="Каталог замість OPENAPI_SCHEMA['DIR']")
+
+    def handle(self, *args, **options):
+        directory = options['dir'] or schema_settings()['DIR']
+        if not directory:
+            raise CommandError("Set OPENAPI_SCHEMA_DIR or pass --dir.")
+        started = time.monotonic()
+        fingerprint = code_fingerprint()
+        paths = write_schema(directory, fingerprint, render_schema())
+        self.stdout.write(
+            f"Wrote the schema {fingerprint} in {time.monotonic() - started:.1f}s: "
+            + ', '.join(f"{path.name} ({path.stat().st_size} bytes)" for path in paths)
+        )
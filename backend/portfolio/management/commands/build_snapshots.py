@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.snapshots import build_all, regenerate, snapshots_enabled
+
+
+class Command(BaseCommand):
+    help = (
+        "Генерує знімки портфоліо (JSON і .json.gz) для всіх або вказаних користувачів "
+        "у PORTFOLIO_SNAPSHOTS['DIR'] — після розгортання або зміни формату відповіді"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('usernames', nargs='*', help="Лише ці користувачі")
+
+    def handle(self, *args, **options):
+        if not snapshots_enabled():
+            raise CommandError("Snapshots are disabled: set PORTFOLIO_SNAPSHOTS_DIR and PORTFOLIO_SNAPSHOTS_BASE_URL.")
+        started = time.monotonic()
+        if options['usernames']:
+            written = regenerate(options['usernames'])
+        else:
+            written = build_all(progress=self.progress)
+        self.stdout.write(f"Wrote {written} snapshots in {time.monotonic() - started:.1f}s")
+
+    def progress(self, done, total):
+        self.stderr.write(f"{done}/{total}")
@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.export import DATASETS, FORMATS, export_stream, parse_date
+
+
+class Command(BaseCommand):
+    help = (
+        "Потокове вивантаження проєктів (з технологіями), досвіду або освіти в NDJSON чи CSV "
+        "(серверний курсор, пам'ять не залежить від кількості рядків)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(DATASETS))
+        parser.add_argument('--format', choices=sorted(FORMATS), default='ndjson')
+        parser.add_argument('--output', help="Файл (з .gz — стиснутий); за замовчуванням stdout")
+        parser.add_argument('--gzip', action='store_true', help="Стиснути вивід gzip")
+        parser.add_argument('--username', help="Лише записи цього користувача")
+        parser.add_argument('--since', help="Від дати YYYY-MM-DD (включно)")
+        parser.add_argument('--until', help="До дати YYYY-MM-DD (включно)")
+        parser.add_argument('--chunk-size', type=int, default=None, help="Рядків на один запит курсора")
+
+    def handle(self, *args, **options):
+        try:
+            since = parse_date(options['since'], '--since')
+            until = parse_date(options['until'], '--until')
+        except ValueError as e:
+            raise CommandError(f"{e}: expected a date in YYYY-MM-DD format.")
+
+        output = options['output']
+        compress = options['gzip'] or bool(output and output.endswith('.gz'))
+        stream = export_stream(
+            options['dataset'], options['format'], compress=compress,
+            username=options['username'], since=since, until=until, chunk_size=options['chunk_size'],
+        )
+
+        started = time.monotonic()
+        if output:
+            with open(output, 'wb') as f:
+                written = self.copy(stream, f.write)
+        else:
+            buffer = getattr(self.stdout._out, 'buffer', None)
+            if buffer is not None:
+                written = self.copy(stream, buffer.write)
+                buffer.flush()
+            elif compress:
+                raise CommandError("--gzip needs --output or a binary stdout.")
+            else:
+                written = self.copy(stream, lambda chunk: self.stdout.write(chunk.decode(), ending=''))
+        self.stderr.write(f"Exported {options['dataset']}: {written} bytes in {time.monotonic() - started:.1f}s")
+
+    def copy(self, stream, write):
+        written = 0
+        for chunk in stream:
+            write(chunk)
+            written += len(chunk)
+        return written
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from portfolio.counters import counter_settings, view_counter
+
+
+class Command(BaseCommand):
+    help = "Скидає буферизовані перегляди проєктів у Project.views"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true',
+                            help="Працювати безперервно, скидаючи буфер кожні --interval секунд")
+        parser.add_argument('--interval', type=float, default=None,
+                            help="Інтервал між скиданнями (за замовчуванням VIEW_COUNTER['FLUSH_INTERVAL'])")
+
+    def handle(self, *args, **options):
+        interval = options['interval'] or counter_settings()['FLUSH_INTERVAL'] or 10
+
+        while True:
+            written = view_counter.flush()
+            if written or not options['loop']:
+                self.stdout.write(f"Flushed {written} views")
+            if not options['loop']:
+                return
+            close_old_connections()
+            time.sleep(interval)
@@ -0,0 +1,84 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from config.images import process_instance
+from portfolio.models import Project
+from users.models import UserProfile
+
+TARGETS = {
+    'projects': (Project, 'image', 'image_variants'),
+    'profiles': (UserProfile, 'profile_picture', 'profile_picture_variants'),
+}
+
+
+class Command(BaseCommand):
+    help = "Генерує зменшені WebP/AVIF копії для вже завантажених зображень (можна перезапускати)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', choices=sorted(TARGETS), action='append',
+                            help="Обробити лише projects або profiles")
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 4)
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--checkpoint', default=str(Path(settings.MEDIA_ROOT) / '.image_variants_checkpoint.json'),
+                            help="Файл з останнім обробленим id кожної моделі")
+        parser.add_argument('--restart', action='store_true', help="Ігнорувати збережений checkpoint")
+
+    def handle(self, *args, **options):
+        checkpoint_path = Path(options['checkpoint'])
+        checkpoint = {}
+        if checkpoint_path.exists() and not options['restart']:
+            checkpoint = json.loads(checkpoint_path.read_text())
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            # --workers 1 — без потоків, усе в поточному з'єднанні з БД
+            map_ = executor.map if options['workers'] > 1 else map
+            for target in options['only'] or sorted(TARGETS):
+                self.backfill(target, map_, options['batch_size'], checkpoint, checkpoint_path)
+
+    def backfill(self, target, map_, batch_size, checkpoint, checkpoint_path):
+        model, image_field, variants_field = TARGETS[target]
+        queryset = (
+            model.objects
+            .exclude(**{image_field: ''})
+            .exclude(**{f'{image_field}__isnull': True})
+            .order_by('pk')
+            .values_list('pk', image_field, variants_field)
+        )
+
+        def process(pk):
+            try:
+                return process_instance(model, pk, image_field, variants_field)
+            except Exception as e:
+                self.stderr.write(f"{target} #{pk}: {e}")
+                return False
+            finally:
+                if map_ is not map:
+                    close_old_connections()
+
+        started = time.monotonic()
+        processed = skipped = 0
+        last_pk = checkpoint.get(target, 0)
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            pending = [pk for pk, name, manifest in batch if name != (manifest or {}).get('source')]
+            processed += sum(map_(process, pending))
+            skipped += len(batch) - len(pending)
+
+            last_pk = batch[-1][0]
+            checkpoint[target] = last_pk
+            checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+            checkpoint_path.write_text(json.dumps(checkpoint))
+
+        self.stdout.write(
+            f"{target}: processed {processed}, already up to date {skipped}, "
+            f"{time.monotonic() - started:.1f}s"
+        )
@@ -0,0 +1,88 @@
+import json
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.importer import FIELDS, FORMATS, Importer, InvalidRow, clean_row, detect_format, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Масовий імпорт проєктів, досвіду або освіти з NDJSON/CSV/JSON (формат export_data): "
+        "COPY на PostgreSQL, bulk_create на інших БД, пакетні побічні ефекти замість сигналів. "
+        "Після збою продовжує з checkpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(FIELDS))
+        parser.add_argument('path', help="Файл (.ndjson, .csv, .json, можна з .gz)")
+        parser.add_argument('--format', choices=FORMATS, help="Формат, якщо не видно з розширення")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Рядків на транзакцію")
+        parser.add_argument('--checkpoint', help="Файл прогресу (за замовчуванням <path>.checkpoint.json)")
+        parser.add_argument('--restart', action='store_true', help="Ігнорувати збережений checkpoint")
+        parser.add_argument('--no-copy', action='store_true', help="bulk_create навіть на PostgreSQL")
+        parser.add_argument('--skip-unknown-users', action='store_true',
+                            help="Не створювати користувачів, яких немає в БД, а пропускати їхні рядки")
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f"{path} does not exist.")
+        try:
+            fmt = options['format'] or detect_format(path)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        checkpoint_path = Path(options['checkpoint'] or f'{path}.checkpoint.json')
+        source = {'path': str(path.resolve()), 'size': path.stat().st_size, 'dataset': options['dataset']}
+        done = 0
+        if checkpoint_path.exists() and not options['restart']:
+            checkpoint = json.loads(checkpoint_path.read_text())
+            if checkpoint.get('source') == source:
+                done = checkpoint['rows']
+                self.stderr.write(f"Resuming after row {done}")
+            else:
+                self.stderr.write("Checkpoint belongs to another file, starting over")
+
+        importer = Importer(
+            options['dataset'],
+            use_copy=False if options['no_copy'] else None,
+            create_users=not options['skip_unknown_users'],
+        )
+        rows = enumerate(read_rows(path, fmt), start=1)
+        # Уже імпортовані рядки лише читаємо
+        for _ in islice(rows, done):
+            pass
+
+        totals = {'rows': 0, 'invalid': 0, 'skipped': 0, 'duplicates': 0, 'users': 0, 'technologies': 0}
+        started = time.monotonic()
+        while batch := list(islice(rows, options['batch_size'])):
+            cleaned = []
+            for number, row in batch:
+                try:
+                    cleaned.append(clean_row(options['dataset'], row))
+                except InvalidRow as e:
+                    totals['invalid'] += 1
+                    self.stderr.write(f"row {number}: {e}")
+            stats = importer.import_batch(cleaned)
+            for key in totals:
+                totals[key] += stats[key]
+
+            # Після коміту пакета: повторний запуск почне з наступного рядка
+            done = batch[-1][0]
+            checkpoint_path.write_text(json.dumps({'source': source, 'rows': done}))
+            elapsed = time.monotonic() - started
+            self.stderr.write(f"{done} rows read, {totals['rows']} imported, {self.rate(totals['rows'], elapsed)} rows/s")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f"Imported {totals['rows']} {options['dataset']} in {elapsed:.1f}s "
+            f"({self.rate(totals['rows'], elapsed)} rows/s, {'COPY' if importer.use_copy else 'bulk_create'}); "
+            f"invalid {totals['invalid']}, unknown users {totals['skipped']}, duplicates {totals['duplicates']}, "
+            f"new users {totals['users']}, new technologies {totals['technologies']}"
+        )
+
+    def rate(self, rows, elapsed):
+        return round(rows / elapsed) if elapsed else rows
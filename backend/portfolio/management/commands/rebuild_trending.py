@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from portfolio.trending import rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        "Перебудовує рейтинг популярних проєктів з нуля за загальною кількістю переглядів "
+        "(після імпорту даних або зміни TRENDING['HALF_LIFE'])"
+    )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        total = rebuild(progress=self.progress)
+        self.stdout.write(f"Rebuilt the leaderboard for {total} projects in {time.monotonic() - started:.1f}s")
+
+    def progress(self, done, total):
+        self.stderr.write(f"{done}/{total}")
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from portfolio.seeding import clear_seeded, seed
+
+
+class Command(BaseCommand):
+    help = "Генерує синтетичні профілі, проєкти, технології, досвід і освіту (bulk insert)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help="Скільки користувачів з профілями")
+        parser.add_argument('--projects', type=int, default=20, help="Проєктів на профіль")
+        parser.add_argument('--technologies', type=int, default=50, help="Розмір словника технологій")
+        parser.add_argument('--experience', type=int, default=3, help="Записів досвіду на профіль")
+        parser.add_argument('--education', type=int, default=2, help="Записів освіти на профіль")
+        parser.add_argument('--batch-size', type=int, default=500, help="Профілів на транзакцію")
+        parser.add_argument('--random-seed', type=int, default=0)
+        parser.add_argument('--clear', action='store_true', help="Спершу видалити раніше згенеровані дані")
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            deleted = clear_seeded()
+            self.stdout.write(f"Deleted {deleted}")
+
+        started = time.monotonic()
+        totals = seed(
+            profiles=options['users'],
+            projects=options['projects'],
+            experience=options['experience'],
+            education=options['education'],
+            technologies=options['technologies'],
+            batch_size=options['batch_size'],
+            random_seed=options['random_seed'],
+            progress=lambda totals: self.stdout.write(f"  {totals['profiles']}/{options['users']} profiles"),
+        )
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {totals} in {elapsed:.1f}s ({totals['projects'] / elapsed if elapsed else 0:.0f} projects/s)"
+        ))
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+from portfolio.operations import AddPostgresIndex, RunPostgresSQL
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0002_project_views'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='project',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        AddPostgresIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='project_search_vector'),
+        ),
+        AddPostgresIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='project_title_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        AddPostgresIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['description'], name='project_description_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        AddPostgresIndex(
+            model_name='technology',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='technology_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        RunPostgresSQL(
+            sql="""
+                UPDATE portfolio_project p SET search_vector =
+                    setweight(to_tsvector('simple', coalesce(p.title, '')), 'A') ||
+                    setweight(to_tsvector('simple', coalesce(p.description, '')), 'B') ||
+                    setweight(to_tsvector('simple', coalesce((
+                        SELECT string_agg(t.name, ' ')
+                        FROM portfolio_technology t
+                        JOIN portfolio_project_technologies pt ON pt.technology_id = t.id
+                        WHERE pt.project_id = p.id
+                    ), '')), 'C');
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0003_project_search'),
+        ('users', '0002_alter_userprofile_profile_picture'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GitHubSyncJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('github_username', models.CharField(max_length=100, verbose_name='GitHub username')),
+                ('status', models.CharField(choices=[('pending', 'В черзі'), ('running', 'Виконується'), ('succeeded', 'Успішно'), ('failed', 'Помилка')], default='pending', max_length=20, verbose_name='Статус')),
+                ('pages_fetched', models.PositiveIntegerField(default=0, verbose_name='Завантажено сторінок')),
+                ('pages_not_modified', models.PositiveIntegerField(default=0, verbose_name='Сторінок без змін')),
+                ('total_synced', models.PositiveIntegerField(default=0, verbose_name='Синхронізовано')),
+                ('newly_created', models.PositiveIntegerField(default=0, verbose_name='Створено')),
+                ('rate_limit_remaining', models.IntegerField(blank=True, null=True, verbose_name='Залишок ліміту GitHub')),
+                ('etags', models.JSONField(blank=True, default=dict, verbose_name='ETag сторінок')),
+                ('error', models.TextField(blank=True, verbose_name='Помилка')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата створення')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Дата завершення')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='github_sync_jobs', to='users.userprofile', verbose_name='Профіль')),
+            ],
+            options={
+                'verbose_name': 'Синхронізація з GitHub',
+                'verbose_name_plural': 'Синхронізації з GitHub',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def clear_duplicate_github_links(apps, schema_editor):
+    """
+    Before the unique key: keeps the oldest project per (profile, github_link),
+    duplicates lose the link and are no longer matched by the GitHub sync.
+    """
+    Project = apps.get_model('portfolio', 'Project')
+    duplicates = (
+        Project.objects.exclude(github_link__isnull=True).exclude(github_link='')
+        .values('profile_id', 'github_link')
+        .annotate(total=Count('id'), keep_id=Min('id'))
+        .filter(total__gt=1)
+    )
+    for row in duplicates:
+        (
+            Project.objects
+            .filter(profile_id=row['profile_id'], github_link=row['github_link'])
+            .exclude(pk=row['keep_id'])
+            .update(github_link=None)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0005_project_image_variants'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_duplicate_github_links, migrations.RunPython.noop),
+        # Спершу нові складені індекси, потім прибираємо індекси FK, які вони покривають
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-views', '-created_at', '-id'], name='project_feed'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['profile', '-views', '-created_at', '-id'], name='project_profile_feed'),
+        ),
+        migrations.AddConstraint(
+            model_name='project',
+            constraint=models.UniqueConstraint(condition=models.Q(('github_link__isnull', False), models.Q(('github_link', ''), _negated=True)), fields=('profile', 'github_link'), name='project_unique_github_link'),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['profile', '-start_date'], name='experience_profile_start'),
+        ),
+        migrations.AddIndex(
+            model_name='education',
+            index=models.Index(fields=['profile', '-start_date'], name='education_profile_start'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='profile',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='projects', to='users.userprofile', verbose_name='Профіль'),
+        ),
+        migrations.AlterField(
+            model_name='experience',
+            name='profile',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='experience', to='users.userprofile', verbose_name='Профіль'),
+        ),
+        migrations.AlterField(
+            model_name='education',
+            name='profile',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='education', to='users.userprofile', verbose_name='Профіль'),
+        ),
+    ]
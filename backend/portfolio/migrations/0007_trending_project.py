@@ -0,0 +1,67 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:23
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_leaderboard(apps, schema_editor):
+    """
+    Scores existing projects by their lifetime views (portfolio.trending.initial_score).
+    """
+    from portfolio.trending import initial_score
+
+    Project = apps.get_model('portfolio', 'Project')
+    TrendingProject = apps.get_model('portfolio', 'TrendingProject')
+    through = Project.technologies.through
+
+    project_ids = list(Project.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(project_ids), 1000):
+        batch = project_ids[start:start + 1000]
+        technologies = defaultdict(list)
+        for project_id, technology_id in through.objects.filter(project_id__in=batch).values_list(
+                'project_id', 'technology_id'):
+            technologies[project_id].append(technology_id)
+        rows = Project.objects.filter(pk__in=batch).values(
+            'pk', 'title', 'views', 'created_at', username=F('profile__user__username')
+        )
+        TrendingProject.objects.bulk_create([
+            TrendingProject(
+                project_id=row['pk'], technology_id=technology_id, title=row['title'],
+                username=row['username'], views=row['views'],
+                score=initial_score(row['views'], row['created_at']),
+            )
+            for row in rows
+            for technology_id in [None, *technologies[row['pk']]]
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0006_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingProject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='Рейтинг')),
+                ('title', models.CharField(max_length=100, verbose_name='Назва проекту')),
+                ('username', models.CharField(max_length=150, verbose_name='Користувач')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='Перегляди')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trending_entries', to='portfolio.project', verbose_name='Проект')),
+                ('technology', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio.technology', verbose_name='Технологія')),
+            ],
+            options={
+                'verbose_name': 'Рейтинг проекту',
+                'verbose_name_plural': 'Популярні проекти',
+                'indexes': [models.Index(fields=['technology', '-score'], name='trending_technology_score'), models.Index(condition=models.Q(('technology__isnull', True)), fields=['-score'], name='trending_global_score')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('technology__isnull', True)), fields=('project',), name='trending_unique_global'), models.UniqueConstraint(condition=models.Q(('technology__isnull', False)), fields=('project', 'technology'), name='trending_unique_technology')],
+            },
+        ),
+        migrations.RunPython(fill_leaderboard, migrations.RunPython.noop),
+    ]
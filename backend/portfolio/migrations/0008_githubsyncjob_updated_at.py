@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-18 21:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0007_trending_project'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='githubsyncjob',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Дата оновлення'),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-18 23:40
+
+from django.db import migrations
+
+from portfolio.operations import RemovePostgresIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0008_githubsyncjob_updated_at'),
+    ]
+
+    operations = [
+        RemovePostgresIndex(
+            model_name='project',
+            name='project_description_trgm',
+        ),
+    ]
@@ -1,4 +1,7 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from config.dirty_fields import DirtyFieldsMixin
 from users.models import UserProfile
 
 
@@ -17,21 +20,31 @@ class Technology(models.Model):
         verbose_name = "Технологія"
         verbose_name_plural = "Технології"
         ordering = ['name']
+        indexes = [
+            GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='technology_name_trgm'),
+        ]
 
 
-class Project(models.Model):
+class Project(DirtyFieldsMixin, models.Model):
     """
     Model for saving info about projects
     """
-    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="projects", verbose_name="Профіль")
+    # Окремий індекс по profile не потрібен — його покривають project_profile_feed
+    # і project_unique_github_link
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="projects",
+                                db_index=False, verbose_name="Профіль")
     title = models.CharField(max_length=100, verbose_name="Назва проекту")
     description = models.TextField(verbose_name="Опис")
     image = models.ImageField(upload_to="project_images/", null=True, blank=True, verbose_name="Зображення")
+    # Маніфест зменшених WebP/AVIF копій (config.images)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, verbose_name="Варіанти зображення")
     github_link = models.URLField(max_length=255, null=True, blank=True, verbose_name="Посилання на GitHub")
     live_link = models.URLField(max_length=255, null=True, blank=True, verbose_name="Посилання на сайт")
     technologies = models.ManyToManyField(Technology, related_name="projects", verbose_name="Технології")
     views = models.PositiveIntegerField(default=0, verbose_name="Перегляди")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата створення")
+    # Підтримується portfolio.search (назва, опис і назви технологій)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self):
         return self.title
@@ -40,14 +53,66 @@ class Project(models.Model):
         verbose_name = "Проект"
         verbose_name_plural = "Проекти"
         ordering = ['-created_at']
+        indexes = [
+            GinIndex(fields=['search_vector'], name='project_search_vector'),
+            GinIndex(fields=['title'], opclasses=['gin_trgm_ops'], name='project_title_trgm'),
+            # Стрічка проєктів (порядок за замовчуванням + id як у KeysetPagination)
+            models.Index(fields=['-views', '-created_at', '-id'], name='project_feed'),
+            # Проєкти одного профілю (?username=..., портфоліо) у тому ж порядку
+            models.Index(fields=['profile', '-views', '-created_at', '-id'], name='project_profile_feed'),
+        ]
+        constraints = [
+            # Репозиторій GitHub синхронізується в профіль рівно один раз
+            models.UniqueConstraint(
+                fields=['profile', 'github_link'],
+                condition=models.Q(github_link__isnull=False) & ~models.Q(github_link=''),
+                name='project_unique_github_link',
+            ),
+        ]
+
+
+
+class TrendingProject(models.Model):
+    """
+    Denormalized leaderboard row with a time-decayed score (portfolio.trending)
+    """
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="trending_entries",
+                                verbose_name="Проект")
+    # NULL — загальний рейтинг, інакше — рейтинг серед проєктів з цією технологією.
+    # Окремий індекс не потрібен — його покриває trending_technology_score
+    technology = models.ForeignKey(Technology, on_delete=models.CASCADE, null=True, blank=True,
+                                   related_name="+", db_index=False, verbose_name="Технологія")
+    # log2 суми ваг переглядів, див. portfolio.trending
+    score = models.FloatField(verbose_name="Рейтинг")
+    title = models.CharField(max_length=100, verbose_name="Назва проекту")
+    username = models.CharField(max_length=150, verbose_name="Користувач")
+    views = models.PositiveIntegerField(default=0, verbose_name="Перегляди")
 
+    def __str__(self):
+        return f"{self.title} ({self.score:.2f})"
 
-class Experience(models.Model):
+    class Meta:
+        verbose_name = "Рейтинг проекту"
+        verbose_name_plural = "Популярні проекти"
+        indexes = [
+            # Топ N — один діапазонний прохід по індексу
+            models.Index(fields=['technology', '-score'], name='trending_technology_score'),
+            models.Index(fields=['-score'], condition=models.Q(technology__isnull=True),
+                         name='trending_global_score'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['project'], condition=models.Q(technology__isnull=True),
+                                    name='trending_unique_global'),
+            models.UniqueConstraint(fields=['project', 'technology'], condition=models.Q(technology__isnull=False),
+                                    name='trending_unique_technology'),
+        ]
+
+class Experience(DirtyFieldsMixin, models.Model):
     """
     Model for hands-on experience
     """
-    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE,
-                                related_name="experience", verbose_name="Профіль")
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="experience",
+                                db_index=False, verbose_name="Профіль")
     company = models.CharField(max_length=100, verbose_name="Компанія")
     role = models.CharField(max_length=100, verbose_name="Посада")
     start_date = models.DateField(verbose_name="Дата початку")
@@ -61,11 +126,14 @@ class Experience(models.Model):
         verbose_name = "Досвід роботи"
         verbose_name_plural = "Досвід роботи"
         ordering = ['-start_date']
+        indexes = [
+            models.Index(fields=['profile', '-start_date'], name='experience_profile_start'),
+        ]
 
 
-class Education(models.Model):
-    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE,
-                                related_name="education", verbose_name="Профіль")
+class Education(DirtyFieldsMixin, models.Model):
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="education",
+                                db_index=False, verbose_name="Профіль")
     institution = models.CharField(max_length=200, verbose_name="Навчальний заклад")
     degree = models.CharField(max_length=100, verbose_name="Ступінь")
     field_of_study = models.CharField(max_length=100, verbose_name="Спеціальність")
@@ -79,7 +147,44 @@ class Education(models.Model):
         verbose_name = "Освіта"
         verbose_name_plural = "Освіта"
         ordering = ['-start_date']
+        indexes = [
+            models.Index(fields=['profile', '-start_date'], name='education_profile_start'),
+        ]
 
 
+class GitHubSyncJob(models.Model):
+    """
+    Background synchronisation of a profile's GitHub repositories
+    """
+    class Status(models.TextChoices):
+        PENDING = 'pending', "В черзі"
+        RUNNING = 'running', "Виконується"
+        SUCCEEDED = 'succeeded', "Успішно"
+        FAILED = 'failed', "Помилка"
+
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE,
+                                related_name="github_sync_jobs", verbose_name="Профіль")
+    github_username = models.CharField(max_length=100, verbose_name="GitHub username")
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING,
+                              verbose_name="Статус")
+    pages_fetched = models.PositiveIntegerField(default=0, verbose_name="Завантажено сторінок")
+    pages_not_modified = models.PositiveIntegerField(default=0, verbose_name="Сторінок без змін")
+    total_synced = models.PositiveIntegerField(default=0, verbose_name="Синхронізовано")
+    newly_created = models.PositiveIntegerField(default=0, verbose_name="Створено")
+    rate_limit_remaining = models.IntegerField(null=True, blank=True, verbose_name="Залишок ліміту GitHub")
+    # {url сторінки: {"etag": ..., "next": ...}} — для умовних запитів наступного разу
+    etags = models.JSONField(default=dict, blank=True, verbose_name="ETag сторінок")
+    error = models.TextField(blank=True, verbose_name="Помилка")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата створення")
+    # Оновлюється після кожної сторінки: задача без змін довше за
+    # GITHUB_SYNC_STALE_AFTER вважається завислою
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Дата оновлення")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Дата завершення")
 
+    def __str__(self):
+        return f"GitHub sync #{self.pk} ({self.status})"
 
+    class Meta:
+        verbose_name = "Синхронізація з GitHub"
+        verbose_name_plural = "Синхронізації з GitHub"
+        ordering = ['-created_at']
@@ -0,0 +1,33 @@
+"""
+Migration operations that only touch the database on PostgreSQL.
+
+GIN/trigram indexes and other PostgreSQL-specific schema objects are part of
+the model state everywhere, but are created only on PostgreSQL, so the test
+suite can still migrate a SQLite database.
+"""
+from django.db import migrations
+
+
+class PostgresOnlyMixin:
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+    def describe(self):
+        return f"{super().describe()} (PostgreSQL only)"
+
+
+class AddPostgresIndex(PostgresOnlyMixin, migrations.AddIndex):
+    pass
+
+
+class RemovePostgresIndex(PostgresOnlyMixin, migrations.RemoveIndex):
+    pass
+
+
+class RunPostgresSQL(PostgresOnlyMixin, migrations.RunSQL):
+    pass
@@ -0,0 +1,92 @@
+"""
+Project search.
+
+On PostgreSQL projects are matched against ``Project.search_vector`` (title,
+description and technology names, GIN-indexed) plus a trigram match on the
+title, and ranked. Misspelled technology names are corrected against the
+technology vocabulary before querying. Other databases use a plain
+``icontains`` fallback.
+"""
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity,
+)
+from django.db import connections
+from django.db.models import Exists, F, OuterRef, Q, Subquery, TextField, Value
+from django.db.models.functions import Coalesce
+
+from .models import Project, Technology
+
+# Контент змішаний (українська та англійська), тому без стемінгу
+SEARCH_CONFIG = 'simple'
+MAX_FUZZY_TERMS = 5
+
+
+def is_postgres(using='default'):
+    return connections[using].vendor == 'postgresql'
+
+
+def project_search_vector():
+    technology_names = Subquery(
+        Technology.objects.filter(projects=OuterRef('pk'))
+        .values('projects')
+        .annotate(names=StringAgg('name', delimiter=' '))
+        .values('names')
+    )
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+        + SearchVector(Coalesce(technology_names, Value(''), output_field=TextField()), weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(projects):
+    """
+    Recomputes ``search_vector`` for the given projects (a queryset or ids).
+    Does nothing outside PostgreSQL.
+    """
+    if isinstance(projects, (list, tuple, set)):
+        projects = Project.objects.filter(pk__in=projects)
+    if not is_postgres(projects.db):
+        return
+    projects.update(search_vector=project_search_vector())
+
+
+def _fuzzy_technologies(text):
+    terms = text.split()[:MAX_FUZZY_TERMS]
+    condition = Q()
+    for term in terms:
+        condition |= Q(name__trigram_similar=term)
+    if not condition:
+        return []
+    return list(Technology.objects.filter(condition).values_list('name', flat=True)[:MAX_FUZZY_TERMS])
+
+
+def ranked_search(queryset, text):
+    query = SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+    # "djnago" -> "Django": виправляємо опечатки за словником технологій
+    for name in _fuzzy_technologies(text):
+        query |= SearchQuery(name, config=SEARCH_CONFIG, search_type='plain')
+
+    return queryset.filter(
+        Q(search_vector=query) | Q(title__trigram_word_similar=text)
+    ).annotate(
+        search_rank=SearchRank(F('search_vector'), query) + TrigramWordSimilarity(text, 'title')
+    )
+
+
+def simple_search(queryset, text):
+    technologies = Technology.objects.filter(projects=OuterRef('pk'), name__icontains=text)
+    return queryset.filter(
+        Q(title__icontains=text) | Q(description__icontains=text) | Exists(technologies)
+    )
+
+
+def search_projects(queryset, text, mode=None):
+    """
+    Filters ``queryset`` by ``text``. ``mode='simple'`` forces the fallback;
+    ranked results are annotated with ``search_rank``.
+    """
+    if mode != 'simple' and is_postgres(queryset.db):
+        return ranked_search(queryset, text)
+    return simple_search(queryset, text)
@@ -0,0 +1,131 @@
+"""
+Synthetic data for benchmarks.
+
+Users with profiles, projects with technologies, experience and education
+are written with ``bulk_create`` in batches of profiles, so large datasets
+fit in memory. Every seeded username starts with ``SEED_PREFIX`` and
+``clear_seeded`` removes them again.
+"""
+import datetime
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from users.models import UserProfile
+from users.search import profile_names
+
+from .models import Education, Experience, Project, Technology
+from .search import update_search_vectors
+from .trending import sync_projects
+
+SEED_PREFIX = 'seed_'
+TECHNOLOGY_NAMES = [
+    'Python', 'Django', 'JavaScript', 'TypeScript', 'React', 'Vue', 'Go', 'Rust',
+    'PostgreSQL', 'Redis', 'Docker', 'Kubernetes', 'Java', 'Kotlin', 'Swift', 'C#',
+]
+WORDS = [
+    'portfolio', 'api', 'dashboard', 'parser', 'bot', 'service', 'tracker', 'shop',
+    'chat', 'game', 'blog', 'scheduler', 'analytics', 'client', 'engine', 'toolkit',
+]
+
+
+def seed_technologies(count):
+    names = [
+        TECHNOLOGY_NAMES[i] if i < len(TECHNOLOGY_NAMES) else f'{SEED_PREFIX}tech-{i}'
+        for i in range(count)
+    ]
+    Technology.objects.bulk_create([Technology(name=name) for name in names], ignore_conflicts=True)
+    return list(Technology.objects.filter(name__in=names).values_list('pk', flat=True))
+
+
+def _random_date(rng, start_year=2010):
+    start = datetime.date(start_year, 1, 1)
+    return start + datetime.timedelta(days=rng.randrange((datetime.date.today() - start).days))
+
+
+def _seed_batch(rng, usernames, technology_ids, projects, experience, education):
+    # bulk_create не надсилає post_save, тому профілі створюємо самі
+    password = make_password(None)
+    users = User.objects.bulk_create([User(username=username, password=password) for username in usernames])
+    profiles = []
+    for user in users:
+        profile = UserProfile(user=user, bio=f"{user.username} bio", github_url=f'https://github.com/{user.username}')
+        profile.display_name, profile.search_name = profile_names(user.username, user.first_name, user.last_name)
+        profiles.append(profile)
+    profiles = UserProfile.objects.bulk_create(profiles)
+
+    project_rows = []
+    for profile, user in zip(profiles, users):
+        for i in range(projects):
+            title = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}"
+            project_rows.append(Project(
+                profile=profile,
+                title=title,
+                description=f"{title}: {' '.join(rng.choices(WORDS, k=12))}",
+                # Приблизно половина проєктів — синхронізовані з GitHub
+                github_link=f'https://github.com/{user.username}/repo-{i}' if i % 2 == 0 else None,
+                views=int(rng.paretovariate(1.2)) - 1,
+            ))
+    created = Project.objects.bulk_create(project_rows)
+
+    through = Project.technologies.through
+    through.objects.bulk_create([
+        through(project_id=project.pk, technology_id=technology_id)
+        for project in created
+        for technology_id in rng.sample(technology_ids, k=min(3, len(technology_ids)))
+    ])
+
+    Experience.objects.bulk_create([
+        Experience(profile=profile, company=f"Company {i}", role=rng.choice(WORDS).title(),
+                   start_date=_random_date(rng), description=' '.join(rng.choices(WORDS, k=8)))
+        for profile in profiles for i in range(experience)
+    ])
+    Education.objects.bulk_create([
+        Education(profile=profile, institution=f"University {i}", degree="Bachelor",
+                  field_of_study=rng.choice(WORDS).title(), start_date=_random_date(rng, 2000))
+        for profile in profiles for i in range(education)
+    ])
+    update_search_vectors([project.pk for project in created])
+    sync_projects([project.pk for project in created])
+    return len(created)
+
+
+def seed(profiles=1000, projects=20, experience=3, education=2, technologies=50,
+         batch_size=500, random_seed=0, progress=None):
+    """
+    Adds ``profiles`` seeded profiles (numbered after the existing ones).
+    ``projects``/``experience``/``education`` are per profile.
+    Returns the number of created rows per model.
+    """
+    rng = random.Random(random_seed)
+    technology_ids = seed_technologies(technologies)
+    offset = User.objects.filter(username__startswith=SEED_PREFIX).count()
+
+    totals = {'profiles': 0, 'projects': 0}
+    for start in range(0, profiles, batch_size):
+        usernames = [f'{SEED_PREFIX}{offset + i}' for i in range(start, min(start + batch_size, profiles))]
+        with transaction.atomic():
+            totals['projects'] += _seed_batch(rng, usernames, technology_ids, projects, experience, education)
+        totals['profiles'] += len(usernames)
+        if progress:
+            progress(totals)
+    totals['experience'] = totals['profiles'] * experience
+    totals['education'] = totals['profiles'] * education
+    return totals
+
+
+def seeded_usernames():
+    return User.objects.filter(username__startswith=SEED_PREFIX).order_by('pk').values_list('username', flat=True)
+
+
+def clear_seeded():
+    """
+    Deletes all seeded users (with their profiles and content) and
+    seeded technologies. Returns Django's delete() summary.
+    """
+    with transaction.atomic():
+        deleted, per_model = User.objects.filter(username__startswith=SEED_PREFIX).delete()
+        Technology.objects.filter(name__startswith=SEED_PREFIX).delete()
+    return per_model
@@ -1,14 +1,31 @@
+from collections import Counter
+
+from django.db import transaction
 from rest_framework import serializers
-from .models import Technology, Project, Experience, Education
+from config.images import SrcsetField
+from config.metrics import TimedSerializerMixin
+from users.serializers import UserProfileSerializer
+from .autocomplete import technology_index
+from .bulk import BulkListSerializer, BulkSerializerMixin
+from .models import Technology, Project, Experience, Education, GitHubSyncJob, TrendingProject
+from .search import update_search_vectors
+from .trending import decayed_score, sync_projects
 
 
-class TechnologySerializer(serializers.ModelSerializer):
+class TechnologySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Technology
         fields = ['id', 'name']
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+def unknown_technologies(ids):
+    ids = set(ids)
+    if not ids:
+        return []
+    return sorted(ids - set(Technology.objects.filter(pk__in=ids).values_list('pk', flat=True)))
+
+
+class ProjectSerializer(BulkSerializerMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """
         Тут ми хочемо показувати не просто ID технологій,
         а повні об'єкти (завдяки 'TechnologySerializer(many=True)').
@@ -22,6 +39,9 @@ class ProjectSerializer(serializers.ModelSerializer):
     )
     username = serializers.CharField(source='profile.user.username', read_only=True)
     profile_picture = serializers.ImageField(source='profile.profile_picture', read_only=True)
+    # {"avif": "<url> 320w, ...", "webp": "..."} — для <picture>/<img srcset>
+    image_srcset = SrcsetField(source='image_variants')
+    profile_picture_srcset = SrcsetField(source='profile.profile_picture_variants')
 
     class Meta:
         model = Project
@@ -29,13 +49,123 @@ class ProjectSerializer(serializers.ModelSerializer):
         # і так належатимуть одному профілю.
         # Ми будемо фільтрувати за профілем у View.
         fields = [
-            'id', 'profile', 'username', 'profile_picture', 'title', 'description', 'image', 'github_link',
-            'live_link', 'views', 'created_at', 'technologies', 'technology_ids'
+            'id', 'profile', 'username', 'profile_picture', 'profile_picture_srcset', 'title', 'description',
+            'image', 'image_srcset', 'github_link', 'live_link', 'views', 'created_at', 'technologies',
+            'technology_ids'
         ]
         extra_kwargs = {
             'profile': {'read_only': True},
             'views': {'read_only': True}
         }
+        list_serializer_class = BulkListSerializer
+
+    bulk_related_fields = ('technology_ids',)
+    duplicate_link_message = "Проєкт з цим посиланням на GitHub вже є у профілі."
+
+    def _profile_id(self, instance=None):
+        if instance is not None:
+            return instance.profile_id
+        request = self.context.get('request')
+        if request is None or not request.user.is_authenticated:
+            return None
+        return request.user.profile.pk
+
+    # Перевірки одного проєкту; у пакеті (self.parent — BulkListSerializer)
+    # те саме робить bulk_validate одним запитом на весь батч
+    def validate_technology_ids(self, value):
+        if self.parent is None:
+            unknown = unknown_technologies(value)
+            if unknown:
+                raise serializers.ValidationError(f"Невідомі технології: {', '.join(map(str, unknown))}.")
+        return value
+
+    def validate_github_link(self, value):
+        profile_id = self._profile_id(self.instance)
+        if self.parent is None and value and profile_id:
+            duplicates = Project.objects.filter(profile_id=profile_id, github_link=value)
+            if self.instance is not None:
+                duplicates = duplicates.exclude(pk=self.instance.pk)
+            if duplicates.exists():
+                raise serializers.ValidationError(self.duplicate_link_message)
+        return value
+
+    def bulk_validate(self, attrs_list, instances=None):
+        errors = [{} for _ in attrs_list]
+
+        known = set(Technology.objects.filter(
+            pk__in={pk for attrs in attrs_list for pk in attrs.get('technology_ids', ())}
+        ).values_list('pk', flat=True))
+        links = {attrs['github_link'] for attrs in attrs_list if attrs.get('github_link')}
+        instances = instances or []
+        profile_id = self._profile_id(instances[0] if instances else None)
+        # Посилання після запису пакета: проєктів поза пакетом і елементів
+        # пакета, які github_link не змінюють (обмін посиланнями дозволено)
+        taken = set(
+            Project.objects.filter(profile_id=profile_id, github_link__in=links)
+            .exclude(pk__in=[instance.pk for instance in instances])
+            .values_list('github_link', flat=True)
+        ) if links else set()
+        taken.update(
+            instance.github_link for instance, attrs in zip(instances, attrs_list)
+            if 'github_link' not in attrs and instance.github_link
+        )
+
+        seen = set()
+        for i, attrs in enumerate(attrs_list):
+            unknown = sorted(set(attrs.get('technology_ids', ())) - known)
+            if unknown:
+                errors[i]['technology_ids'] = [f"Невідомі технології: {', '.join(map(str, unknown))}."]
+            link = attrs.get('github_link')
+            if link:
+                if link in taken or link in seen:
+                    errors[i]['github_link'] = [self.duplicate_link_message]
+                seen.add(link)
+        return errors
+
+    def bulk_prepare_update(self, instances, rows):
+        # project_unique_github_link перевіряється для кожного рядка UPDATE, тож
+        # при обміні посиланнями спершу звільняємо ті, що змінюються
+        moved = [
+            instance.pk for instance, attrs in zip(instances, rows)
+            if instance.github_link and attrs.get('github_link', instance.github_link) != instance.github_link
+        ]
+        if moved:
+            Project.objects.filter(pk__in=moved).update(github_link=None)
+
+    def bulk_write_related(self, instances, related, created):
+        # Зв'язки з технологіями — один INSERT у through-таблицю на весь батч
+        through = Project.technologies.through
+        links = {
+            instance.pk: list(dict.fromkeys(item['technology_ids']))
+            for instance, item in zip(instances, related) if 'technology_ids' in item
+        }
+        if not links:
+            return
+        usage = Counter(pk for ids in links.values() for pk in ids)
+        if not created:
+            old = through.objects.filter(project_id__in=links)
+            usage.subtract(old.values_list('technology_id', flat=True))
+            old.delete()
+        through.objects.bulk_create([
+            through(project_id=project_id, technology_id=technology_id)
+            for project_id, ids in links.items() for technology_id in ids
+        ])
+        deltas = {pk: delta for pk, delta in usage.items() if delta}
+        transaction.on_commit(lambda: technology_index.add_usage(deltas))
+
+    def bulk_saved(self, instances):
+        super().bulk_saved(instances)
+        project_ids = [instance.pk for instance in instances]
+        update_search_vectors(project_ids)
+        transaction.on_commit(lambda: sync_projects(project_ids))
+
+    def bulk_deleted(self, rows):
+        super().bulk_deleted(rows)
+        usage = Counter(
+            Project.technologies.through.objects.filter(project__in=rows).values_list('technology_id', flat=True)
+        )
+        deltas = {pk: -count for pk, count in usage.items()}
+        transaction.on_commit(lambda: technology_index.add_usage(deltas))
 
     def create(self, validated_data):
         technology_ids = validated_data.pop('technology_ids', [])
@@ -59,7 +189,7 @@ class ProjectSerializer(serializers.ModelSerializer):
         return instance
 
 
-class ExperienceSerializer(serializers.ModelSerializer):
+class ExperienceSerializer(BulkSerializerMixin, TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Experience
         fields = ['id', 'profile', 'company', 'role', 'start_date',
@@ -68,9 +198,10 @@ class ExperienceSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             'profile': {'read_only': True}
         }
+        list_serializer_class = BulkListSerializer
 
 
-class EducationSerializer(serializers.ModelSerializer):
+class EducationSerializer(BulkSerializerMixin, TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Education
         fields = [
@@ -80,5 +211,59 @@ class EducationSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             'profile': {'read_only': True}
         }
+        list_serializer_class = BulkListSerializer
+
 
+class GitHubSyncJobSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = GitHubSyncJob
+        fields = [
+            'id', 'github_username', 'status', 'pages_fetched', 'pages_not_modified',
+            'total_synced', 'newly_created', 'rate_limit_remaining', 'error',
+            'created_at', 'finished_at'
+        ]
+        read_only_fields = fields
+
+
+class TrendingProjectSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    Рядок рейтингу: лише денормалізовані поля, без звернень до інших таблиць.
+    """
+    id = serializers.IntegerField(source='project_id', read_only=True)
+    score = serializers.SerializerMethodField()
+
+    class Meta:
+        model = TrendingProject
+        fields = ['id', 'title', 'username', 'views', 'score']
+        read_only_fields = fields
+
+    def get_score(self, entry):
+        # Поточна (згасла) вага — порівнювана між рядками одного моменту
+        return round(decayed_score(entry.score, self.context.get('now')), 3)
+
+
+class PortfolioSerializer(TimedSerializerMixin, serializers.Serializer):
+    """
+    Уся сторінка портфоліо однією відповіддю. Очікує профіль
+    з portfolio.aggregate.portfolio_queryset().
+    """
+    profile = UserProfileSerializer(source='*', read_only=True)
+    projects = ProjectSerializer(source='portfolio_projects', many=True, read_only=True)
+    experience = ExperienceSerializer(many=True, read_only=True)
+    education = EducationSerializer(many=True, read_only=True)
+    counts = serializers.SerializerMethodField()
+
+    def get_counts(self, profile):
+        if not hasattr(profile, 'projects_count'):
+            return None
+        return {
+            'projects': profile.projects_count,
+            'experience': len(profile.experience.all()),
+            'education': len(profile.education.all()),
+        }
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if data['counts'] is None:
+            data.pop('counts')
+        return data
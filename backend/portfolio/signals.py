@@ -0,0 +1,238 @@
+import threading
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from config.images import schedule_variants, variants_generated
+from users.cache import invalidate_profiles, profiles_invalidated
+
+from .autocomplete import technology_index
+from .counters import views_flushed
+from .models import Education, Experience, Project, Technology, TrendingProject
+from .search import is_postgres, update_search_vectors
+from .snapshots import refresh_views, snapshot_scheduler, snapshots_enabled
+from .trending import sync_projects
+
+_state = threading.local()
+
+
+@contextmanager
+def skip_row_signals():
+    """
+    Вимикає порядкові receivers видалення (кеш профілю, лічильники
+    технологій) — для пакетних операцій, які роблять те саме одним запитом
+    (portfolio.bulk).
+    """
+    previous = getattr(_state, 'skip', False)
+    _state.skip = True
+    try:
+        yield
+    finally:
+        _state.skip = previous
+
+
+def row_signals_skipped():
+    return getattr(_state, 'skip', False)
+
+
+@receiver(post_save, sender=Project)
+def refresh_project_search_vector(sender, instance, using, update_fields=None, **kwargs):
+    """
+    Оновлює search_vector після зміни назви чи опису проєкту.
+    """
+    if not is_postgres(using):
+        return
+    if update_fields is not None and not {'title', 'description'} & set(update_fields):
+        return
+    transaction.on_commit(lambda: update_search_vectors([instance.pk]), using=using)
+
+
+@receiver(m2m_changed, sender=Project.technologies.through)
+def refresh_search_vector_on_technologies(sender, instance, action, reverse, pk_set, using, **kwargs):
+    if not is_postgres(using):
+        return
+    if not reverse:
+        if action not in ('post_add', 'post_remove', 'post_clear'):
+            return
+        project_ids = [instance.pk]
+    elif action in ('post_add', 'post_remove'):
+        project_ids = list(pk_set)
+    elif action == 'pre_clear':
+        # Після clear зв'язків уже не видно — запам'ятовуємо проєкти заздалегідь
+        project_ids = list(instance.projects.values_list('pk', flat=True))
+    else:
+        return
+    transaction.on_commit(lambda: update_search_vectors(project_ids), using=using)
+
+
+@receiver(post_save, sender=Technology)
+def refresh_search_vector_on_rename(sender, instance, created, using, **kwargs):
+    if created or not is_postgres(using):
+        return
+    transaction.on_commit(
+        lambda: update_search_vectors(Project.objects.filter(technologies=instance)), using=using
+    )
+
+
+@receiver(pre_delete, sender=Technology)
+def refresh_search_vector_on_technology_delete(sender, instance, using, **kwargs):
+    if not is_postgres(using):
+        return
+    # Зв'язки видаляються каскадом без m2m_changed — запам'ятовуємо проєкти заздалегідь
+    project_ids = list(Project.objects.filter(technologies=instance).values_list('pk', flat=True))
+    if project_ids:
+        transaction.on_commit(lambda: update_search_vectors(project_ids), using=using)
+
+
+def _technology_profile_ids(technology):
+    return set(Project.objects.filter(technologies=technology).values_list('profile_id', flat=True))
+
+
+@receiver([post_save, post_delete], sender=Project)
+@receiver([post_save, post_delete], sender=Experience)
+@receiver([post_save, post_delete], sender=Education)
+def invalidate_profile_cache(sender, instance, **kwargs):
+    """
+    Скидає кешовані відповіді профілю, якому належить змінений запис.
+    """
+    if row_signals_skipped():
+        return
+    profile_id = instance.profile_id
+    transaction.on_commit(lambda: invalidate_profiles([profile_id]))
+
+
+@receiver(m2m_changed, sender=Project.technologies.through)
+def invalidate_profile_cache_on_technologies(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        profile_ids = [instance.profile_id]
+    elif action == 'pre_clear':
+        profile_ids = _technology_profile_ids(instance)
+    else:
+        profile_ids = set(Project.objects.filter(pk__in=pk_set).values_list('profile_id', flat=True))
+    transaction.on_commit(lambda: invalidate_profiles(profile_ids))
+
+
+@receiver(post_save, sender=Technology)
+@receiver(pre_delete, sender=Technology)
+def invalidate_profile_cache_on_technology(sender, instance, created=False, **kwargs):
+    if created:
+        return
+    profile_ids = _technology_profile_ids(instance)
+    transaction.on_commit(lambda: invalidate_profiles(profile_ids))
+
+
+@receiver(post_save, sender=Project)
+def generate_project_image_variants(sender, instance, raw=False, **kwargs):
+    """
+    Ставить у чергу генерацію зменшених копій, якщо зображення змінилось.
+    """
+    if not raw:
+        schedule_variants(instance, 'image', 'image_variants')
+
+
+@receiver(variants_generated, sender=Project)
+def invalidate_profile_cache_on_variants(sender, pk, **kwargs):
+    invalidate_profiles(Project.objects.filter(pk=pk).values_list('profile_id', flat=True))
+
+
+@receiver(post_save, sender=Technology)
+def update_technology_index(sender, instance, raw=False, **kwargs):
+    """
+    Оновлює індекс автодоповнення технологій (portfolio.autocomplete).
+    """
+    if not raw:
+        pk, name = instance.pk, instance.name
+        transaction.on_commit(lambda: technology_index.upsert(pk, name))
+
+
+@receiver(post_delete, sender=Technology)
+def remove_from_technology_index(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: technology_index.remove(pk))
+
+
+@receiver(m2m_changed, sender=Project.technologies.through)
+def update_technology_usage(sender, instance, action, reverse, pk_set, **kwargs):
+    if not technology_index.is_active or action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    sign = 1 if action == 'post_add' else -1
+    if not reverse:
+        technology_ids = instance.technologies.values_list('pk', flat=True) if action == 'pre_clear' else pk_set
+        deltas = {pk: sign for pk in technology_ids}
+    else:
+        count = instance.projects.count() if action == 'pre_clear' else len(pk_set)
+        deltas = {instance.pk: sign * count}
+    transaction.on_commit(lambda: technology_index.add_usage(deltas))
+
+
+@receiver(pre_delete, sender=Project)
+def update_technology_usage_on_delete(sender, instance, **kwargs):
+    # Рядки зв'язку видаляються каскадом без m2m_changed
+    if not technology_index.is_active or row_signals_skipped():
+        return
+    deltas = {pk: -1 for pk in instance.technologies.values_list('pk', flat=True)}
+    if deltas:
+        transaction.on_commit(lambda: technology_index.add_usage(deltas))
+
+
+@receiver(post_save, sender=Project)
+def sync_trending_project(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """
+    Додає новий проєкт у рейтинг portfolio.trending і оновлює назву в ньому.
+    """
+    if raw or (update_fields is not None and 'title' not in update_fields):
+        return
+    pk = instance.pk
+    transaction.on_commit(lambda: sync_projects([pk]))
+
+
+@receiver(m2m_changed, sender=Project.technologies.through)
+def sync_trending_technologies(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        project_ids = [instance.pk]
+    elif action == 'post_clear':
+        # Рядки технології видаляє каскад лише разом з нею; тут — самі
+        technology_id = instance.pk
+        transaction.on_commit(lambda: TrendingProject.objects.filter(technology_id=technology_id).delete())
+        return
+    else:
+        project_ids = list(pk_set)
+    transaction.on_commit(lambda: sync_projects(project_ids))
+
+
+@receiver(post_save, sender=User)
+def rename_trending_username(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # У нового користувача ще немає проєктів
+    if created or raw or (update_fields is not None and 'username' not in update_fields):
+        return
+    (
+        TrendingProject.objects
+        .filter(project__profile__user=instance)
+        .exclude(username=instance.username)
+        .update(username=instance.username)
+    )
+
+
+@receiver(profiles_invalidated)
+def refresh_portfolio_snapshots(sender, usernames, **kwargs):
+    """
+    Перегенеровує знімки портфоліо змінених профілів (portfolio.snapshots).
+    """
+    if snapshots_enabled():
+        snapshot_scheduler.schedule(usernames)
+
+
+@receiver(views_flushed)
+def refresh_portfolio_snapshot_views(sender, counts, **kwargs):
+    """
+    Перегляди скидаються через update() без profiles_invalidated — оновлюємо
+    знімки окремо, не частіше ніж раз на VIEWS_INTERVAL.
+    """
+    refresh_views(list(counts))
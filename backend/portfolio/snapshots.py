@@ -0,0 +1,339 @@
+"""
+Pre-rendered portfolio snapshots.
+
+Each user's ``GET /api/v1/portfolio/<username>/?counts=1`` body — the
+request the public profile page makes — is written to
+``<DIR>/portfolio/<username>.json`` with a gzipped copy next to it, so nginx
+(``try_files`` + ``gzip_static``) or a CDN can serve it without reaching
+Django. ``PortfolioView`` serves the file too and falls back to live queries
+when it is missing. Image and file URLs are built from ``BASE_URL`` (the
+public origin of the API), so the body matches the live response for
+requests to that origin; requests to any other host get live responses.
+
+Any change that invalidates a profile's cached responses
+(``users.cache.profiles_invalidated``) removes the snapshot at once — reads
+fall back to live data instead of a stale file — and regenerates it after
+``DEBOUNCE`` seconds without further changes (at most ``MAX_DELAY`` after
+the first one), so a burst of edits renders the profile once.
+
+View counts change without that signal (``portfolio.counters`` flushes
+them with ``QuerySet.update()``): after a flush, snapshots of the affected
+profiles older than ``VIEWS_INTERVAL`` are regenerated in the background,
+and ``PortfolioView`` never serves a snapshot older than ``MAX_AGE``.
+
+Disabled while ``PORTFOLIO_SNAPSHOTS['DIR']`` or ``['BASE_URL']`` is empty.
+"""
+import atexit
+import gzip
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework.renderers import JSONRenderer
+
+from users.models import UserProfile
+
+from .aggregate import DEFAULT_PROJECTS_LIMIT, portfolio_queryset
+from .models import Project
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'DIR': None,
+    # Секунди без змін перед перегенерацією знімка
+    'DEBOUNCE': 2,
+    # Не довше цього від першої зміни, навіть якщо зміни тривають
+    'MAX_DELAY': 30,
+    # Публічна адреса API (https://api.example.com) для абсолютних URL
+    'BASE_URL': '',
+    'BATCH_SIZE': 200,
+    # Старіший знімок Django не віддає, а перегенеровує (як TTL кешу portfolio)
+    'MAX_AGE': 300,
+    # Після скидання переглядів знімок оновлюється, якщо він старіший за це
+    'VIEWS_INTERVAL': 60,
+}
+
+# Імена, які безпечно використовувати як ім'я файлу
+SAFE_USERNAME = re.compile(r'^[\w.@+-]+$')
+
+
+def snapshot_settings():
+    return {**DEFAULTS, **getattr(settings, 'PORTFOLIO_SNAPSHOTS', {})}
+
+
+# Параметри запиту, відповідь на який зберігає знімок
+SNAPSHOT_QUERY = {'counts': ('1', 'true')}
+
+
+def snapshots_enabled():
+    config = snapshot_settings()
+    return bool(config['DIR'] and config['BASE_URL'])
+
+
+def _base_url():
+    return snapshot_settings()['BASE_URL'].rstrip('/') + '/'
+
+
+def snapshot_path(username):
+    """
+    Path of the user's snapshot or None (snapshots disabled, unsafe username).
+    """
+    if not snapshots_enabled() or not username or not SAFE_USERNAME.match(username):
+        return None
+    return Path(snapshot_settings()['DIR']) / 'portfolio' / f'{username}.json'
+
+
+class _SnapshotRequest:
+    """
+    Те, що серіалізатори беруть із request: лише абсолютні URL.
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    def build_absolute_uri(self, location):
+        return urljoin(self.base_url, location)
+
+
+def render_profile(profile):
+    # serializers -> bulk -> signals -> snapshots: імпорт при виклику
+    from .serializers import PortfolioSerializer
+
+    context = {'request': _SnapshotRequest(_base_url())}
+    return JSONRenderer().render(PortfolioSerializer(profile, context=context).data)
+
+
+def _write_atomic(path, content):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        # mkstemp створює файл 0600 — nginx має його прочитати
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def write_snapshot(username, content):
+    path = snapshot_path(username)
+    if path is None:
+        return None
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Спершу .gz: основний файл не має з'явитися раніше за стиснутий
+    _write_atomic(path.with_name(path.name + '.gz'), gzip.compress(content, mtime=0))
+    _write_atomic(path, content)
+    return path
+
+
+def delete_snapshot(username):
+    path = snapshot_path(username)
+    if path is None:
+        return
+    # Спершу основний файл: за ним nginx вирішує, чи звертатися до Django
+    path.unlink(missing_ok=True)
+    path.with_name(path.name + '.gz').unlink(missing_ok=True)
+
+
+def snapshot_age(path):
+    """
+    Seconds since the snapshot was written, None if there is none.
+    """
+    try:
+        return time.time() - path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def read_snapshot(username):
+    """
+    Snapshot bytes or None.
+    """
+    path = snapshot_path(username)
+    if path is None:
+        return None
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def snapshot_for_request(request, username):
+    """
+    Snapshot bytes if it is exactly the response to ``request``, else None.
+    """
+    params = request.GET
+    if set(params) != set(SNAPSHOT_QUERY) or any(
+            params.get(name) not in values for name, values in SNAPSHOT_QUERY.items()):
+        return None
+    # Абсолютні URL у знімку збігаються з живими лише для цієї адреси
+    if not snapshots_enabled() or request.build_absolute_uri('/') != _base_url():
+        return None
+    path = snapshot_path(username)
+    age = snapshot_age(path) if path else None
+    if age is not None and age > snapshot_settings()['MAX_AGE']:
+        snapshot_scheduler.schedule([username], drop=False)
+        return None
+    return read_snapshot(username)
+
+
+def regenerate(usernames):
+    """
+    Renders the snapshots of the given users with one set of queries;
+    snapshots of users that no longer exist are removed.
+    """
+    usernames = {username for username in usernames if snapshot_path(username)}
+    if not usernames:
+        return 0
+    profiles = portfolio_queryset(DEFAULT_PROJECTS_LIMIT, with_counts=True).filter(user__username__in=usernames)
+    written = set()
+    for profile in profiles:
+        write_snapshot(profile.user.username, render_profile(profile))
+        written.add(profile.user.username)
+    for username in usernames - written:
+        delete_snapshot(username)
+    return len(written)
+
+
+def refresh_views(project_ids):
+    """
+    After a view count flush: regenerates, in the background, the existing
+    snapshots of the projects' owners that are older than ``VIEWS_INTERVAL``.
+    """
+    if not snapshots_enabled() or not project_ids:
+        return
+    interval = snapshot_settings()['VIEWS_INTERVAL']
+    usernames = set(
+        Project.objects.filter(pk__in=project_ids).values_list('profile__user__username', flat=True)
+    )
+    stale = set()
+    for username in usernames:
+        path = snapshot_path(username)
+        age = snapshot_age(path) if path else None
+        if age is not None and age >= interval:
+            stale.add(username)
+    # Старий знімок лишається доступним до заміни: змінились лише перегляди
+    snapshot_scheduler.schedule(stale, drop=False)
+
+
+def build_all(progress=None):
+    """
+    Regenerates the snapshots of all users in batches of ``BATCH_SIZE``.
+    """
+    batch_size = snapshot_settings()['BATCH_SIZE']
+    usernames = list(UserProfile.objects.order_by('pk').values_list('user__username', flat=True))
+    written = 0
+    for start in range(0, len(usernames), batch_size):
+        written += regenerate(usernames[start:start + batch_size])
+        if progress:
+            progress(min(start + batch_size, len(usernames)), len(usernames))
+    return written
+
+
+class SnapshotScheduler:
+    """
+    Debounced regeneration in one background thread per process.
+    With ``DEBOUNCE = 0`` or ``BACKGROUND_TASKS_EAGER`` snapshots are
+    regenerated inline.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        # username -> (перша зміна, остання зміна)
+        self._pending = {}
+        self._worker = None
+
+    def schedule(self, usernames, drop=True):
+        """
+        ``drop`` removes the current snapshots at once, so nothing serves
+        them until they are regenerated.
+        """
+        config = snapshot_settings()
+        usernames = {username for username in usernames if snapshot_path(username)}
+        if not usernames:
+            return
+        if drop:
+            for username in usernames:
+                delete_snapshot(username)
+
+        if not config['DEBOUNCE'] or getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+            regenerate(usernames)
+            return
+
+        now = time.monotonic()
+        with self._condition:
+            for username in usernames:
+                first, _ = self._pending.get(username, (now, now))
+                self._pending[username] = (first, now)
+            self._condition.notify()
+        self._ensure_worker()
+
+    def pending(self):
+        with self._condition:
+            return set(self._pending)
+
+    def flush(self):
+        """
+        Regenerates all pending snapshots now.
+        """
+        with self._condition:
+            usernames, self._pending = set(self._pending), {}
+        return regenerate(usernames)
+
+    def _ensure_worker(self):
+        with self._condition:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='portfolio-snapshots', daemon=True)
+                self._worker.start()
+
+    def _take_due(self):
+        """
+        Usernames whose deadline has passed and the seconds until the next
+        deadline (None when nothing is pending). Called under the lock.
+        """
+        config = snapshot_settings()
+        now = time.monotonic()
+        due, wait = set(), None
+        for username, (first, last) in self._pending.items():
+            deadline = min(last + config['DEBOUNCE'], first + config['MAX_DELAY'])
+            if deadline <= now:
+                due.add(username)
+            elif wait is None or deadline - now < wait:
+                wait = deadline - now
+        for username in due:
+            del self._pending[username]
+        return due, wait
+
+    def _run(self):
+        while True:
+            with self._condition:
+                due, wait = self._take_due()
+                while not due:
+                    self._condition.wait(wait)
+                    due, wait = self._take_due()
+            try:
+                regenerate(due)
+            except Exception:
+                logger.exception("Failed to regenerate %d portfolio snapshots", len(due))
+            finally:
+                close_old_connections()
+
+
+snapshot_scheduler = SnapshotScheduler()
+
+
+@atexit.register
+def _flush_on_exit():
+    if snapshot_scheduler._worker is not None:
+        try:
+            snapshot_scheduler.flush()
+        except Exception:
+            logger.exception("Final portfolio snapshot flush failed")
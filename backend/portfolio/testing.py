@@ -0,0 +1,105 @@
+"""
+Local fake GitHub API for tests and benchmarks.
+"""
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def make_repo(owner, n, fork=False):
+    return {
+        'name': f'repo-{n}',
+        'html_url': f'https://github.com/{owner}/repo-{n}',
+        'description': f'Repository {n}',
+        'homepage': None,
+        'fork': fork,
+    }
+
+
+class FakeGitHubServer:
+    """
+    Serves ``/users/<username>/repos`` with ``Link`` pagination and ETags.
+
+        with FakeGitHubServer({'octocat': repos}) as github:
+            client = GitHubClient(base_url=github.url)
+    """
+
+    def __init__(self, repos_by_user=None, per_page=30):
+        self.repos_by_user = repos_by_user or {}
+        self.per_page = per_page
+        self.requests = []
+        self.not_modified = 0
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f'http://{host}:{port}'
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                fake.requests.append(self.path)
+                parsed = urlparse(self.path)
+                parts = [part for part in parsed.path.split('/') if part]
+                if len(parts) != 3 or parts[0] != 'users' or parts[2] != 'repos':
+                    return self._send(404, {'message': 'Not Found'})
+                repos = fake.repos_by_user.get(parts[1])
+                if repos is None:
+                    return self._send(404, {'message': 'Not Found'})
+
+                query = parse_qs(parsed.query)
+                per_page = int(query.get('per_page', [fake.per_page])[0])
+                per_page = min(per_page, fake.per_page)
+                page = int(query.get('page', ['1'])[0])
+                chunk = repos[(page - 1) * per_page:page * per_page]
+                body = json.dumps(chunk).encode()
+                etag = '"%s"' % hashlib.md5(body).hexdigest()
+
+                headers = {'ETag': etag, 'X-RateLimit-Remaining': '4999'}
+                if page * per_page < len(repos):
+                    last_page = -(-len(repos) // per_page)
+                    page_url = f'{fake.url}{parsed.path}?per_page={per_page}&page='
+                    headers['Link'] = f'<{page_url}{page + 1}>; rel="next", <{page_url}{last_page}>; rel="last"'
+                if self.headers.get('If-None-Match') == etag:
+                    fake.not_modified += 1
+                    return self._send(304, None, headers)
+                self._send(200, body, headers)
+
+            def _send(self, code, body, headers=None):
+                if body is not None and not isinstance(body, bytes):
+                    body = json.dumps(body).encode()
+                self.send_response(code)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                if body is not None:
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if body is not None:
+                    self.wfile.write(body)
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -1,3 +1,1799 @@
-from django.test import TestCase
+import asyncio
+import csv
+import datetime
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.conf import settings
+from django.db.models import QuerySet
+from django.db.models.signals import post_save
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from config import openapi
+from config.db_router import ReplicaRouter, ReplicaRoutingMiddleware
+from config.throttling import SlidingWindowThrottle
+from users.cache import cache_stats
+from users.models import UserProfile
+
+from .autocomplete import technology_index
+from .benchmark import ConcurrencyBenchmark, Scenario, percentile
+from .counters import check_store, view_counter
+from .github import AsyncGitHubClient, arun_sync_job, run_sync_job
+from .importer import Importer
+from .models import Education, Experience, GitHubSyncJob, Project, Technology, TrendingProject
+from .seeding import clear_seeded, seed
+from .serializers import ProjectSerializer
+from . import snapshots
+from .snapshots import SnapshotScheduler, snapshot_scheduler
+from .testing import FakeGitHubServer, make_repo
+from .trending import rebuild, record_views
+
+
+def make_user(username, **kwargs):
+    return User.objects.create_user(username=username, password='pass12345', **kwargs)
+
+
+def make_project(profile, **kwargs):
+    kwargs.setdefault('title', 'Project')
+    kwargs.setdefault('description', 'Description')
+    return Project.objects.create(profile=profile, **kwargs)
+
+
+@override_settings(VIEW_COUNTER={'FLUSH_INTERVAL': 0})
+class ViewCounterTests(TestCase):
+    def setUp(self):
+        caches['counters'].clear()
+        caches['throttle'].clear()
+        view_counter.local.drain()
+        self.client = APIClient()
+        self.project = make_project(make_user('alice').profile)
+        self.url = f'/api/v1/projects/{self.project.pk}/increment_views/'
+
+    def test_concurrent_increments_are_not_lost(self):
+        threads_count, per_thread = 8, 125
+
+        def worker(n):
+            for i in range(per_thread):
+                view_counter.record(self.project.pk, f'visitor-{n}-{i}')
+
+        view_counter.base_views(self.project.pk)
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(threads_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(view_counter.pending(self.project.pk), threads_count * per_thread)
+        self.assertEqual(view_counter.flush(), threads_count * per_thread)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.views, threads_count * per_thread)
+        self.assertEqual(view_counter.pending(self.project.pk), 0)
+
+    def test_increments_after_drain_are_flushed_next_time(self):
+        view_counter.record(self.project.pk, 'a')
+        view_counter.flush()
+        view_counter.record(self.project.pk, 'b')
+        view_counter.record(self.project.pk, 'c')
+        view_counter.flush()
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.views, 3)
+
+    def test_same_visitor_counted_once_per_window(self):
+        first = self.client.post(self.url)
+        second = self.client.post(self.url)
+
+        self.assertEqual(first.data['views'], 1)
+        self.assertEqual(second.data['views'], 1)
+        view_counter.flush()
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.views, 1)
+
+    def test_endpoint_does_not_touch_database(self):
+        self.client.post(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.post(self.url, HTTP_USER_AGENT='other-browser')
+        self.assertEqual(response.data['views'], 2)
+
+    def test_estimate_survives_flush(self):
+        self.client.post(self.url)
+        view_counter.flush()
+        response = self.client.post(self.url, HTTP_USER_AGENT='other-browser')
+        self.assertEqual(response.data['views'], 2)
+
+    def test_redis_store_without_redis_package_fails_at_startup(self):
+        redis_cache = {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://localhost'}
+        with override_settings(CACHES={**settings.CACHES, 'counters': redis_cache}):
+            with mock.patch('importlib.util.find_spec', return_value=None), \
+                    self.assertRaisesMessage(ImproperlyConfigured, 'redis package'):
+                check_store()
+            with mock.patch('importlib.util.find_spec', return_value=object()):
+                check_store()
+
+    def test_unknown_project_returns_404(self):
+        response = self.client.post('/api/v1/projects/999999/increment_views/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_failed_flush_keeps_increments(self):
+        view_counter.record(self.project.pk, 'a')
+        with mock.patch('portfolio.counters.apply_view_counts', side_effect=RuntimeError), \
+                self.assertLogs('portfolio.counters', 'ERROR'):
+            self.assertEqual(view_counter.flush(), 0)
+        self.assertEqual(view_counter.local.pending(self.project.pk), 1)
+
+        view_counter.flush()
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.views, 1)
+
+
+NO_RESPONSE_CACHE = {'ENDPOINTS': {'projects': False, 'experience': False, 'profile': False, 'portfolio': False}}
+
+
+@override_settings(PROFILE_CACHE=NO_RESPONSE_CACHE)
+class QueryBudgetTests(TestCase):
+    """
+    Кількість SQL-запитів list-ендпоінтів не має залежати від розміру сторінки.
+    """
+    list_urls = [
+        '/api/v1/projects/',
+        '/api/v1/projects/?username=owner',
+        '/api/v1/profiles/',
+        '/api/v1/technologies/',
+        '/api/v1/experience/?username=owner',
+        '/api/v1/education/',
+    ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = make_user('owner')
+        self.technologies = [Technology.objects.create(name=f'tech-{i}') for i in range(3)]
+
+    def add_rows(self, count):
+        for i in range(count):
+            profile = make_user(f'user-{Project.objects.count()}').profile
+            project = make_project(profile, title=f'Project {i}')
+            project.technologies.set(self.technologies)
+            make_project(self.owner.profile).technologies.set(self.technologies)
+            Experience.objects.create(profile=self.owner.profile, company='ACME', role='Dev',
+                                      start_date='2020-01-01')
+            Education.objects.create(profile=self.owner.profile, institution='KPI', degree='BSc',
+                                     field_of_study='CS', start_date='2016-09-01')
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return len(ctx)
+
+    def test_list_query_count_does_not_grow_with_rows(self):
+        self.add_rows(2)
+        small = {url: self.count_queries(url) for url in self.list_urls}
+        self.add_rows(10)
+        large = {url: self.count_queries(url) for url in self.list_urls}
+        self.assertEqual(small, large)
+
+    def test_project_page_budget(self):
+        self.add_rows(15)
+        # COUNT для пагінації, сторінка з профілями та користувачами, технології
+        with self.assertNumQueries(3):
+            self.client.get('/api/v1/projects/')
+
+    def test_project_detail_budget(self):
+        self.add_rows(1)
+        project = Project.objects.first()
+        with self.assertNumQueries(2):
+            self.client.get(f'/api/v1/projects/{project.pk}/')
+
+    def test_profile_by_username_budget(self):
+        with self.assertNumQueries(1):
+            self.client.get('/api/v1/profiles/by-username/owner/')
+
+
+class ProjectSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        profile = make_user('alice').profile
+        django = Technology.objects.create(name='Django')
+        self.by_title = make_project(profile, title='Weather bot', description='Telegram bot')
+        self.by_description = make_project(profile, title='Shop', description='Online weather station store')
+        self.by_technology = make_project(profile, title='Blog', description='Personal blog')
+        self.by_technology.technologies.add(django)
+        make_project(profile, title='Other', description='Nothing here')
+
+    def search(self, text, **params):
+        response = self.client.get('/api/v1/projects/', {'search': text, **params})
+        self.assertEqual(response.status_code, 200)
+        return {item['id'] for item in response.data['results']}
+
+    def test_matches_title_and_description(self):
+        self.assertEqual(self.search('weather'), {self.by_title.pk, self.by_description.pk})
+
+    def test_matches_technology_names(self):
+        self.assertEqual(self.search('djan'), {self.by_technology.pk})
+
+    def test_simple_mode_with_explicit_ordering(self):
+        self.assertEqual(
+            self.search('weather', search_mode='simple', ordering='title'),
+            {self.by_title.pk, self.by_description.pk},
+        )
+
+    def test_deleting_a_technology_refreshes_linked_search_vectors(self):
+        django = Technology.objects.get(name='Django')
+        self.by_title.technologies.add(django)
+        refreshed = []
+        with mock.patch('portfolio.signals.is_postgres', return_value=True), \
+                mock.patch('portfolio.signals.update_search_vectors', side_effect=refreshed.append), \
+                self.captureOnCommitCallbacks(execute=True):
+            django.delete()
+        self.assertEqual([sorted(ids) for ids in refreshed], [sorted([self.by_title.pk, self.by_technology.pk])])
+        self.assertEqual(self.search('djan'), set())
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        profile = make_user('alice').profile
+        self.projects = [make_project(profile, title=f'Project {i % 4}') for i in range(12)]
+        # Однакові значення views, щоб перевірити розв'язання нічиїх за id
+        for i, project in enumerate(self.projects):
+            Project.objects.filter(pk=project.pk).update(views=i % 3)
+
+    def walk(self, **params):
+        response = self.client.get('/api/v1/projects/', {'pagination': 'cursor', 'page_size': 5, **params})
+        ids = []
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            ids += [item['id'] for item in response.data['results']]
+            if not response.data['next']:
+                return ids
+            response = self.client.get(response.data['next'])
+
+    def test_walks_every_ordering_field(self):
+        expected = {project.pk for project in self.projects}
+        for ordering in ['-views', 'views', 'created_at', '-created_at', 'title', '-title']:
+            with self.subTest(ordering=ordering):
+                ids = self.walk(ordering=ordering)
+                self.assertEqual(len(ids), len(expected))
+                self.assertEqual(set(ids), expected)
+
+    def test_matches_offset_ordering(self):
+        offset_ids = [item['id'] for item in self.client.get('/api/v1/projects/', {'page_size': 100}).data['results']]
+        self.assertEqual(self.walk(), offset_ids)
+
+    def test_page_skips_count_query(self):
+        with self.assertNumQueries(2):
+            self.client.get('/api/v1/projects/', {'pagination': 'cursor'})
+
+    def test_no_duplicates_when_views_change(self):
+        first = self.client.get('/api/v1/projects/', {'pagination': 'cursor', 'page_size': 5})
+        seen = [item['id'] for item in first.data['results']]
+        # Проєкти з першої сторінки стають ще популярнішими
+        Project.objects.filter(pk__in=seen).update(views=100)
+        second = self.client.get(first.data['next'])
+        self.assertFalse(set(seen) & {item['id'] for item in second.data['results']})
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/v1/projects/', {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_from_other_ordering_is_rejected(self):
+        first = self.client.get('/api/v1/projects/', {'pagination': 'cursor', 'page_size': 5})
+        cursor = first.data['next'].split('cursor=')[1]
+        response = self.client.get('/api/v1/projects/', {'cursor': cursor, 'ordering': 'title'})
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class GitHubSyncTests(TestCase):
+    def setUp(self):
+        caches['throttle'].clear()
+        self.user = make_user('octo')
+        self.user.profile.github_url = 'https://github.com/octocat/'
+        self.user.profile.save()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        repos = [make_repo('octocat', n) for n in range(70)] + [make_repo('octocat', 'fork', fork=True)]
+        self.github = FakeGitHubServer({'octocat': repos}, per_page=30).start()
+        self.addCleanup(self.github.stop)
+
+    def sync(self):
+        with override_settings(GITHUB_API_URL=self.github.url), \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/v1/projects/sync_github/')
+        self.assertEqual(response.status_code, 202)
+        return self.client.get(f"/api/v1/projects/sync_github/{response.data['id']}/").data
+
+    def test_follows_pagination_and_skips_forks(self):
+        job = self.sync()
+
+        self.assertEqual(job['status'], GitHubSyncJob.Status.SUCCEEDED)
+        self.assertEqual(job['pages_fetched'], 3)
+        self.assertEqual(job['total_synced'], 70)
+        self.assertEqual(job['newly_created'], 70)
+        self.assertEqual(Project.objects.filter(profile=self.user.profile).count(), 70)
+
+    def test_second_sync_uses_conditional_requests(self):
+        self.sync()
+        job = self.sync()
+
+        self.assertEqual(job['status'], GitHubSyncJob.Status.SUCCEEDED)
+        self.assertEqual(job['pages_not_modified'], 3)
+        self.assertEqual(job['newly_created'], 0)
+        self.assertEqual(self.github.not_modified, 3)
+        self.assertEqual(Project.objects.count(), 70)
+
+    def test_changed_repos_are_updated(self):
+        self.sync()
+        self.github.repos_by_user['octocat'][0]['description'] = 'Updated'
+        job = self.sync()
+
+        self.assertEqual(job['pages_not_modified'], 2)
+        self.assertEqual(job['newly_created'], 0)
+        self.assertTrue(Project.objects.filter(description='Updated').exists())
+
+    def test_one_bulk_write_per_page(self):
+        job = GitHubSyncJob.objects.create(profile=self.user.profile, github_username='octocat')
+        with override_settings(GITHUB_API_URL=self.github.url), CaptureQueriesContext(connection) as ctx:
+            run_sync_job(job.pk)
+        project_writes = [
+            query['sql'] for query in ctx.captured_queries
+            if query['sql'].startswith(('INSERT INTO "portfolio_project"', 'UPDATE "portfolio_project"'))
+        ]
+        self.assertEqual(len(project_writes), 3)
+
+    def test_github_error_marks_job_failed(self):
+        self.user.profile.github_url = 'https://github.com/nobody/'
+        self.user.profile.save()
+        job = self.sync()
+        self.assertEqual(job['status'], GitHubSyncJob.Status.FAILED)
+        self.assertIn('404', job['error'])
+
+    def test_running_job_is_reused(self):
+        running = GitHubSyncJob.objects.create(profile=self.user.profile, github_username='octocat',
+                                               status=GitHubSyncJob.Status.RUNNING)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.post('/api/v1/projects/sync_github/')
+        self.assertEqual(response.data['id'], running.pk)
+        self.assertEqual(callbacks, [])
+        self.assertEqual(GitHubSyncJob.objects.count(), 1)
+
+    def test_active_job_is_checked_under_the_profile_lock(self):
+        events = []
+        select_for_update = QuerySet.select_for_update
+
+        def lock(queryset, *args, **kwargs):
+            events.append(('lock', queryset.model))
+            return select_for_update(queryset, *args, **kwargs)
+
+        def check(profile):
+            events.append(('check', profile.pk))
+            return None
+
+        with mock.patch.object(QuerySet, 'select_for_update', lock), \
+                mock.patch('portfolio.views.active_job', side_effect=check), \
+                self.captureOnCommitCallbacks():
+            self.client.post('/api/v1/projects/sync_github/')
+        self.assertEqual(events, [('lock', UserProfile), ('check', self.user.profile.pk)])
+
+    @override_settings(GITHUB_SYNC_STALE_AFTER=60)
+    def test_stale_job_is_failed_and_replaced(self):
+        # Воркер упав посеред синхронізації: статус лишився running
+        stale = GitHubSyncJob.objects.create(profile=self.user.profile, github_username='octocat',
+                                             status=GitHubSyncJob.Status.RUNNING)
+        GitHubSyncJob.objects.filter(pk=stale.pk).update(
+            updated_at=timezone.now() - datetime.timedelta(seconds=61))
+
+        job = self.sync()
+
+        self.assertNotEqual(job['id'], stale.pk)
+        self.assertEqual(job['status'], GitHubSyncJob.Status.SUCCEEDED)
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, GitHubSyncJob.Status.FAILED)
+        self.assertTrue(stale.error)
+        self.assertIsNotNone(stale.finished_at)
+
+    def test_progress_is_saved_after_each_page(self):
+        job = GitHubSyncJob.objects.create(profile=self.user.profile, github_username='octocat')
+        progress = []
+
+        def record(sender, instance, update_fields=None, **kwargs):
+            if update_fields and 'pages_fetched' in update_fields:
+                progress.append((instance.pages_fetched, 'updated_at' in update_fields))
+
+        post_save.connect(record, sender=GitHubSyncJob)
+        self.addCleanup(post_save.disconnect, record, sender=GitHubSyncJob)
+        with override_settings(GITHUB_API_URL=self.github.url):
+            run_sync_job(job.pk)
+        self.assertEqual(progress, [(1, True), (2, True), (3, True)])
+
+    def test_other_users_job_is_hidden(self):
+        job = GitHubSyncJob.objects.create(profile=make_user('other').profile, github_username='x')
+        response = self.client.get(f'/api/v1/projects/sync_github/{job.pk}/')
+        self.assertEqual(response.status_code, 404)
+
+
+class ProfileResponseCacheTests(TestCase):
+    def setUp(self):
+        caches['portfolio'].clear()
+        self.client = APIClient()
+        self.profile = make_user('alice').profile
+        self.project = make_project(self.profile, title='Cached')
+        self.url = '/api/v1/projects/?username=alice'
+
+    def test_second_anonymous_read_is_served_from_cache(self):
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(cache_stats(['projects'])['projects'], {'hit': 1, 'miss': 1})
+
+    def test_project_change_invalidates_profile_entries(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.title = 'Renamed'
+            self.project.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['title'], 'Renamed')
+
+    def test_technology_rename_invalidates_linked_profiles(self):
+        technology = Technology.objects.create(name='Django')
+        self.project.technologies.add(technology)
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            technology.name = 'Django 5'
+            technology.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['results'][0]['technologies'][0]['name'], 'Django 5')
+
+    def test_experience_is_cached_and_invalidated(self):
+        url = '/api/v1/experience/?username=alice'
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Experience.objects.create(profile=self.profile, company='ACME', role='Dev', start_date='2020-01-01')
+        self.assertEqual(len(self.client.get(url).data), 1)
+
+    def test_other_profiles_are_not_invalidated(self):
+        other = make_user('bob').profile
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            make_project(other)
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+
+    def test_portfolio_is_cached_and_invalidated(self):
+        url = '/api/v1/portfolio/alice/'
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(cache_stats(['portfolio'])['portfolio'], {'hit': 1, 'miss': 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.title = 'Renamed'
+            self.project.save()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['projects'][0]['title'], 'Renamed')
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.force_authenticate(self.profile.user)
+        self.client.get(self.url)
+        self.assertNotIn('X-Cache', self.client.get(self.url))
+
+    def test_endpoint_can_be_disabled(self):
+        with override_settings(PROFILE_CACHE={'ENDPOINTS': {'projects': False}}):
+            self.client.get(self.url)
+            self.assertNotIn('X-Cache', self.client.get(self.url))
+
+
+@override_settings(PROFILE_CACHE=NO_RESPONSE_CACHE)
+class PortfolioEndpointTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.profile = make_user('alice', first_name='Alice').profile
+        technologies = [Technology.objects.create(name=name) for name in ('Django', 'React')]
+        for i in range(20):
+            make_project(self.profile, title=f'Project {i}').technologies.set(technologies)
+        Experience.objects.create(profile=self.profile, company='ACME', role='Dev', start_date='2020-01-01')
+        Education.objects.create(profile=self.profile, institution='KPI', degree='BSc',
+                                 field_of_study='CS', start_date='2016-09-01')
+
+    def test_returns_all_sections_in_fixed_queries(self):
+        # профіль+користувач, проєкти, технології, досвід, освіта
+        with self.assertNumQueries(5):
+            response = self.client.get('/api/v1/portfolio/alice/', {'counts': 1})
+
+        data = response.data
+        self.assertEqual(data['profile']['user']['username'], 'alice')
+        self.assertEqual(len(data['projects']), 15)
+        self.assertEqual(data['projects'][0]['username'], 'alice')
+        self.assertEqual(len(data['projects'][0]['technologies']), 2)
+        self.assertEqual(len(data['experience']), 1)
+        self.assertEqual(len(data['education']), 1)
+        self.assertEqual(data['counts'], {'projects': 20, 'experience': 1, 'education': 1})
+
+    def test_projects_limit_and_no_counts_by_default(self):
+        response = self.client.get('/api/v1/portfolio/alice/', {'projects_limit': 3})
+        self.assertEqual(len(response.data['projects']), 3)
+        self.assertNotIn('counts', response.data)
+
+    def test_unknown_username(self):
+        self.assertEqual(self.client.get('/api/v1/portfolio/nobody/').status_code, 404)
+
+
+
+@override_settings(PROFILE_CACHE=NO_RESPONSE_CACHE)
+class PortfolioSnapshotTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.settings_override = override_settings(PORTFOLIO_SNAPSHOTS={
+            'DIR': self.root, 'DEBOUNCE': 0, 'BASE_URL': 'http://testserver',
+        })
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        self.profile = make_user('alice', first_name='Alice').profile
+        self.project = make_project(self.profile, title='Old title')
+        self.project.technologies.add(Technology.objects.create(name='Django'))
+        Experience.objects.create(profile=self.profile, company='ACME', role='Dev', start_date='2020-01-01')
+        self.path = f'{self.root}/portfolio/alice.json'
+
+    def read(self):
+        with open(self.path, 'rb') as f:
+            return json.loads(f.read())
+
+    def test_build_command_writes_the_live_response(self):
+        UserProfile.objects.filter(pk=self.profile.pk).update(
+            profile_picture='profile_pics/alice.png', resume_cv='resumes/alice.pdf')
+        live = self.client.get('/api/v1/portfolio/alice/', {'counts': 1}).json()
+        self.assertTrue(live['profile']['profile_picture'].startswith('http://testserver/media/'))
+        self.assertEqual(live['counts'], {'projects': 1, 'experience': 1, 'education': 0})
+        call_command('build_snapshots', stdout=io.StringIO(), stderr=io.StringIO())
+
+        self.assertEqual(self.read(), live)
+        self.assertEqual(self.client.get('/api/v1/portfolio/alice/', {'counts': 1})['X-Snapshot'], 'HIT')
+        with gzip.open(self.path + '.gz') as f:
+            self.assertEqual(json.loads(f.read()), live)
+
+    def test_serves_snapshot_without_queries(self):
+        call_command('build_snapshots', 'alice', stdout=io.StringIO())
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/v1/portfolio/alice/', {'counts': 1})
+        self.assertEqual(response['X-Snapshot'], 'HIT')
+        self.assertEqual(response.json()['projects'][0]['title'], 'Old title')
+
+        # Інші параметри, інша адреса і відсутній знімок — живі запити
+        self.assertNotIn('X-Snapshot', self.client.get('/api/v1/portfolio/alice/'))
+        self.assertNotIn('X-Snapshot', self.client.get('/api/v1/portfolio/alice/', {'counts': 1, 'projects_limit': 3}))
+        with override_settings(ALLOWED_HOSTS=['internal']):
+            response = self.client.get('/api/v1/portfolio/alice/', {'counts': 1}, HTTP_HOST='internal')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Snapshot', response)
+        make_user('bob')
+        response = self.client.get('/api/v1/portfolio/bob/', {'counts': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Snapshot', response)
+
+    def age_snapshot(self, seconds):
+        past = time.time() - seconds
+        os.utime(self.path, (past, past))
+
+    def test_snapshot_older_than_max_age_is_not_served(self):
+        call_command('build_snapshots', 'alice', stdout=io.StringIO())
+        Project.objects.filter(pk=self.project.pk).update(views=42)
+        self.age_snapshot(301)
+
+        response = self.client.get('/api/v1/portfolio/alice/', {'counts': 1})
+        self.assertNotIn('X-Snapshot', response)
+        self.assertEqual(response.json()['projects'][0]['views'], 42)
+        # Перегенеровано (DEBOUNCE = 0 — одразу)
+        response = self.client.get('/api/v1/portfolio/alice/', {'counts': 1})
+        self.assertEqual(response['X-Snapshot'], 'HIT')
+        self.assertEqual(response.json()['projects'][0]['views'], 42)
+
+    def test_view_count_flush_refreshes_old_snapshots(self):
+        caches['counters'].clear()
+        view_counter.local.drain()
+        call_command('build_snapshots', 'alice', stdout=io.StringIO())
+
+        # Свіжий знімок не перерендерюється після кожного скидання
+        view_counter.record(self.project.pk, 'visitor-1')
+        view_counter.flush()
+        self.assertEqual(self.read()['projects'][0]['views'], 0)
+
+        self.age_snapshot(61)
+        view_counter.record(self.project.pk, 'visitor-2')
+        view_counter.flush()
+        self.assertEqual(self.read()['projects'][0]['views'], 2)
+
+    def test_change_regenerates_only_the_affected_snapshot(self):
+        make_user('bob')
+        call_command('build_snapshots', stdout=io.StringIO(), stderr=io.StringIO())
+        bob_path = f'{self.root}/portfolio/bob.json'
+        with open(bob_path, 'rb') as f:
+            bob_before = f.read()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.title = 'New title'
+            self.project.save()
+
+        self.assertEqual(self.read()['projects'][0]['title'], 'New title')
+        with open(bob_path, 'rb') as f:
+            self.assertEqual(f.read(), bob_before)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Education.objects.create(profile=self.profile, institution='KPI', degree='BSc',
+                                     field_of_study='CS', start_date='2016-09-01')
+        self.assertEqual(len(self.read()['education']), 1)
+
+    def test_burst_of_edits_is_debounced(self):
+        call_command('build_snapshots', 'alice', stdout=io.StringIO())
+        with override_settings(PORTFOLIO_SNAPSHOTS={'DIR': self.root, 'DEBOUNCE': 60, 'BASE_URL': 'http://testserver'}), \
+                mock.patch.object(snapshot_scheduler, '_ensure_worker'), \
+                mock.patch.object(snapshots, 'regenerate', wraps=snapshots.regenerate) as regenerate:
+            for i in range(3):
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.project.title = f'Edit {i}'
+                    self.project.save()
+            # Застарілий знімок прибрано одразу — відповідає Django
+            response = self.client.get('/api/v1/portfolio/alice/', {'counts': 1})
+            self.assertNotIn('X-Snapshot', response)
+            self.assertEqual(response.json()['projects'][0]['title'], 'Edit 2')
+            self.assertEqual(snapshot_scheduler.pending(), {'alice'})
+            regenerate.assert_not_called()
+
+            snapshot_scheduler.flush()
+        regenerate.assert_called_once_with({'alice'})
+        self.assertEqual(self.read()['projects'][0]['title'], 'Edit 2')
+
+    def test_deadlines(self):
+        scheduler = SnapshotScheduler()
+        with override_settings(PORTFOLIO_SNAPSHOTS={'DIR': self.root, 'DEBOUNCE': 2, 'MAX_DELAY': 30}), \
+                mock.patch('portfolio.snapshots.time.monotonic', return_value=100):
+            scheduler._pending = {
+                'quiet': (90, 97),       # 3 с без змін
+                'busy': (60, 99.5),      # зміни тривають, але MAX_DELAY минув
+                'recent': (95, 99),
+            }
+            due, wait = scheduler._take_due()
+        self.assertEqual(due, {'quiet', 'busy'})
+        self.assertEqual(wait, 1)
+        self.assertEqual(set(scheduler._pending), {'recent'})
+
+    def test_deleted_and_renamed_users_lose_their_snapshots(self):
+        bob = make_user('bob')
+        call_command('build_snapshots', stdout=io.StringIO(), stderr=io.StringIO())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user = self.profile.user
+            user.username = 'alice2'
+            user.save()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertTrue(os.path.exists(f'{self.root}/portfolio/alice2.json'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bob.delete()
+        self.assertFalse(os.path.exists(f'{self.root}/portfolio/bob.json'))
+        self.assertFalse(os.path.exists(f'{self.root}/portfolio/bob.json.gz'))
+
+
+
+def make_image(name='cover.png', size=(800, 600)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'teal').save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True, IMAGE_VARIANTS={'WIDTHS': [320, 640, 1280], 'FORMATS': ['webp']})
+class ImageVariantTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.profile = make_user('alice').profile
+
+    def test_upload_generates_variants_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            project = make_project(self.profile, image=make_image())
+
+        project.refresh_from_db()
+        self.assertEqual(project.image_variants['source'], project.image.name)
+        # 1280 ширше за оригінал (800) — не генерується
+        self.assertEqual(sorted(project.image_variants['webp'], key=int), ['320', '640'])
+        with project.image.storage.open(project.image_variants['webp']['320']) as variant:
+            self.assertEqual(Image.open(variant).size, (320, 240))
+
+        data = APIClient().get(f'/api/v1/projects/{project.pk}/').data
+        self.assertRegex(data['image_srcset']['webp'], r'^http://testserver/media/.+-320w\.[0-9a-f]{16}\.webp 320w, .+-640w\.[0-9a-f]{16}\.webp 640w$')
+
+    def test_replacing_image_drops_old_variants(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            project = make_project(self.profile, image=make_image())
+        project.refresh_from_db()
+        old_variant = project.image_variants['webp']['320']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            project.image = make_image('new.png', size=(400, 400))
+            project.save()
+
+        project.refresh_from_db()
+        self.assertEqual(list(project.image_variants['webp']), ['320'])
+        self.assertFalse(project.image.storage.exists(old_variant))
+
+    def test_backfill_command_is_resumable(self):
+        projects = [make_project(self.profile, image=make_image(f'{i}.png')) for i in range(3)]
+        checkpoint = f'{tempfile.mkdtemp()}/checkpoint.json'
+        out = io.StringIO()
+
+        call_command('generate_image_variants', '--only', 'projects', '--workers', '1',
+                     '--checkpoint', checkpoint, stdout=out)
+        self.assertIn('processed 3', out.getvalue())
+        for project in projects:
+            project.refresh_from_db()
+            self.assertIn('webp', project.image_variants)
+
+        call_command('generate_image_variants', '--only', 'projects', '--checkpoint', checkpoint, stdout=out)
+        self.assertIn('processed 0, already up to date 0', out.getvalue())
+        call_command('generate_image_variants', '--only', 'projects', '--restart',
+                     '--checkpoint', checkpoint, stdout=out)
+        self.assertIn('processed 0, already up to date 3', out.getvalue())
+
+
+class HotPathIndexTests(TestCase):
+    def test_github_link_is_unique_per_profile(self):
+        alice, bob = make_user('alice').profile, make_user('bob').profile
+        link = 'https://github.com/alice/repo'
+        make_project(alice, github_link=link)
+        make_project(bob, github_link=link)
+        # Ручні проєкти без посилання ключ не обмежує
+        for _ in range(2):
+            make_project(alice, github_link=None)
+            make_project(alice, github_link='')
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            make_project(alice, github_link=link)
+
+    def test_duplicate_github_link_is_a_validation_error(self):
+        user = make_user('alice')
+        link = 'https://github.com/alice/repo'
+        existing = make_project(user.profile, github_link=link)
+        other = make_project(user.profile, github_link='https://github.com/alice/other')
+        make_project(make_user('bob').profile, github_link='https://github.com/bob/repo')
+        client = APIClient()
+        client.force_authenticate(user)
+
+        response = client.post('/api/v1/projects/', {'title': 'Copy', 'description': 'Text', 'github_link': link})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('github_link', response.data)
+        response = client.patch(f'/api/v1/projects/{other.pk}/', {'github_link': link})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('github_link', response.data)
+
+        # Своє ж посилання і чуже посилання з іншого профілю — дозволені
+        self.assertEqual(client.patch(f'/api/v1/projects/{existing.pk}/', {'github_link': link}).status_code, 200)
+        response = client.post('/api/v1/projects/', {'title': 'Fork', 'description': 'Text',
+                                                     'github_link': 'https://github.com/bob/repo'})
+        self.assertEqual(response.status_code, 201)
+
+        # Перевірку серіалізатора пройшли два одночасні запити: другий відхиляє ключ у БД
+        with mock.patch.object(ProjectSerializer, 'validate_github_link', lambda self, value: value):
+            response = client.post('/api/v1/projects/', {'title': 'Race', 'description': 'Text',
+                                                         'github_link': link})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('github_link', response.data)
+        self.assertEqual(Project.objects.filter(github_link=link).count(), 1)
+
+    def test_seed_and_benchmark_on_current_schema(self):
+        totals = seed(profiles=4, projects=3, batch_size=3)
+        self.assertEqual(totals, {'profiles': 4, 'projects': 12, 'experience': 12, 'education': 8})
+        self.assertEqual(Project.objects.filter(profile__user__username='seed_3').count(), 3)
+
+        out = io.StringIO()
+        call_command('benchmark_indexes', '--no-seed', '--no-migrate', '--repeat', '2', stdout=out)
+        for name in ('project_feed', 'projects_by_username', 'github_link_lookup',
+                     'experience_by_username', 'education_by_username'):
+            self.assertIn(f'{name}: p50', out.getvalue())
+
+        clear_seeded()
+        self.assertFalse(Project.objects.exists())
+
+
+class BenchmarkSuiteTests(TestCase):
+    def test_percentile_is_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual([percentile(values, p) for p in (50, 95, 99, 100)], [50, 95, 99, 100])
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertIsNone(percentile([], 50))
+
+    def test_benchmark_covers_router_and_reports_json(self):
+        call_command('seed_data', '--users', '3', '--projects', '2', stdout=io.StringIO())
+        out, err = io.StringIO(), io.StringIO()
+        call_command('benchmark_api', '--requests', '2', '--warmup', '0', '--no-cache',
+                     '--github-repos', '3', stdout=out, stderr=err)
+
+        self.assertNotIn('without scenarios', err.getvalue())
+        report = json.loads(out.getvalue())
+        # сід, користувач бенчмарку і двоє зареєстрованих сценарієм register
+        self.assertEqual(report['meta']['rows']['users'], 3 + 1 + 2)
+        endpoints = report['endpoints']
+        self.assertTrue({'projects-list', 'token-obtain', 'projects-sync-github', 'portfolio'} <= set(endpoints))
+        for name, result in endpoints.items():
+            self.assertEqual(result['errors'], 0, name)
+            self.assertEqual(result['requests'], 2)
+            self.assertEqual(set(result['latency_ms']), {'mean', 'p50', 'p95', 'p99', 'max'})
+        self.assertEqual(endpoints['projects-list']['queries']['max'], 3)
+        self.assertEqual(endpoints['register']['writes']['max'], 2)
+        self.assertEqual(endpoints['projects-update']['writes']['max'], 0)
+
+
+@override_settings(PROFILE_CACHE=NO_RESPONSE_CACHE)
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        caches['throttle'].clear()
+        self.client = APIClient()
+        self.profile = make_user('alice').profile
+        for i in range(3):
+            make_project(self.profile, title=f'Project {i}')
+
+    def metric_value(self, body, line_prefix):
+        for line in body.splitlines():
+            if line.startswith(line_prefix):
+                return float(line.rsplit(' ', 1)[1])
+        return 0
+
+    @override_settings(METRICS={'ALLOWED_IPS': ['127.0.0.1']})
+    def test_server_timing_and_prometheus_histograms(self):
+        before = self.client.get('/metrics/').content.decode()
+        labels = '{view="ProjectViewSet.list",method="GET"}'
+        count_before = self.metric_value(before, f'http_request_duration_seconds_count{labels}')
+
+        response = self.client.get('/api/v1/projects/?username=alice')
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(
+            response['Server-Timing'],
+            r'^db;dur=[\d.]+;desc="3 queries", serialize;dur=[\d.]+, total;dur=[\d.]+$',
+        )
+        self.client.post(f'/api/v1/projects/{self.profile.projects.first().pk}/increment_views/')
+
+        body = self.client.get('/metrics/').content.decode()
+        self.assertEqual(self.metric_value(body, f'http_request_duration_seconds_count{labels}'), count_before + 1)
+        self.assertIn('# TYPE http_request_db_queries histogram', body)
+        self.assertIn('http_request_db_queries_bucket{view="ProjectViewSet.list",method="GET",le="3"}', body)
+        self.assertIn('http_request_serializer_duration_seconds_sum{view="ProjectViewSet.list"', body)
+        self.assertIn('http_response_size_bytes_count{view="ProjectViewSet.list"', body)
+        self.assertIn('http_requests_total{view="ProjectViewSet.increment_views",method="POST",status="200"}', body)
+
+    @override_settings(METRICS={'ALLOWED_IPS': ['127.0.0.1']})
+    async def test_async_views_count_queries(self):
+        labels = '{view="ProjectListView.get",method="GET"}'
+        before = (await self.async_client.get('/metrics/')).content.decode()
+        count_before = self.metric_value(before, f'http_request_db_queries_count{labels}')
+        sum_before = self.metric_value(before, f'http_request_db_queries_sum{labels}')
+
+        response = await self.async_client.get('/api/v1/async/projects/?username=alice')
+        self.assertEqual(response.status_code, 200)
+        # Запити виконуються в потоці sync_to_async, а не в циклі подій
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="3 queries"')
+
+        body = (await self.async_client.get('/metrics/')).content.decode()
+        self.assertEqual(self.metric_value(body, f'http_request_db_queries_count{labels}'), count_before + 1)
+        self.assertEqual(self.metric_value(body, f'http_request_db_queries_sum{labels}'), sum_before + 3)
+
+    @override_settings(METRICS={'ALLOWED_IPS': ['127.0.0.1']})
+    def test_unknown_methods_share_one_series(self):
+        for method in ('FOO', 'BAR'):
+            self.client.generic(method, '/api/v1/projects/')
+        body = self.client.get('/metrics/').content.decode()
+        self.assertNotIn('FOO', body)
+        self.assertNotIn('foo', body)
+        labels = '{view="ProjectViewSet.other",method="other"}'
+        self.assertGreaterEqual(self.metric_value(body, f'http_request_duration_seconds_count{labels}'), 2)
+
+    def test_metrics_endpoint_access(self):
+        # Без токена й списку адрес — лише з DEBUG
+        self.assertEqual(self.client.get('/metrics/').status_code, 403)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get('/metrics/').status_code, 200)
+
+        with override_settings(METRICS={'TOKEN': 'secret'}, DEBUG=True):
+            self.assertEqual(self.client.get('/metrics/').status_code, 403)
+            self.assertEqual(self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+            response = self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer secret')
+            self.assertEqual(response.status_code, 200)
+
+        with override_settings(METRICS={'ALLOWED_IPS': ['10.0.0.5', '192.168.0.0/16']}):
+            self.assertEqual(self.client.get('/metrics/', REMOTE_ADDR='192.168.3.4').status_code, 200)
+            self.assertEqual(self.client.get('/metrics/', REMOTE_ADDR='10.0.0.5').status_code, 200)
+            self.assertEqual(self.client.get('/metrics/', REMOTE_ADDR='10.0.0.6').status_code, 403)
+
+    @override_settings(METRICS={'ENABLED': False})
+    def test_disabled(self):
+        response = self.client.get('/api/v1/projects/')
+        self.assertNotIn('Server-Timing', response)
+
+
+class TechnologyAutocompleteTests(TestCase):
+    url = '/api/v1/technologies/autocomplete/'
+
+    def setUp(self):
+        self.client = APIClient()
+        profile = make_user('alice').profile
+        self.tech = {name: Technology.objects.create(name=name)
+                     for name in ['Python', 'PyTorch', 'PostgreSQL', 'Node.js', 'React Native']}
+        for i, names in enumerate([['Python', 'PyTorch'], ['Python'], ['PostgreSQL']]):
+            make_project(profile, title=f'P{i}').technologies.set([self.tech[name] for name in names])
+        technology_index.rebuild()
+
+    def names(self, **params):
+        return [item['name'] for item in self.client.get(self.url, params).data]
+
+    def test_prefix_matches_ranked_by_usage_without_queries(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'q': 'p'})
+        self.assertEqual(response.data[0], {'id': self.tech['Python'].pk, 'name': 'Python', 'projects_count': 2})
+        self.assertEqual([item['name'] for item in response.data], ['Python', 'PostgreSQL', 'PyTorch'])
+        self.assertEqual(self.names(q='PY'), ['Python', 'PyTorch'])
+        # Префікс будь-якого слова в назві
+        self.assertEqual(self.names(q='js'), ['Node.js'])
+        self.assertEqual(self.names(q='nat'), ['React Native'])
+        self.assertEqual(self.names(q='p', limit=1), ['Python'])
+        self.assertEqual(self.names(q='zzz'), [])
+
+    def test_index_is_updated_incrementally(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            pandas = Technology.objects.create(name='Pandas')
+            project = make_project(make_user('bob').profile)
+            project.technologies.set([pandas, self.tech['PyTorch']])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tech['PostgreSQL'].name = 'Postgres'
+            self.tech['PostgreSQL'].save()
+            self.tech['React Native'].delete()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names(q='p'), ['Python', 'PyTorch', 'Pandas', 'Postgres'])
+        self.assertEqual(self.names(q='postgresql'), [])
+        self.assertEqual(self.names(q='nat'), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            project.delete()
+        self.assertEqual(self.names(q='py'), ['Python', 'PyTorch'])
+
+    @override_settings(TECHNOLOGY_AUTOCOMPLETE={'REBUILD_INTERVAL': 0})
+    def test_stale_index_is_rebuilt_in_the_background(self):
+        Technology.objects.bulk_create([Technology(name='Perl')])
+        with mock.patch('portfolio.autocomplete.submit') as submit:
+            # Запит не чекає перебудови, друга задача не ставиться
+            self.assertEqual(self.names(q='pe'), [])
+            self.assertEqual(self.names(q='pe'), [])
+        submit.assert_called_once()
+        submit.call_args.args[0]()
+        self.assertEqual(self.names(q='pe'), ['Perl'])
+
+    def test_changes_during_rebuild_are_replayed(self):
+        annotate = Technology.objects.annotate
+        perl = Technology.objects.create(name='Perl')
+
+        def annotate_and_change(*args, **kwargs):
+            # Зміни з інших потоків, поки rebuild() читає БД
+            technology_index.upsert(perl.pk, 'Perl 6')
+            technology_index.add_usage({self.tech['PostgreSQL'].pk: 4})
+            return annotate(*args, **kwargs)
+
+        with mock.patch.object(Technology.objects, 'annotate', annotate_and_change):
+            technology_index.rebuild()
+        self.assertEqual(self.client.get(self.url, {'q': 'p'}).data[0]['name'], 'PostgreSQL')
+        self.assertEqual(self.names(q='6'), ['Perl 6'])
+
+
+@override_settings(PROFILE_CACHE=NO_RESPONSE_CACHE)
+class BulkWriteTests(TestCase):
+    def setUp(self):
+        self.user = make_user('alice')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.technologies = [Technology.objects.create(name=f'tech-{i}') for i in range(5)]
+        self.url = '/api/v1/projects/bulk/'
+
+    def test_bulk_create_500_projects_in_a_handful_of_queries(self):
+        tech_ids = [tech.pk for tech in self.technologies]
+        payload = [
+            {'title': f'Project {i}', 'description': 'Text', 'github_link': f'https://github.com/alice/r{i}',
+             'technology_ids': tech_ids[i % 5:i % 5 + 2]}
+            for i in range(500)
+        ]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertLessEqual(len(ctx.captured_queries), 15)
+
+        self.assertEqual([item['title'] for item in response.data[:3]], ['Project 0', 'Project 1', 'Project 2'])
+        self.assertEqual(Project.objects.filter(profile=self.user.profile).count(), 500)
+        self.assertEqual(Project.technologies.through.objects.count(), 500 + 400)
+        self.assertEqual([tech['id'] for tech in response.data[4]['technologies']], tech_ids[4:5])
+
+    def test_errors_are_reported_per_item_and_nothing_is_written(self):
+        make_project(self.user.profile, github_link='https://github.com/alice/taken')
+        payload = [
+            {'title': 'Ok', 'description': 'Text'},
+            {'description': 'No title'},
+            {'title': 'Bad tech', 'description': 'Text', 'technology_ids': [999]},
+            {'title': 'Taken', 'description': 'Text', 'github_link': 'https://github.com/alice/taken'},
+        ]
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('title', response.data[1])
+        self.assertEqual(len(response.data), 4)
+
+        # Перевірки, що потребують БД, — лише коли всі елементи валідні поодинці
+        response = self.client.post(self.url, [payload[0], payload[2], payload[3]], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('technology_ids', response.data[1])
+        self.assertIn('github_link', response.data[2])
+        self.assertEqual(Project.objects.count(), 1)
+
+    def test_bulk_update_and_delete_only_own_records(self):
+        mine = [make_project(self.user.profile, title=f'Mine {i}') for i in range(3)]
+        other = make_project(make_user('bob').profile, title='Bob')
+
+        response = self.client.patch(self.url, [
+            {'id': mine[0].pk, 'title': 'Renamed', 'technology_ids': [self.technologies[0].pk]},
+            {'id': mine[1].pk, 'description': 'New text'},
+        ], format='json')
+        self.assertEqual(response.status_code, 200)
+        mine[0].refresh_from_db()
+        self.assertEqual(mine[0].title, 'Renamed')
+        self.assertEqual(list(mine[0].technologies.values_list('pk', flat=True)), [self.technologies[0].pk])
+
+        response = self.client.patch(self.url, [{'id': other.pk, 'title': 'Hacked'}], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('id', response.data[0])
+
+        response = self.client.delete(self.url, {'ids': [mine[0].pk, other.pk]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['ids'][0], {})
+
+        with self.assertNumQueries(9):
+            response = self.client.delete(self.url, {'ids': [project.pk for project in mine]}, format='json')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(list(Project.objects.values_list('title', flat=True)), ['Bob'])
+
+    def test_bulk_update_can_swap_github_links(self):
+        links = [f'https://github.com/alice/r{i}' for i in range(3)]
+        first, second, third = [make_project(self.user.profile, github_link=link) for link in links]
+
+        response = self.client.patch(self.url, [
+            {'id': first.pk, 'github_link': links[1]},
+            {'id': second.pk, 'github_link': links[0]},
+        ], format='json')
+        self.assertEqual(response.status_code, 200)
+        # Посилання третього проєкту звільняється в тому ж пакеті
+        response = self.client.patch(self.url, [
+            {'id': first.pk, 'github_link': links[2]},
+            {'id': third.pk, 'github_link': 'https://github.com/alice/new'},
+        ], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            dict(Project.objects.values_list('pk', 'github_link')),
+            {first.pk: links[2], second.pk: links[0], third.pk: 'https://github.com/alice/new'},
+        )
+
+        # Посилання лишається за проєктом поза пакетом або за елементом без github_link
+        for payload in (
+            [{'id': first.pk, 'github_link': links[0]}],
+            [{'id': first.pk, 'github_link': links[0]}, {'id': second.pk, 'title': 'Renamed'}],
+            [{'id': first.pk, 'github_link': links[1]}, {'id': second.pk, 'github_link': links[1]}],
+        ):
+            response = self.client.patch(self.url, payload, format='json')
+            self.assertEqual(response.status_code, 400, payload)
+            self.assertIn('github_link', response.data[0] or response.data[1])
+
+    def test_concurrent_duplicate_links_are_validation_errors(self):
+        # Інший запит записав посилання вже після bulk_validate цього пакета
+        links = ['https://github.com/alice/a', 'https://github.com/alice/b']
+        project = make_project(self.user.profile, github_link=links[0])
+        bulk_validate = ProjectSerializer.bulk_validate
+        calls = []
+
+        def validate_late(serializer, attrs_list, instances=None):
+            calls.append(len(attrs_list))
+            if len(calls) == 1:
+                return [{} for _ in attrs_list]
+            return bulk_validate(serializer, attrs_list, instances)
+
+        with mock.patch.object(ProjectSerializer, 'bulk_validate', validate_late):
+            response = self.client.post(self.url, [
+                {'title': 'New', 'description': 'Text', 'github_link': links[1]},
+                {'title': 'Copy', 'description': 'Text', 'github_link': links[0]},
+            ], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('github_link', response.data[1])
+        self.assertEqual(Project.objects.count(), 1)
+
+        other = make_project(self.user.profile, github_link=links[1])
+        calls.clear()
+        with mock.patch.object(ProjectSerializer, 'bulk_validate', validate_late):
+            response = self.client.patch(self.url, [{'id': other.pk, 'github_link': links[0]}], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('github_link', response.data[0])
+        self.assertEqual(dict(Project.objects.values_list('pk', 'github_link')),
+                         {project.pk: links[0], other.pk: links[1]})
+
+    def test_bulk_experience_and_education(self):
+        response = self.client.post('/api/v1/experience/bulk/', [
+            {'company': f'Company {i}', 'role': 'Dev', 'start_date': f'202{i}-01-01'} for i in range(3)
+        ], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Experience.objects.filter(profile=self.user.profile).count(), 3)
+
+        response = self.client.post('/api/v1/education/bulk/', [
+            {'institution': 'KPI', 'degree': 'BSc', 'field_of_study': 'CS', 'start_date': '2015-09-01'},
+            {'institution': 'KPI', 'degree': 'MSc', 'field_of_study': 'CS'},
+        ], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('start_date', response.data[1])
+
+
+@override_settings(VIEW_COUNTER={'FLUSH_INTERVAL': 0}, TRENDING={'HALF_LIFE': 24 * 60 * 60})
+class TrendingLeaderboardTests(TestCase):
+    def setUp(self):
+        caches['counters'].clear()
+        view_counter.local.drain()
+        self.python = Technology.objects.create(name='Python')
+        profile = make_user('alice').profile
+        self.old = make_project(profile, title='Old hit', views=1000)
+        self.fresh = make_project(profile, title='Fresh')
+        self.fresh.technologies.add(self.python)
+        rebuild()
+        self.client = APIClient()
+
+    def titles(self, url='/api/v1/projects/trending/'):
+        return [item['title'] for item in self.client.get(url).data]
+
+    def test_recent_views_outrank_old_lifetime_views(self):
+        self.assertEqual(self.titles(), ['Old hit', 'Fresh'])
+
+        # Через 4 періоди напіврозпаду 1000 давніх переглядів важать як ~62 нових
+        later = timezone.now() + datetime.timedelta(days=4)
+        record_views({self.fresh.pk: 100}, now=later)
+        self.assertEqual(self.titles(), ['Fresh', 'Old hit'])
+        self.assertEqual(self.titles(f'/api/v1/projects/trending/?technology={self.python.pk}'), ['Fresh'])
+
+        record_views({self.old.pk: 1}, now=later)
+        self.assertEqual(TrendingProject.objects.get(project=self.old, technology=None).views, 1001)
+
+    def test_flush_updates_scores_and_creates_missing_rows(self):
+        TrendingProject.objects.filter(project=self.fresh).delete()
+        for visitor in range(5):
+            view_counter.record(self.fresh.pk, f'visitor-{visitor}')
+        view_counter.flush()
+
+        rows = TrendingProject.objects.filter(project=self.fresh)
+        self.assertEqual(sorted(rows.values_list('technology_id', flat=True), key=str), [self.python.pk, None])
+        self.assertEqual(set(rows.values_list('views', flat=True)), {5})
+
+    def test_top_n_is_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/v1/projects/trending/?technology={self.python.pk}&limit=5')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['id'], self.fresh.pk)
+        self.assertEqual(set(response.data[0]), {'id', 'title', 'username', 'views', 'score'})
+
+        response = self.client.get('/api/v1/projects/trending/?technology=python')
+        self.assertEqual(response.status_code, 400)
+
+    def test_rows_follow_project_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.fresh.technologies.remove(self.python)
+            self.old.title = 'Renamed'
+            self.old.save()
+            created = make_project(self.old.profile, title='Brand new')
+        self.assertFalse(TrendingProject.objects.filter(technology=self.python).exists())
+        self.assertTrue(TrendingProject.objects.filter(project=self.old, title='Renamed').exists())
+        self.assertIn('Brand new', self.titles())
+
+        user = self.old.profile.user
+        user.username = 'alice2'
+        user.save()
+        self.assertEqual(set(TrendingProject.objects.values_list('username', flat=True)), {'alice2'})
+
+        created.delete()
+        self.assertNotIn('Brand new', self.titles())
+
+    @override_settings(TRENDING={'BATCH_SIZE': 1})
+    def test_failed_rebuild_keeps_the_old_leaderboard(self):
+        before = set(TrendingProject.objects.values_list('pk', 'score'))
+        with mock.patch('portfolio.trending.sync_projects', side_effect=[None, DatabaseError]):
+            with self.assertRaises(DatabaseError):
+                rebuild()
+        self.assertEqual(set(TrendingProject.objects.values_list('pk', 'score')), before)
+        self.assertEqual(self.titles(), ['Old hit', 'Fresh'])
+
+
+@override_settings(PROFILE_CACHE=NO_RESPONSE_CACHE)
+class AsyncReadPathTests(TestCase):
+    def setUp(self):
+        profile = make_user('alice', first_name='Alice').profile
+        python = Technology.objects.create(name='Python')
+        for i in range(20):
+            make_project(profile, title=f'Project {i}', views=i).technologies.add(python)
+        make_project(make_user('bob').profile, title='Bob project')
+        self.experience = Experience.objects.create(
+            profile=profile, company='ACME', role='Dev', start_date='2020-01-01'
+        )
+        Education.objects.create(profile=profile, institution='KPI', degree='BSc', field_of_study='CS',
+                                 start_date='2015-09-01')
+
+    def assertSameAsSync(self, path):
+        expected = APIClient().get(f'/api/v1/{path}')
+        response = async_to_sync(AsyncClient().get)(f'/api/v1/async/{path}')
+        self.assertEqual(response.status_code, expected.status_code, path)
+        data = response.json()
+        expected = json.loads(expected.content)
+        if isinstance(expected, dict) and 'results' in expected:
+            self.assertEqual(data.get('count'), expected.get('count'), path)
+            # Шляхи різні (/async/), параметри (сторінка, курсор) — ті самі
+            for link in ('next', 'previous'):
+                self.assertEqual(data[link] and urlparse(data[link]).query,
+                                 expected[link] and urlparse(expected[link]).query, path)
+            self.assertEqual(data['results'], expected['results'], path)
+        else:
+            self.assertEqual(data, expected, path)
+        return data, expected
+
+    def test_responses_match_sync_views(self):
+        project = Project.objects.get(title='Project 3')
+        for path in [
+            'projects/', 'projects/?page=2', 'projects/?username=alice&page_size=5',
+            'projects/?ordering=title', f'projects/{project.pk}/', 'projects/999999/',
+            'profiles/by-username/alice/', 'profiles/by-username/nobody/',
+            'experience/?username=alice', 'experience/', f'experience/{self.experience.pk}/?username=alice',
+            'education/', 'technologies/', 'technologies/?search=pyt',
+            'projects/?search=project%201', 'projects/?search=python&ordering=title&username=alice',
+            'projects/?search=project&search_mode=simple&page=2', 'projects/?search=nothing-like-it',
+            'projects/?cursor=garbage',
+        ]:
+            self.assertSameAsSync(path)
+
+    def test_cursor_pagination_matches_sync_views(self):
+        path = 'projects/?pagination=cursor&page_size=6&ordering=-views,title'
+        pages = 0
+        while path:
+            data, expected = self.assertSameAsSync(path)
+            self.assertNotIn('count', data)
+            pages += 1
+            path = expected['next'] and 'projects/?' + urlparse(expected['next']).query
+        self.assertEqual(pages, 4)
+
+    def test_list_queries_run_outside_the_event_loop(self):
+        # SynchronousOnlyOperation, якби серіалізатор звернувся до БД сам
+        with CaptureQueriesContext(connection) as ctx:
+            response = async_to_sync(AsyncClient().get)('/api/v1/async/projects/?username=alice')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 20)
+        # count, сторінка з профілями й користувачами, технології
+        self.assertEqual(len(ctx.captured_queries), 3)
+
+    @override_settings(PROFILE_CACHE={})
+    async def test_profile_responses_are_cached(self):
+        first = await self.async_client.get('/api/v1/async/profiles/by-username/alice/')
+        second = await self.async_client.get('/api/v1/async/profiles/by-username/alice/')
+        self.assertEqual((first['X-Cache'], second['X-Cache']), ('MISS', 'HIT'))
+        self.assertEqual(first.content, second.content)
+
+    def test_concurrency_benchmark_drives_both_stacks(self):
+        asgi = async_to_sync(ConcurrencyBenchmark(requests=6, concurrency=3).run_asgi)(
+            Scenario('projects', 'get', '/api/v1/async/projects/')
+        )
+        wsgi = ConcurrencyBenchmark(requests=4, concurrency=1).run_wsgi(
+            Scenario('projects', 'get', '/api/v1/projects/')
+        )
+        self.assertEqual((asgi['status_codes'], asgi['errors']), ({'200': 6}, 0))
+        self.assertEqual((wsgi['status_codes'], wsgi['errors']), ({'200': 4}, 0))
+
+
+class AsyncGitHubClientTests(TestCase):
+    def setUp(self):
+        self.profile = make_user('octo').profile
+        repos = [make_repo('octocat', n) for n in range(95)]
+        self.github = FakeGitHubServer({'octocat': repos}, per_page=30).start()
+        self.addCleanup(self.github.stop)
+
+    def sync(self):
+        job = GitHubSyncJob.objects.create(profile=self.profile, github_username='octocat')
+        client = AsyncGitHubClient(base_url=self.github.url, concurrency=3)
+        return async_to_sync(arun_sync_job)(job.pk, client=client)
+
+    def test_remaining_pages_are_requested_from_the_last_link(self):
+        job = self.sync()
+
+        self.assertEqual(job.status, GitHubSyncJob.Status.SUCCEEDED)
+        self.assertEqual((job.pages_fetched, job.newly_created), (4, 95))
+        self.assertEqual(Project.objects.filter(profile=self.profile).count(), 95)
+        pages = sorted(parse_qs(urlparse(path).query).get('page', ['1'])[0] for path in self.github.requests)
+        self.assertEqual(pages, ['1', '2', '3', '4'])
+
+    def test_second_sync_is_conditional(self):
+        self.sync()
+        job = self.sync()
+        self.assertEqual((job.pages_fetched, job.pages_not_modified, job.newly_created), (4, 4, 0))
+
+    def test_github_error_marks_job_failed(self):
+        self.github.repos_by_user.clear()
+        job = self.sync()
+        self.assertEqual(job.status, GitHubSyncJob.Status.FAILED)
+        self.assertIn('404', job.error)
+
+
+@override_settings(PROFILE_CACHE=NO_RESPONSE_CACHE)
+class DirtyFieldTrackingTests(TestCase):
+    def setUp(self):
+        self.user = make_user('alice')
+        self.project = make_project(self.user.profile, title='Old', description='Text')
+
+    def writes(self, queries):
+        return [q['sql'] for q in queries if q['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))]
+
+    def test_unchanged_instance_is_not_written(self):
+        project = Project.objects.get(pk=self.project.pk)
+        with self.assertNumQueries(0):
+            project.save()
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.patch(f'/api/v1/projects/{project.pk}/', {'title': 'Old'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.writes(ctx.captured_queries), [])
+
+    def test_only_changed_columns_are_written(self):
+        project = Project.objects.get(pk=self.project.pk)
+        project.title = 'New'
+        self.assertEqual(project.get_dirty_fields(), ['title'])
+        with CaptureQueriesContext(connection) as ctx:
+            project.save()
+        [update] = self.writes(ctx.captured_queries)
+        self.assertIn('"title"', update)
+        self.assertNotIn('"description"', update)
+        self.assertFalse(project.is_dirty())
+        self.assertEqual(Project.objects.get(pk=project.pk).title, 'New')
+
+    def test_in_place_json_change_and_deferred_fields(self):
+        project = Project.objects.get(pk=self.project.pk)
+        project.image_variants['webp'] = {}
+        self.assertEqual(project.get_dirty_fields(), ['image_variants'])
+
+        project = Project.objects.only('title').get(pk=self.project.pk)
+        self.assertEqual(project.description, 'Text')
+        self.assertFalse(project.is_dirty())
+        project.description = 'Changed'
+        self.assertEqual(project.get_dirty_fields(), ['description'])
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    def setUp(self):
+        caches['throttle'].clear()
+        patcher = mock.patch('config.db_router.replica_aliases', return_value=['replica1'])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def route(self, request, write=False):
+        """
+        Runs the middleware around a view that records where reads go.
+        """
+        reads = []
+
+        def view(request):
+            reads.append(self.router.db_for_read(Project))
+            if write:
+                self.router.db_for_write(Project)
+                reads.append(self.router.db_for_read(Project))
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(view)(request)
+        return reads, response
+
+    def test_safe_requests_read_from_replica(self):
+        reads, response = self.route(self.factory.get('/api/v1/projects/'))
+        self.assertEqual(reads, ['replica1'])
+        self.assertNotIn('db_primary', response.cookies)
+
+        reads, response = self.route(self.factory.post('/api/v1/projects/'), write=True)
+        self.assertEqual(reads, [None, None])
+        self.assertEqual(response.cookies['db_primary']['max-age'], 5)
+
+    def test_reads_after_a_write_use_primary(self):
+        # Запис у GET-запиті: далі в ньому ж читаємо з primary
+        reads, response = self.route(self.factory.get('/api/v1/projects/'), write=True)
+        self.assertEqual(reads, ['replica1', None])
+        self.assertIn('db_primary', response.cookies)
+
+        request = self.factory.get('/api/v1/projects/')
+        request.COOKIES['db_primary'] = '1'
+        self.assertEqual(self.route(request)[0], [None])
+
+    def test_writer_is_pinned_by_token_without_cookies(self):
+        # SPA з іншого origin: Authorization є, cookie не надсилаються
+        alice, bob = make_user('alice'), make_user('bob')
+        auth = {user: {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'} for user in (alice, bob)}
+        self.route(self.factory.post('/api/v1/projects/', **auth[alice]), write=True)
+
+        self.assertEqual(self.route(self.factory.get('/api/v1/projects/', **auth[alice]))[0], [None])
+        self.assertEqual(self.route(self.factory.get('/api/v1/projects/', **auth[bob]))[0], ['replica1'])
+
+        caches['throttle'].clear()
+        self.assertEqual(self.route(self.factory.get('/api/v1/projects/', **auth[alice]))[0], ['replica1'])
+
+    def test_anonymous_writer_is_pinned_by_ip(self):
+        self.route(self.factory.post('/api/v1/auth/register/', REMOTE_ADDR='10.0.0.1'), write=True)
+        self.assertEqual(self.route(self.factory.get('/api/v1/projects/', REMOTE_ADDR='10.0.0.1'))[0], [None])
+        self.assertEqual(self.route(self.factory.get('/api/v1/projects/', REMOTE_ADDR='10.0.0.2'))[0],
+                         ['replica1'])
+
+    def test_async_requests_touch_the_cache_off_the_event_loop(self):
+        calls = []
+
+        def record(name):
+            def call(*args, **kwargs):
+                try:
+                    asyncio.get_running_loop()
+                    calls.append((name, 'event loop'))
+                except RuntimeError:
+                    calls.append((name, 'thread'))
+            return call
+
+        async def view(request):
+            self.router.db_for_write(Project)
+            return HttpResponse()
+
+        cache = caches['throttle']
+        with mock.patch.object(cache, 'get', record('get')), mock.patch.object(cache, 'set', record('set')):
+            async_to_sync(ReplicaRoutingMiddleware(view))(self.factory.get('/api/v1/projects/'))
+        self.assertEqual(calls, [('get', 'thread'), ('set', 'thread')])
+
+    def test_transactions_and_code_outside_requests_use_primary(self):
+        self.assertIsNone(self.router.db_for_read(Project))
+
+        def view(request):
+            with transaction.atomic():
+                reads.append(self.router.db_for_read(Project))
+            return HttpResponse()
+
+        reads = []
+        ReplicaRoutingMiddleware(view)(self.factory.get('/api/v1/projects/'))
+        self.assertEqual(reads, [None])
+
+
+@override_settings(EXPORT={'CHUNK_SIZE': 2})
+class ExportTests(TestCase):
+    def setUp(self):
+        caches['throttle'].clear()
+        self.user = make_user('alice')
+        django, react = Technology.objects.create(name='Django'), Technology.objects.create(name='React')
+        self.projects = [make_project(self.user.profile, title=f'Project {i}') for i in range(5)]
+        self.projects[0].technologies.set([django, react])
+        make_project(make_user('bob').profile, title='Other')
+        Project.objects.filter(pk=self.projects[4].pk).update(
+            created_at=timezone.make_aware(datetime.datetime(2020, 5, 1)))
+        Experience.objects.create(profile=self.user.profile, company='Acme', role='Dev',
+                                  start_date=datetime.date(2021, 1, 1))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def read(self, response):
+        body = b''.join(response.streaming_content)
+        if response['Content-Type'] == 'application/gzip':
+            body = gzip.decompress(body)
+        return body.decode()
+
+    def test_ndjson_streams_projects_with_technologies_in_chunks(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/v1/export/projects.ndjson', {'username': 'alice'})
+            rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        self.assertEqual([row['id'] for row in rows], [project.pk for project in self.projects])
+        self.assertEqual(rows[0]['technologies'], ['Django', 'React'])
+        self.assertEqual(rows[0]['username'], 'alice')
+        # один запит рядків + технології на кожну з трьох порцій по 2
+        self.assertEqual(len([q for q in ctx.captured_queries if 'portfolio_project' in q['sql']]), 4)
+
+    def test_csv_gzip_and_date_filters(self):
+        response = self.client.get('/api/v1/export/projects.csv.gz', {'until': '2020-12-31'})
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="projects.csv.gz"')
+        rows = list(csv.DictReader(io.StringIO(self.read(response))))
+        self.assertEqual([row['title'] for row in rows], ['Project 4'])
+
+        response = self.client.get('/api/v1/export/experience.csv', {'since': '2021-01-01'})
+        self.assertEqual([row['company'] for row in csv.DictReader(io.StringIO(self.read(response)))], ['Acme'])
+
+    def test_errors(self):
+        self.assertEqual(self.client.get('/api/v1/export/projects.ndjson', {'since': '01.01.2020'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/export/users.ndjson').status_code, 404)
+        self.assertEqual(APIClient().get('/api/v1/export/projects.ndjson').status_code, 401)
+
+    def test_command_writes_gzip_file(self):
+        path = f'{tempfile.mkdtemp()}/projects.ndjson.gz'
+        call_command('export_data', 'projects', '--username', 'bob', '--output', path, stderr=io.StringIO())
+        with gzip.open(path, 'rt') as f:
+            self.assertEqual([json.loads(line)['title'] for line in f], ['Other'])
+
+
+class ImportTests(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.alice = make_user('alice')
+        Technology.objects.create(name='Django')
+
+    def write(self, name, text):
+        path = f'{self.dir}/{name}'
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def run_import(self, *args):
+        out = io.StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('import_data', *args, '--no-copy', stdout=out, stderr=io.StringIO())
+        return out.getvalue()
+
+    def test_ndjson_import_resolves_users_and_technologies_in_bulk(self):
+        rows = [
+            {'username': 'alice', 'title': 'Shop', 'description': 'Text', 'created_at': '2021-03-04T05:06:07Z',
+             'technologies': ['Django', 'Vue']},
+            {'username': 'bob', 'title': 'Bot', 'description': 'Text', 'github_link': 'https://github.com/bob/bot'},
+            {'username': 'bob', 'title': 'Bot again', 'description': 'Text', 'github_link': 'https://github.com/bob/bot'},
+        ]
+        path = self.write('projects.ndjson', ''.join(json.dumps(row) + '\n' for row in rows))
+        saved = []
+        receiver = lambda sender, **kwargs: saved.append(sender)
+        post_save.connect(receiver)
+        self.addCleanup(post_save.disconnect, receiver)
+        output = self.run_import('projects', path)
+        self.assertIn('Imported 2 projects', output)
+        self.assertIn('duplicates 1, new users 1, new technologies 1', output)
+        self.assertEqual(saved, [])
+
+        shop = Project.objects.get(title='Shop')
+        self.assertEqual(shop.created_at, datetime.datetime(2021, 3, 4, 5, 6, 7, tzinfo=datetime.timezone.utc))
+        self.assertEqual(sorted(shop.technologies.values_list('name', flat=True)), ['Django', 'Vue'])
+        bob = User.objects.get(username='bob')
+        self.assertEqual(bob.profile.display_name, 'bob')
+        self.assertFalse(bob.has_usable_password())
+        # Пакетні замінники сигналів: рейтинг популярних проєктів
+        self.assertEqual(TrendingProject.objects.filter(technology__isnull=True).count(), 2)
+
+    def test_csv_with_invalid_rows_and_unknown_users(self):
+        path = self.write('experience.csv', (
+            'username,company,role,start_date,end_date,description\n'
+            'alice,Acme,Dev,2020-01-01,,Backend\n'
+            'alice,Acme,Dev,not-a-date,,\n'
+            'carol,Initech,QA,2019-01-01,2020-01-01,\n'
+        ))
+        output = self.run_import('experience', path, '--skip-unknown-users')
+        self.assertIn('Imported 1 experience', output)
+        self.assertIn('invalid 1, unknown users 1', output)
+        self.assertEqual(list(Experience.objects.values_list('company', 'end_date')), [('Acme', None)])
+
+    def test_resumes_from_checkpoint(self):
+        rows = [{'username': 'alice', 'title': f'P{i}', 'description': 'Text'} for i in range(5)]
+        path = self.write('projects.jsonl', ''.join(json.dumps(row) + '\n' for row in rows))
+
+        original = Importer.import_batch
+        calls = []
+
+        def failing(importer, batch):
+            calls.append(len(batch))
+            if len(calls) == 2:
+                raise RuntimeError("connection lost")
+            return original(importer, batch)
+
+        with mock.patch.object(Importer, 'import_batch', failing), self.assertRaises(RuntimeError):
+            self.run_import('projects', path, '--batch-size', '2')
+        self.assertEqual(Project.objects.count(), 2)
+
+        output = self.run_import('projects', path, '--batch-size', '2')
+        self.assertIn('Imported 3 projects', output)
+        self.assertEqual(sorted(Project.objects.values_list('title', flat=True)), [f'P{i}' for i in range(5)])
+
+    def test_export_round_trip(self):
+        make_project(self.alice.profile, title='Exported').technologies.set(Technology.objects.all())
+        path = f'{self.dir}/projects.csv.gz'
+        call_command('export_data', 'projects', '--format', 'csv', '--output', path, stderr=io.StringIO())
+        Project.objects.all().delete()
+
+        self.run_import('projects', path)
+        project = Project.objects.get()
+        self.assertEqual((project.title, project.profile_id), ('Exported', self.alice.profile.pk))
+        self.assertEqual(list(project.technologies.values_list('name', flat=True)), ['Django'])
+
+
+def throttle_rates(**rates):
+    return override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates})
+
+
+class RateLimitTests(TestCase):
+    def setUp(self):
+        caches['throttle'].clear()
+        caches['auth'].clear()
+        view_counter.local.drain()
+        self.client = APIClient()
+        self.user = make_user('alice')
+        self.project = make_project(self.user.profile)
+        self.url = f'/api/v1/projects/{self.project.pk}/increment_views/'
+
+    @throttle_rates(increment_views='3/min')
+    def test_headers_and_rejection_without_queries(self):
+        remaining = []
+        for _ in range(3):
+            response = self.client.post(self.url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['RateLimit-Limit'], '3')
+            remaining.append(response['RateLimit-Remaining'])
+        self.assertEqual(remaining, ['2', '1', '0'])
+
+        with self.assertNumQueries(0):
+            response = self.client.post(self.url)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['RateLimit-Remaining'], '0')
+        self.assertGreater(int(response['Retry-After']), 0)
+
+        # Інший IP — окремий ліміт; інші дії не обмежені
+        self.assertEqual(self.client.post(self.url, REMOTE_ADDR='10.0.0.2').status_code, 200)
+        response = self.client.get('/api/v1/projects/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('RateLimit-Limit', response)
+
+    @throttle_rates(increment_views='2/min')
+    def test_cache_errors_fall_back_to_process_memory(self):
+        broken = mock.Mock(**{name: mock.Mock(side_effect=ConnectionError('redis is down'))
+                              for name in ('incr', 'add', 'get')})
+        with mock.patch('config.throttling.get_cache', return_value=broken), \
+                mock.patch('config.throttling._fallback_cache', LocMemCache('throttle-test', {})), \
+                self.assertLogs('config.throttling', 'WARNING'):
+            statuses = [self.client.post(self.url).status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
+
+    @throttle_rates(sync_github='1/hour')
+    def test_authenticated_clients_are_limited_per_user_before_authentication(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        self.assertEqual(self.client.post('/api/v1/projects/sync_github/').status_code, 400)
+
+        caches['auth'].clear()
+        with self.assertNumQueries(0):
+            response = self.client.post('/api/v1/projects/sync_github/', REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(response.status_code, 429)
+
+        other = make_user('bob')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(other)}')
+        self.assertEqual(self.client.post('/api/v1/projects/sync_github/').status_code, 400)
+
+    @throttle_rates(increment_views='10/min')
+    def test_previous_window_is_weighted(self):
+        with mock.patch.object(SlidingWindowThrottle, 'timer', return_value=6050.0):
+            statuses = [self.client.post(self.url).status_code for _ in range(10)]
+        self.assertEqual(statuses, [200] * 10)
+
+        # Половина попереднього вікна ще в ковзному: 10 * 0.5 + 5 = 10
+        with mock.patch.object(SlidingWindowThrottle, 'timer', return_value=6090.0):
+            statuses = [self.client.post(self.url).status_code for _ in range(6)]
+            self.assertEqual(statuses, [200] * 5 + [429])
+            response = self.client.post(self.url)
+        # Відхилені теж пораховані (7 у поточному вікні): ще один запит
+        # вміститься, коли вага попереднього впаде до 0.2 — через 18 с
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '18')
+
+        with mock.patch.object(SlidingWindowThrottle, 'timer', return_value=6240.0):
+            self.assertEqual(self.client.post(self.url).status_code, 200)
+
+    @override_settings(THROTTLING={'ENABLED': False})
+    @throttle_rates(increment_views='1/min')
+    def test_disabled(self):
+        for _ in range(3):
+            self.assertEqual(self.client.post(self.url).status_code, 200)
+
+
+class SchemaTests(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, ignore_errors=True)
+        settings_override = override_settings(OPENAPI_SCHEMA={'DIR': self.dir})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        openapi.schema_cache.clear()
+        self.addCleanup(openapi.schema_cache.clear)
+        self.client = APIClient()
+
+    def test_served_from_memory_with_etag_and_gzip(self):
+        with mock.patch.object(openapi, 'render_schema', wraps=openapi.render_schema) as render:
+            response = self.client.get('/api/v1/schema/')
+            self.assertEqual(response['Content-Type'], 'application/vnd.oai.openapi; charset=utf-8')
+            self.assertIn(b'openapi: 3.0', response.content)
+
+            with self.assertNumQueries(0):
+                response = self.client.get('/api/v1/schema/', headers={'Accept': 'application/json'})
+            schema = json.loads(response.content)
+            self.assertIn('/api/v1/portfolio/{username}/', schema['paths'])
+            self.assertEqual(response['Content-Type'], 'application/json; charset=utf-8')
+
+            response = self.client.get('/api/v1/schema/', {'format': 'json'}, headers={'Accept-Encoding': 'gzip'})
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertEqual(json.loads(gzip.decompress(response.content)), schema)
+            self.assertTrue(response['ETag'].endswith('-gzip"'))
+            self.assertIn('Accept-Encoding', response['Vary'])
+
+            response = self.client.get('/api/v1/schema/', {'format': 'json'},
+                                       headers={'Accept-Encoding': 'gzip', 'If-None-Match': response['ETag']})
+            self.assertEqual(response.status_code, 304)
+        render.assert_called_once()
+
+    def test_build_command_and_code_changes(self):
+        call_command('build_openapi_schema', stdout=io.StringIO())
+        fingerprint = openapi.code_fingerprint()
+        self.assertEqual(sorted(os.listdir(self.dir)),
+                         [f'openapi.{fingerprint}.json', f'openapi.{fingerprint}.yaml'])
+
+        # Файли поточного коду — без генерації
+        with mock.patch.object(openapi, 'render_schema') as render:
+            self.assertEqual(self.client.get('/api/v1/schema/', {'format': 'json'}).status_code, 200)
+        render.assert_not_called()
+
+        # Інший код — нова схема, старі файли прибрано
+        openapi.schema_cache.clear()
+        with mock.patch.object(openapi, 'code_fingerprint', return_value='changed'), \
+                mock.patch.object(openapi, 'render_schema', wraps=openapi.render_schema) as render:
+            self.client.get('/api/v1/schema/')
+        render.assert_called_once()
+        self.assertEqual(sorted(os.listdir(self.dir)), ['openapi.changed.json', 'openapi.changed.yaml'])
+
+    def test_fingerprint_follows_settings(self):
+        fingerprint = openapi.code_fingerprint()
+        self.assertEqual(openapi.code_fingerprint(), fingerprint)
+        with override_settings(SPECTACULAR_SETTINGS={**settings.SPECTACULAR_SETTINGS, 'VERSION': '2.0.0'}):
+            self.assertNotEqual(openapi.code_fingerprint(), fingerprint)
+
+    def test_language_requests_use_the_live_view(self):
+        with mock.patch.object(openapi, 'render_schema') as render:
+            response = self.client.get('/api/v1/schema/', {'lang': 'en-us', 'format': 'json'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+        render.assert_not_called()
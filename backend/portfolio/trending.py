@@ -0,0 +1,169 @@
+"""
+Trending projects leaderboard.
+
+``TrendingProject`` keeps one row per project for the global leaderboard
+(``technology`` is NULL) and one per (project, technology), all with the same
+score, so the top N of either list is a single range read of the
+``(technology, -score)`` index.
+
+Scores use forward decay: a view at time ``t`` weighs ``2 ** (t / HALF_LIFE)``
+(``t`` counted from ``EPOCH``) and a row stores ``log2`` of the sum of its
+weights. Every score decays at the same rate, so the ordering never has to be
+recomputed — new views are only added to the rows of the viewed projects
+when ``portfolio.counters`` flushes its buffer. The decayed value at ``now``
+is ``2 ** (score - now / HALF_LIFE)``.
+"""
+import datetime
+import math
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Project, TrendingProject
+
+DEFAULTS = {
+    # За цей час вага перегляду зменшується вдвічі (секунди)
+    'HALF_LIFE': 3 * 24 * 60 * 60,
+    'LIMIT': 20,
+    'MAX_LIMIT': 100,
+    'BATCH_SIZE': 500,
+}
+
+EPOCH = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def trending_settings():
+    return {**DEFAULTS, **getattr(settings, 'TRENDING', {})}
+
+
+def half_lives(moment):
+    return (moment - EPOCH).total_seconds() / trending_settings()['HALF_LIFE']
+
+
+def add_log2(a, b):
+    """
+    ``log2(2 ** a + 2 ** b)`` without overflow.
+    """
+    high, low = max(a, b), min(a, b)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def initial_score(views, created_at):
+    # Час давніших переглядів невідомий — вважаємо, що всі вони були в момент
+    # створення; +1, щоб нові проєкти без переглядів теж потрапляли в рейтинг
+    return math.log2(views + 1) + half_lives(created_at)
+
+
+def decayed_score(score, now=None):
+    return 2 ** (score - half_lives(now or timezone.now()))
+
+
+def sync_projects(project_ids):
+    """
+    Brings the leaderboard rows of the given projects in line with the
+    projects: creates missing rows (scored by lifetime views), updates the
+    denormalized fields and the set of technology rows. Rows of deleted
+    projects go away by cascade.
+    """
+    project_ids = set(project_ids)
+    if not project_ids:
+        return
+    batch_size = trending_settings()['BATCH_SIZE']
+
+    projects = {
+        row['pk']: row
+        for row in Project.objects.filter(pk__in=project_ids).values(
+            'pk', 'title', 'views', 'created_at', username=F('profile__user__username')
+        )
+    }
+    technologies = defaultdict(set)
+    for project_id, technology_id in Project.technologies.through.objects.filter(
+            project_id__in=projects).values_list('project_id', 'technology_id'):
+        technologies[project_id].add(technology_id)
+
+    with transaction.atomic():
+        existing = defaultdict(dict)
+        for entry in TrendingProject.objects.select_for_update().filter(project_id__in=projects).order_by('pk'):
+            existing[entry.project_id][entry.technology_id] = entry
+
+        to_create, to_update, to_delete = [], [], []
+        for pk, project in projects.items():
+            rows = existing[pk]
+            fields = {'title': project['title'], 'username': project['username'], 'views': project['views']}
+            global_row = rows.get(None)
+            score = global_row.score if global_row else initial_score(project['views'], project['created_at'])
+            for technology_id in {None} | technologies[pk]:
+                entry = rows.pop(technology_id, None)
+                if entry is None:
+                    to_create.append(TrendingProject(
+                        project_id=pk, technology_id=technology_id, score=score, **fields
+                    ))
+                elif any(getattr(entry, name) != value for name, value in fields.items()):
+                    for name, value in fields.items():
+                        setattr(entry, name, value)
+                    to_update.append(entry)
+            to_delete += [entry.pk for entry in rows.values()]
+
+        TrendingProject.objects.bulk_create(to_create, batch_size=batch_size)
+        TrendingProject.objects.bulk_update(to_update, ['title', 'username', 'views'], batch_size=batch_size)
+        if to_delete:
+            TrendingProject.objects.filter(pk__in=to_delete).delete()
+
+
+def record_views(counts, now=None):
+    """
+    Adds flushed views (``{project id: amount}``) to the scores of the
+    projects' rows. Called by ``portfolio.counters`` after ``Project.views``
+    has been updated.
+    """
+    if not counts:
+        return
+    now_units = half_lives(now or timezone.now())
+    with transaction.atomic():
+        entries = list(
+            TrendingProject.objects.select_for_update().filter(project_id__in=counts).order_by('pk')
+        )
+        for entry in entries:
+            amount = counts[entry.project_id]
+            entry.score = add_log2(entry.score, math.log2(amount) + now_units)
+            entry.views += amount
+        TrendingProject.objects.bulk_update(entries, ['score', 'views'], batch_size=trending_settings()['BATCH_SIZE'])
+
+    # Проєкти без рядків (створені пакетно, до запуску рейтингу): їхні
+    # Project.views уже містять ці перегляди
+    sync_projects(set(counts) - {entry.project_id for entry in entries})
+
+
+def top_projects(technology_id=None, limit=None):
+    config = trending_settings()
+    limit = max(1, min(limit or config['LIMIT'], config['MAX_LIMIT']))
+    if technology_id is None:
+        queryset = TrendingProject.objects.filter(technology__isnull=True)
+    else:
+        queryset = TrendingProject.objects.filter(technology_id=technology_id)
+    return list(queryset.order_by('-score')[:limit])
+
+
+def rebuild(progress=None):
+    """
+    Recreates the leaderboard from lifetime views in one transaction, so
+    readers keep seeing the old rows until it commits. Returns the number of
+    projects.
+    """
+    batch_size = trending_settings()['BATCH_SIZE']
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            # Читання (ACCESS SHARE) не блокуються; record_views чекає до кінця
+            # перебудови і додає свої перегляди вже до нових рядків
+            with connection.cursor() as cursor:
+                cursor.execute(f'LOCK TABLE {TrendingProject._meta.db_table} IN EXCLUSIVE MODE')
+        project_ids = list(Project.objects.order_by('pk').values_list('pk', flat=True))
+        TrendingProject.objects.all().delete()
+        for start in range(0, len(project_ids), batch_size):
+            sync_projects(project_ids[start:start + batch_size])
+            if progress:
+                progress(min(start + batch_size, len(project_ids)), len(project_ids))
+    return len(project_ids)
@@ -0,0 +1,8 @@
+from django.urls import path, re_path
+from .views import ExportView, PortfolioView
+
+urlpatterns = [
+    path('portfolio/<str:username>/', PortfolioView.as_view(), name='portfolio'),
+    re_path(r'^export/(?P<dataset>projects|experience|education)\.(?P<fmt>ndjson|csv)(?P<gz>\.gz)?$',
+            ExportView.as_view(), name='export'),
+]
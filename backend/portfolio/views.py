@@ -1,17 +1,38 @@
 from django.shortcuts import render
 from rest_framework import viewsets, permissions, status, filters
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.negotiation import BaseContentNegotiation
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
-import requests
-from urllib.parse import urlparse
+from rest_framework.views import APIView
+from django.db import IntegrityError, transaction
 from django.db.models import Q
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from config.background import submit_on_commit
+from config.throttling import RateLimitMixin
+from users.cache import cache_profile_response
+from users.models import UserProfile
 from users.permissions import IsOwnerOrReadOnly
 
-from .models import Technology, Project, Experience, Education
+from .aggregate import DEFAULT_PROJECTS_LIMIT, MAX_PROJECTS_LIMIT, get_portfolio
+from .autocomplete import technology_index
+from .bulk import BulkWriteMixin
+from .counters import view_counter, visitor_fingerprint
+from .export import FORMATS, export_stream, parse_date
+from .filters import RankedOrderingFilter
+from .github import active_job, github_username_from_url, run_sync_job_async
+from .pagination import ProjectPagination, StandardResultsSetPagination
+from .search import search_projects
+from .snapshots import snapshot_for_request
+from .trending import top_projects
+
+from .models import Technology, Project, Experience, Education, GitHubSyncJob
 from .serializers import (
     TechnologySerializer, ProjectSerializer,
-    ExperienceSerializer, EducationSerializer
+    ExperienceSerializer, EducationSerializer, GitHubSyncJobSerializer,
+    PortfolioSerializer, TrendingProjectSerializer
 )
 
 
@@ -25,54 +46,132 @@ class TechnologyViewSet(viewsets.ModelViewSet):
     filter_backends = [filters.SearchFilter]
     search_fields = ['name']
 
+    @action(detail=False, methods=['get'], permission_classes=[permissions.AllowAny])
+    def autocomplete(self, request):
+        """
+        GET /api/v1/technologies/autocomplete/?q=<префікс>&limit=N
+
+        Підказки з індексу в пам'яті (без запитів до БД): технології, назва
+        яких або будь-яке слово в ній починається з q, найпопулярніші першими.
+        """
+        try:
+            limit = int(request.query_params.get('limit', 0)) or None
+        except ValueError:
+            limit = None
+        return Response(technology_index.search(request.query_params.get('q', ''), limit))
 
-class StandardResultsSetPagination(PageNumberPagination):
-    page_size = 15
-    page_size_query_param = 'page_size'
-    max_page_size = 100
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(RateLimitMixin, BulkWriteMixin, viewsets.ModelViewSet):
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
-    pagination_class = StandardResultsSetPagination
-    filter_backends = [filters.OrderingFilter]
+    pagination_class = ProjectPagination
+    filter_backends = [RankedOrderingFilter]
     ordering_fields = ['views', 'created_at', 'title']
     ordering = ['-views', '-created_at']
 
     def get_queryset(self):
-        queryset = Project.objects.all()
-        
+        # Серіалізатор читає profile.user.username, profile.profile_picture
+        # і technologies — тягнемо їх одразу, а не окремим запитом на рядок.
+        queryset = Project.objects.select_related('profile__user').prefetch_related('technologies')
+
         # Filtering by username
         username = self.request.query_params.get('username')
         if username is not None:
             queryset = queryset.filter(profile__user__username=username)
 
-        # Filtering by search query (title)
+        # Повнотекстовий пошук за назвою, описом і технологіями
+        # (?search_mode=simple — звичайний icontains без ранжування)
         search_query = self.request.query_params.get('search')
         if search_query:
-            queryset = queryset.filter(title__icontains=search_query)
+            queryset = search_projects(
+                queryset, search_query, mode=self.request.query_params.get('search_mode')
+            )
 
         return queryset
 
+    @cache_profile_response('projects')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         """
         Автоматично прив'язуємо профіль залогіненого користувача
         до нового проєкту.
         """
-        serializer.save(profile=self.request.user.profile)
+        self.save_project(serializer, profile=self.request.user.profile)
+
+    def perform_update(self, serializer):
+        self.save_project(serializer)
 
-    @action(detail=True, methods=['post'], permission_classes=[permissions.AllowAny])
+    def save_project(self, serializer, **kwargs):
+        """
+        ProjectSerializer перевіряє, що github_link не повторюється в профілі,
+        але два одночасні запити можуть пройти перевірку обидва — тоді
+        project_unique_github_link відхиляє другий, і це теж 400, а не 500.
+        """
+        try:
+            with transaction.atomic():
+                serializer.save(**kwargs)
+        except IntegrityError:
+            link = serializer.validated_data.get('github_link')
+            profile = kwargs.get('profile') or serializer.instance.profile
+            duplicates = Project.objects.filter(profile=profile, github_link=link)
+            if serializer.instance is not None:
+                duplicates = duplicates.exclude(pk=serializer.instance.pk)
+            if not link or not duplicates.exists():
+                raise
+            raise ValidationError({'github_link': [ProjectSerializer.duplicate_link_message]})
+
+    @action(detail=True, methods=['post'], permission_classes=[permissions.AllowAny],
+            throttle_scope='increment_views')
     def increment_views(self, request, pk=None):
-        project = self.get_object()
-        project.views += 1
-        project.save()
-        return Response({'views': project.views}, status=status.HTTP_200_OK)
+        """
+        Рахує перегляд без запису в БД: інкремент потрапляє в буфер
+        (portfolio.counters) і пізніше скидається в Project.views пакетом.
+        Повертає оцінку поточної кількості переглядів.
+        """
+        try:
+            project_id = int(pk)
+        except (TypeError, ValueError):
+            raise Http404
 
-    @action(detail=False, methods=['post'], permission_classes=[permissions.IsAuthenticated])
+        views = view_counter.record(project_id, visitor_fingerprint(request))
+        if views is None:
+            raise Http404
+        return Response({'views': views}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], permission_classes=[permissions.AllowAny])
+    def trending(self, request):
+        """
+        GET /api/v1/projects/trending/?technology=<id>&limit=N
+
+        Популярні зараз проєкти з попередньо обчисленого рейтингу
+        (portfolio.trending): перегляди з часом втрачають вагу.
+        ?technology — рейтинг серед проєктів з цією технологією.
+        """
+        technology = request.query_params.get('technology')
+        try:
+            technology_id = int(technology) if technology else None
+            limit = int(request.query_params.get('limit', 0)) or None
+        except ValueError:
+            return Response(
+                {"error": "Параметри technology і limit мають бути числами."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        serializer = TrendingProjectSerializer(
+            top_projects(technology_id, limit), many=True, context={'request': request, 'now': timezone.now()}
+        )
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['post'], permission_classes=[permissions.IsAuthenticated],
+            throttle_scope='sync_github')
     def sync_github(self, request):
         """
         Кастомний ендпоінт для синхронізації проєктів з GitHub.
-        Він спрацює на POST /api/v1/projects/sync-github/
+        Він спрацює на POST /api/v1/projects/sync_github/
+
+        Синхронізація виконується у фоні: відповідь 202 містить задачу,
+        стан якої можна опитувати через sync_github/<id>/.
         """
 
         profile = request.user.profile
@@ -85,67 +184,37 @@ class ProjectViewSet(viewsets.ModelViewSet):
             )
 
         try:
-            # Парсимо URL, щоб отримати шлях
-            path_parts = urlparse(github_url).path.split('/')
-            # Очищуємо від можливих порожніх рядків
-            username = [part for part in path_parts if part][-1]
+            username = github_username_from_url(github_url)
         except Exception as e:
             return Response(
                 {"error": f"Не вдалося розпарсити GitHub username з URL: {github_url}. Помилка: {e}"},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # запит до GitHub API
-        api_url = f"https://api.github.com/users/{username}/repos"
-        headers = {'Accept': 'application/vnd.github.v3+json'}
-
-        try:
-            api_response = requests.get(api_url, headers=headers)
-            api_response.raise_for_status()
-            repos = api_response.json()
-        except requests.RequestException as e:
-            return Response(
-                {"error": f"Помилка при зверненні до GitHub API: {e}"},
-                status=status.HTTP_503_SERVICE_UNAVAILABLE
-            )
-
-        synced_count = 0
-        created_count = 0
-
-        for repo in repos:
-            # Ми не хочемо імпортувати форки
-            if repo['fork']:
-                continue
-
-            # Використовуємо update_or_create для уникнення дублікатів
-            # Він знаходить проєкт за 'github_link' або створює новий
-            project, created = Project.objects.update_or_create(
-                github_link=repo['html_url'],
-                defaults={
-                    'profile': profile,
-                    'title': repo['name'],
-                    'description': repo['description'] or "",
-                    'live_link': repo['homepage'] or "",
-                    # 'technologies' доведеться додати вручну пізніше
-                }
-            )
-
-            synced_count += 1
-            if created:
-                created_count += 1
-
-        # Повертаємо успішну відповідь
-        return Response(
-            {
-                "message": "Синхронізація пройшла успішно",
-                "total_synced": synced_count,
-                "newly_created": created_count,
-            },
-            status=status.HTTP_200_OK
-        )
+        # Не запускаємо другу синхронізацію, поки попередня ще не завершилась
+        # (завислі задачі active_job закриває). Перевірка і створення — під
+        # тим самим блокуванням профілю, що й upsert_repos, інакше два
+        # одночасні запити створять дві задачі
+        with transaction.atomic():
+            UserProfile.objects.select_for_update().only('pk').get(pk=profile.pk)
+            job = active_job(profile)
+            if job is None:
+                job = GitHubSyncJob.objects.create(profile=profile, github_username=username)
+                submit_on_commit(run_sync_job_async, job.pk)
+
+        return Response(GitHubSyncJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated],
+            url_path=r'sync_github/(?P<job_id>\d+)')
+    def sync_github_status(self, request, job_id=None):
+        """
+        Стан фонової синхронізації з GitHub.
+        """
+        job = get_object_or_404(GitHubSyncJob, pk=job_id, profile=request.user.profile)
+        return Response(GitHubSyncJobSerializer(job).data)
 
 
-class ExperienceViewSet(viewsets.ModelViewSet):
+class ExperienceViewSet(BulkWriteMixin, viewsets.ModelViewSet):
     serializer_class = ExperienceSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
 
@@ -160,11 +229,15 @@ class ExperienceViewSet(viewsets.ModelViewSet):
 
         return Experience.objects.none()
 
+    @cache_profile_response('experience')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(profile=self.request.user.profile)
 
 
-class EducationViewSet(viewsets.ModelViewSet):
+class EducationViewSet(BulkWriteMixin, viewsets.ModelViewSet):
     queryset = Education.objects.all()
     serializer_class = EducationSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
@@ -177,8 +250,88 @@ class EducationViewSet(viewsets.ModelViewSet):
         serializer.save(profile=self.request.user.profile)
 
 
+class PortfolioView(APIView):
+    """
+    GET /api/v1/portfolio/<username>/ — профіль, проєкти з технологіями,
+    досвід і освіта одним запитом замість чотирьох.
+
+    ?projects_limit=N — скільки проєктів повернути (за замовчуванням 15, максимум 100);
+    ?counts=1 — додати кількість записів у кожному розділі.
+
+    На ?counts=1 (сторінка профілю) віддає готовий знімок (portfolio.snapshots), якщо він є.
+    """
+    permission_classes = [permissions.AllowAny]
+    serializer_class = PortfolioSerializer
+
+    def get(self, request, username):
+        if request.accepted_renderer.format == 'json':
+            content = snapshot_for_request(request, username)
+            if content is not None:
+                response = HttpResponse(content, content_type='application/json')
+                response['X-Snapshot'] = 'HIT'
+                return response
+        # cache_profile_response бере username з kwargs
+        return self.get_live(request, username=username)
+
+    @cache_profile_response('portfolio')
+    def get_live(self, request, username):
+        try:
+            projects_limit = int(request.query_params.get('projects_limit', DEFAULT_PROJECTS_LIMIT))
+        except ValueError:
+            projects_limit = DEFAULT_PROJECTS_LIMIT
+        projects_limit = max(0, min(projects_limit, MAX_PROJECTS_LIMIT))
+        with_counts = request.query_params.get('counts') in ('1', 'true')
+
+        profile = get_portfolio(username, projects_limit, with_counts)
+        if profile is None:
+            raise Http404
+        serializer = PortfolioSerializer(profile, context={'request': request})
+        return Response(serializer.data)
 
 
+class StreamContentNegotiation(BaseContentNegotiation):
+    """
+    Формат відповіді задає URL, а не Accept (помилки — JSON).
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
 
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
 
 
+class ExportView(RateLimitMixin, APIView):
+    """
+    GET /api/v1/export/<projects|experience|education>.<ndjson|csv>[.gz]
+
+    Потокове вивантаження всіх записів (portfolio.export) без пагінації.
+    ?username=<username> — лише записи користувача;
+    ?since=YYYY-MM-DD, ?until=YYYY-MM-DD — за датою створення проєкту
+    або початку досвіду/навчання (включно).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    content_negotiation_class = StreamContentNegotiation
+    throttle_scope = 'export'
+
+    def get(self, request, dataset, fmt, gz=None):
+        params = request.query_params
+        try:
+            filters = {
+                'username': params.get('username') or None,
+                'since': parse_date(params.get('since'), 'since'),
+                'until': parse_date(params.get('until'), 'until'),
+            }
+        except ValueError as e:
+            raise ValidationError({str(e): ["Невірна дата, очікується РРРР-ММ-ДД."]})
+
+        compress = bool(gz)
+        filename = f'{dataset}.{fmt}' + ('.gz' if compress else '')
+        response = StreamingHttpResponse(
+            export_stream(dataset, fmt, compress=compress, **filters),
+            content_type='application/gzip' if compress else f'{FORMATS[fmt]}; charset=utf-8',
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        # Не буферизувати у проксі — рядки йдуть клієнту одразу
+        response['X-Accel-Buffering'] = 'no'
+        return response
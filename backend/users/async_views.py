@@ -0,0 +1,18 @@
+from django.shortcuts import aget_object_or_404
+
+from config.async_views import AsyncAPIView
+
+from .cache import cache_async_profile_response
+from .models import UserProfile
+from .serializers import UserProfileSerializer
+
+
+class ProfileByUsernameView(AsyncAPIView):
+    """
+    GET /api/v1/async/profiles/by-username/<username>/
+    """
+
+    @cache_async_profile_response('profile')
+    async def get(self, request, username):
+        profile = await aget_object_or_404(UserProfile.objects.select_related('user'), user__username=username)
+        return self.render(self.serialize(UserProfileSerializer, profile))
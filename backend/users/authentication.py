@@ -0,0 +1,75 @@
+"""
+JWT authentication with cached user resolution.
+
+``CachedJWTAuthentication`` loads the token's user together with its profile
+once and keeps it in ``AUTH_USER_CACHE['CACHE_ALIAS']`` (a bounded LRU with
+TTL). ``request.user.profile`` is then available without queries.
+Entries are dropped by ``users.signals`` when a User or UserProfile changes.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+DEFAULTS = {
+    'CACHE_ALIAS': 'auth',
+    'TIMEOUT': 60,
+}
+
+
+def user_cache_settings():
+    return {**DEFAULTS, **getattr(settings, 'AUTH_USER_CACHE', {})}
+
+
+def get_cache():
+    return caches[user_cache_settings()['CACHE_ALIAS']]
+
+
+def _key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def invalidate_users(user_ids):
+    keys = [_key(user_id) for user_id in user_ids if user_id]
+    if keys:
+        get_cache().delete_many(keys)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def load_user(self, user_id):
+        cache = get_cache()
+        user = cache.get(_key(user_id))
+        if user is not None:
+            return user
+        try:
+            user = (
+                self.user_model.objects
+                .select_related('profile')
+                .get(**{api_settings.USER_ID_FIELD: user_id})
+            )
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+        cache.set(_key(user_id), user, timeout=user_cache_settings()['TIMEOUT'])
+        return user
+
+    def get_user(self, validated_token):
+        # Ті самі перевірки, що й у JWTAuthentication.get_user, але без запиту до БД
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = self.load_user(user_id)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
@@ -0,0 +1,191 @@
+"""
+Per-profile cache for public portfolio responses.
+
+Cached entries are keyed by a per-username version stored in the same cache
+(``PROFILE_CACHE['CACHE_ALIAS']``). Any change to a profile's data replaces
+the version, which makes all of that profile's entries unreachable at once.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.dispatch import Signal
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+from .models import UserProfile
+
+DEFAULTS = {
+    'CACHE_ALIAS': 'portfolio',
+    'TIMEOUT': 5 * 60,
+    # Кешування можна вимкнути для окремого ендпоінта
+    'ENDPOINTS': {},
+}
+
+# Надсилається з usernames=set() після скидання кешу профілів — дані змінились
+profiles_invalidated = Signal()
+
+
+def cache_settings():
+    return {**DEFAULTS, **getattr(settings, 'PROFILE_CACHE', {})}
+
+
+def get_cache():
+    return caches[cache_settings()['CACHE_ALIAS']]
+
+
+def endpoint_enabled(endpoint):
+    return cache_settings()['ENDPOINTS'].get(endpoint, True)
+
+
+def _version_key(username):
+    return f'profile-cache:version:{username}'
+
+
+def _new_version():
+    # Не лічильник: якщо ключ версії витіснять, нова версія все одно
+    # не співпаде зі старими записами.
+    return time.time_ns()
+
+
+def profile_version(username, cache=None):
+    cache = cache or get_cache()
+    key = _version_key(username)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_usernames(usernames):
+    usernames = {username for username in usernames if username}
+    if usernames:
+        get_cache().set_many({_version_key(username): _new_version() for username in usernames}, timeout=None)
+        profiles_invalidated.send(sender=None, usernames=usernames)
+
+
+def invalidate_profiles(profile_ids):
+    """
+    Invalidates cached responses of the given profiles (ids).
+    """
+    profile_ids = {profile_id for profile_id in profile_ids if profile_id}
+    if profile_ids:
+        invalidate_usernames(
+            UserProfile.objects.filter(pk__in=profile_ids).values_list('user__username', flat=True)
+        )
+
+
+def _count(cache, endpoint, outcome):
+    key = f'profile-cache:stats:{endpoint}:{outcome}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+CACHED_ENDPOINTS = []
+
+
+def cache_stats(endpoints=None):
+    """
+    {'projects': {'hit': 10, 'miss': 2}, ...}
+    """
+    cache = get_cache()
+    endpoints = endpoints or CACHED_ENDPOINTS
+    keys = {
+        (endpoint, outcome): f'profile-cache:stats:{endpoint}:{outcome}'
+        for endpoint in endpoints for outcome in ('hit', 'miss')
+    }
+    values = cache.get_many(list(keys.values()))
+    stats = {endpoint: {'hit': 0, 'miss': 0} for endpoint in endpoints}
+    for (endpoint, outcome), key in keys.items():
+        stats[endpoint][outcome] = values.get(key, 0)
+    return stats
+
+
+def _response_key(cache, endpoint, username, url):
+    version = profile_version(username, cache)
+    digest = hashlib.md5(url.encode()).hexdigest()
+    return f'profile-cache:{endpoint}:{username}:{version}:{digest}'
+
+
+def lookup_response(endpoint, username, url):
+    """
+    (key, cached value or None); counts the hit or miss.
+    """
+    cache = get_cache()
+    key = _response_key(cache, endpoint, username, url)
+    cached = cache.get(key)
+    _count(cache, endpoint, 'miss' if cached is None else 'hit')
+    return key, cached
+
+
+def store_response(key, value):
+    get_cache().set(key, value, timeout=cache_settings()['TIMEOUT'])
+
+
+def cache_profile_response(endpoint):
+    """
+    Caches successful anonymous GET responses of a viewset method per profile.
+    The username comes from the ``username`` URL kwarg or query parameter.
+    """
+    CACHED_ENDPOINTS.append(endpoint)
+
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            username = kwargs.get('username') or request.query_params.get('username')
+            if (
+                not username
+                or request.method != 'GET'
+                or request.user.is_authenticated
+                or not endpoint_enabled(endpoint)
+            ):
+                return view_method(self, request, *args, **kwargs)
+
+            key, cached = lookup_response(endpoint, username, request.build_absolute_uri())
+            if cached is not None:
+                response = Response(cached)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                store_response(key, response.data)
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+
+def cache_async_profile_response(endpoint):
+    """
+    The same for ``config.async_views`` handlers (anonymous by design).
+    The rendered JSON body is cached, so a hit returns it as is.
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        async def wrapper(self, request, *args, **kwargs):
+            username = kwargs.get('username') or request.GET.get('username')
+            if not username or not endpoint_enabled(endpoint):
+                return await view_method(self, request, *args, **kwargs)
+
+            # Один перехід у потік на обидва звернення до кешу
+            key, cached = await sync_to_async(lookup_response)(endpoint, username, request.build_absolute_uri())
+            if cached is not None:
+                response = HttpResponse(cached, content_type='application/json')
+                response['X-Cache'] = 'HIT'
+                return response
+
+            response = await view_method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                await sync_to_async(store_response)(key, response.content)
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:32
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+def fill_search_names(apps, schema_editor):
+    from users.search import profile_names
+
+    UserProfile = apps.get_model('users', 'UserProfile')
+    batch = []
+    for profile in UserProfile.objects.select_related('user').iterator(chunk_size=2000):
+        user = profile.user
+        profile.display_name, profile.search_name = profile_names(user.username, user.first_name, user.last_name)
+        batch.append(profile)
+        if len(batch) >= 2000:
+            UserProfile.objects.bulk_update(batch, ['display_name', 'search_name'])
+            batch = []
+    UserProfile.objects.bulk_update(batch, ['display_name', 'search_name'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_userprofile_profile_picture_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='display_name',
+            field=models.CharField(blank=True, editable=False, max_length=300, verbose_name="Ім'я для показу"),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='search_name',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(fill_search_names, migrations.RunPython.noop),
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_name'], name='profile_search_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['search_name'], name='profile_search_name_prefix', opclasses=['text_pattern_ops']),
+        ),
+    ]
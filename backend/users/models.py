@@ -1,8 +1,13 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.contrib.auth.models import User
 import uuid
 import os
 
+from config.dirty_fields import DirtyFieldsMixin
+
+from .search import profile_names
+
 def unique_profile_pic_path(instance, filename):
     ext = filename.split('.')[-1]
     filename = f"{uuid.uuid4()}.{ext}"
@@ -13,23 +18,40 @@ def unique_resume_path(instance, filename):
     filename = f"{uuid.uuid4()}.{ext}"
     return os.path.join('resumes', filename)
 
-class UserProfile(models.Model):
+class UserProfile(DirtyFieldsMixin, models.Model):
     """
     Model for user profile
     """
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     bio = models.TextField(blank=True, verbose_name="Про себе")
     profile_picture = models.ImageField(upload_to=unique_profile_pic_path, null=True, blank=True, verbose_name="Фото профілю")
+    # Маніфест зменшених WebP/AVIF копій (config.images)
+    profile_picture_variants = models.JSONField(default=dict, blank=True, editable=False,
+                                                verbose_name="Варіанти фото профілю")
     resume_cv = models.FileField(upload_to=unique_resume_path, null=True, blank=True, verbose_name="Резюме")
     github_url = models.URLField(max_length=255, blank=True)
     linkedin_url = models.URLField(max_length=255, blank=True)
+    # Денормалізовано з User для пошуку без join'ів (users.search); оновлюється в save()
+    display_name = models.CharField(max_length=300, blank=True, editable=False, verbose_name="Ім'я для показу")
+    search_name = models.TextField(blank=True, editable=False)
 
     def __str__(self):
         return f"Профіль: {self.user.username}"
 
+    def save(self, *args, **kwargs):
+        user = self.user
+        self.display_name, self.search_name = profile_names(user.username, user.first_name, user.last_name)
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Профіль користувача"
         verbose_name_plural = "Профілі користувачів"
+        indexes = [
+            # LIKE '%q%' і схожість слів (%>)
+            GinIndex(fields=['search_name'], opclasses=['gin_trgm_ops'], name='profile_search_name_trgm'),
+            # LIKE 'q%' — префікс username для коротких запитів
+            models.Index(fields=['search_name'], opclasses=['text_pattern_ops'], name='profile_search_name_prefix'),
+        ]
 
 
 
@@ -12,10 +12,11 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
             return True
 
         # Write permissions are only allowed to the owner of the snippet.
-        # Check if obj has 'user' attribute or 'profile.user'
-        if hasattr(obj, 'user'):
-            return obj.user == request.user
-        if hasattr(obj, 'profile'):
-            return obj.profile.user == request.user
-        
+        # Порівнюємо id, не завантажуючи obj.user / obj.profile.user
+        if hasattr(obj, 'user_id'):
+            return obj.user_id == request.user.pk
+        if hasattr(obj, 'profile_id'):
+            profile = getattr(request.user, 'profile', None)
+            return profile is not None and obj.profile_id == profile.pk
+
         return False
@@ -0,0 +1,68 @@
+"""
+Profile search.
+
+Matching runs against ``UserProfile.search_name`` — a denormalized,
+lower-cased "username first last" kept up to date by ``UserProfile.save``.
+One filter over one column, no joins to ``auth_user``:
+
+* queries shorter than ``MIN_TRIGRAM_LENGTH`` only match a username prefix
+  (``LIKE 'q%'``, btree ``text_pattern_ops`` index);
+* longer ones match a substring (``LIKE '%q%'``) or, on PostgreSQL, a
+  similar word (``%>``), both served by the trigram GIN index.
+
+Results are ranked: exact username, username prefix, a name starting with
+the query, the rest (by trigram word similarity on PostgreSQL).
+"""
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections
+from django.db.models import Case, IntegerField, Q, Value, When
+
+MIN_TRIGRAM_LENGTH = 3
+MAX_QUERY_LENGTH = 100
+
+
+def normalize(text):
+    return ' '.join(text.lower().split())[:MAX_QUERY_LENGTH]
+
+
+def profile_names(username, first_name, last_name):
+    """
+    (display_name, search_name) for UserProfile.
+    """
+    full_name = ' '.join(part for part in (first_name.strip(), last_name.strip()) if part)
+    display_name = full_name or username
+    search_name = normalize(' '.join(part for part in (username, full_name) if part))
+    return display_name, search_name
+
+
+def search_profiles(queryset, text):
+    """
+    Filters ``queryset`` by ``text`` and orders it by relevance.
+    """
+    text = normalize(text)
+    if not text:
+        return queryset
+
+    username_exact = Q(search_name=text) | Q(search_name__startswith=f'{text} ')
+    username_prefix = Q(search_name__startswith=text)
+    if len(text) < MIN_TRIGRAM_LENGTH or ' ' in text and len(text.replace(' ', '')) < MIN_TRIGRAM_LENGTH:
+        condition = username_prefix
+    else:
+        condition = Q(search_name__contains=text)
+        if connections[queryset.db].vendor == 'postgresql':
+            condition |= Q(search_name__trigram_word_similar=text)
+
+    queryset = queryset.filter(condition).annotate(
+        match_rank=Case(
+            When(username_exact, then=Value(3)),
+            When(username_prefix, then=Value(2)),
+            When(search_name__contains=f' {text}', then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    )
+    ordering = ['-match_rank']
+    if connections[queryset.db].vendor == 'postgresql':
+        queryset = queryset.annotate(similarity=TrigramWordSimilarity(text, 'search_name'))
+        ordering.append('-similarity')
+    return queryset.order_by(*ordering, 'search_name', 'pk')
@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from config.images import SrcsetField
+from config.metrics import TimedSerializerMixin
 from .models import UserProfile
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Серіалайзер для стандартної моделі User
     """
@@ -11,23 +13,25 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ['username', 'email', 'first_name', 'last_name']
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Серіалайзер для нашого Профілю.
     Він також включає в себе дані з UserSerializer
     (через 'user = UserSerializer()')
     """
     user = UserSerializer(read_only=True)
+    profile_picture_srcset = SrcsetField(source='profile_picture_variants')
 
     class Meta:
         model = UserProfile
         fields = [
-            'id', 'user', 'bio', 'profile_picture',
+            'id', 'user', 'display_name', 'bio', 'profile_picture', 'profile_picture_srcset',
             'resume_cv', 'github_url', 'linkedin_url'
         ]
+        read_only_fields = ['display_name']
 
 
-class RegisterSerializer(serializers.ModelSerializer):
+class RegisterSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
     confirm_password = serializers.CharField(write_only=True)
 
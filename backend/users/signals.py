@@ -1,8 +1,15 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.contrib.auth.models import User
 from django.dispatch import receiver
+from config.images import schedule_variants, variants_generated
+from .authentication import invalidate_users
+from .cache import invalidate_profiles, invalidate_usernames
 from .models import UserProfile
 
+# Поля User, з яких складаються display_name і search_name профілю
+NAME_FIELDS = {'username', 'first_name', 'last_name'}
+
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -13,8 +20,66 @@ def create_user_profile(sender, instance, created, **kwargs):
         UserProfile.objects.create(user=instance)
 
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
+def save_user_profile(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """
+    Оновлює денормалізовані імена профілю, коли змінюється ім'я User.
+    Профіль записується лише якщо імена справді змінились (DirtyFieldsMixin).
+    """
+    if created or raw:
+        # Новий профіль щойно створено вже з іменами
+        return
+    if update_fields is not None and not NAME_FIELDS & set(update_fields):
+        return
+    try:
+        profile = instance.profile
+    except UserProfile.DoesNotExist:
+        return
+    profile.save()
+
+@receiver([post_save, post_delete], sender=User)
+@receiver([post_save, post_delete], sender=UserProfile)
+def invalidate_profile_cache(sender, instance, **kwargs):
+    """
+    Скидає кешовані публічні відповіді профілю після коміту змін.
+    """
+    username = instance.username if sender is User else instance.user.username
+    transaction.on_commit(lambda: invalidate_usernames([username]))
+
+
+@receiver(pre_save, sender=User)
+def invalidate_renamed_user_cache(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Після зміни username скидає і відповіді, закешовані під старим іменем.
     """
-    Зберігає профіль, коли зберігається об'єкт User.
+    if raw or instance.pk is None or (update_fields is not None and 'username' not in update_fields):
+        return
+    old_username = User.objects.filter(pk=instance.pk).values_list('username', flat=True).first()
+    if old_username and old_username != instance.username:
+        transaction.on_commit(lambda: invalidate_usernames([old_username]))
+
+
+@receiver([post_save, post_delete], sender=User)
+@receiver([post_save, post_delete], sender=UserProfile)
+def invalidate_auth_user_cache(sender, instance, **kwargs):
+    """
+    Скидає закешованого для JWT користувача (разом з профілем).
     """
-    instance.profile.save()
\ No newline at end of file
+    user_id = instance.pk if sender is User else instance.user_id
+    invalidate_users([user_id])
+    # Повторно після коміту: паралельний запит міг закешувати старі дані
+    transaction.on_commit(lambda: invalidate_users([user_id]))
+
+
+@receiver(post_save, sender=UserProfile)
+def generate_profile_picture_variants(sender, instance, raw=False, **kwargs):
+    """
+    Ставить у чергу генерацію зменшених копій фото профілю.
+    """
+    if not raw:
+        schedule_variants(instance, 'profile_picture', 'profile_picture_variants')
+
+
+@receiver(variants_generated, sender=UserProfile)
+def invalidate_profile_cache_on_variants(sender, pk, **kwargs):
+    invalidate_profiles([pk])
+    invalidate_users(UserProfile.objects.filter(pk=pk).values_list('user_id', flat=True))
@@ -1,3 +1,272 @@
-from django.test import TestCase
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from config.media import HashedFileSystemStorage, content_hash
+from portfolio.models import Project
+
+from .models import UserProfile
+
+
+class ProfileByUsernameCacheTests(TestCase):
+    def setUp(self):
+        caches['portfolio'].clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='alice', password='pass12345')
+        self.url = '/api/v1/profiles/by-username/alice/'
+
+    def test_profile_is_cached_until_it_changes(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.profile.bio = 'Backend developer'
+            self.user.profile.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['bio'], 'Backend developer')
+
+    def test_rename_invalidates_responses_under_the_old_username(self):
+        Project.objects.create(profile=self.user.profile, title='Project', description='Text')
+        urls = [self.url, '/api/v1/projects/?username=alice', '/api/v1/portfolio/alice/']
+        for url in urls:
+            self.client.get(url)
+            self.assertEqual(self.client.get(url)['X-Cache'], 'HIT', url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.username = 'alice2'
+            self.user.save()
+
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        response = self.client.get('/api/v1/projects/?username=alice')
+        self.assertEqual((response['X-Cache'], response.data['count']), ('MISS', 0))
+        self.assertEqual(self.client.get('/api/v1/portfolio/alice/').status_code, 404)
+
+    def test_missing_profile_is_not_cached(self):
+        self.assertEqual(self.client.get('/api/v1/profiles/by-username/nobody/').status_code, 404)
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user(username='nobody', password='pass12345')
+        self.assertEqual(self.client.get('/api/v1/profiles/by-username/nobody/').status_code, 200)
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        caches['auth'].clear()
+        self.user = User.objects.create_user(username='alice', password='pass12345')
+        self.client = self.client_for(self.user)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        return client
+
+    def identity_queries(self, queries):
+        return [q['sql'] for q in queries if 'FROM "auth_user"' in q['sql'] or 'FROM "users_userprofile"' in q['sql']]
+
+    def test_user_and_profile_come_from_cache(self):
+        with self.assertNumQueries(1):
+            # користувач разом з профілем одним запитом
+            self.assertEqual(self.client.get('/api/v1/me/').data['user']['username'], 'alice')
+        with self.assertNumQueries(0):
+            self.client.get('/api/v1/me/')
+
+    def test_write_path_has_no_identity_queries(self):
+        self.client.get('/api/v1/me/')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post('/api/v1/projects/', {'title': 'New', 'description': 'Text'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.identity_queries(ctx.captured_queries), [])
+
+        project_url = f'/api/v1/projects/{response.data["id"]}/'
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.patch(project_url, {'title': 'Renamed'}, format='json').status_code, 200)
+        # Лише JOIN у вибірці самого проєкту, без окремих запитів за власником
+        self.assertEqual([sql for sql in self.identity_queries(ctx.captured_queries)
+                          if 'portfolio_project' not in sql], [])
+
+    def test_ownership_is_checked_by_id(self):
+        project = Project.objects.create(profile=self.user.profile, title='Mine', description='Text')
+        bob = User.objects.create_user(username='bob', password='pass12345')
+        response = self.client_for(bob).patch(f'/api/v1/projects/{project.pk}/', {'title': 'Hacked'}, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(
+            self.client.patch(f'/api/v1/projects/{project.pk}/', {'title': 'Ok'}, format='json').status_code, 200
+        )
+
+    def test_changes_invalidate_cached_user(self):
+        self.client.get('/api/v1/me/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.profile.bio = 'Updated'
+            self.user.profile.save()
+        self.assertEqual(self.client.get('/api/v1/me/').data['bio'], 'Updated')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertEqual(self.client.get('/api/v1/me/').status_code, 401)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        self.assertEqual(self.client.get('/api/v1/me/').status_code, 401)
+
+
+class ProfileSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        for username, first, last in [
+            ('anna', 'Anna', 'Kovalenko'),
+            ('annabel', '', ''),
+            ('ivan', 'Ivan', 'Annaniev'),
+            ('petro', 'Petro', 'Shevchenko'),
+        ]:
+            User.objects.create_user(username=username, password='pass12345', first_name=first, last_name=last)
+        self.url = '/api/v1/profiles/'
+
+    def search(self, text):
+        response = self.client.get(self.url, {'search': text})
+        self.assertEqual(response.status_code, 200)
+        return [profile['user']['username'] for profile in response.data['results']]
+
+    def test_results_are_ranked(self):
+        # точний username, префікс username, слово в імені
+        self.assertEqual(self.search('Anna'), ['anna', 'annabel', 'ivan'])
+        self.assertEqual(self.search('shev'), ['petro'])
+
+    def test_short_query_matches_username_prefix_only(self):
+        self.assertEqual(self.search('an'), ['anna', 'annabel'])
+        self.assertEqual(self.search('ko'), [])
+
+    def test_search_is_one_filter_without_user_join(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {'search': 'anna'})
+        self.assertEqual(response.data['count'], 3)
+        for query in ctx.captured_queries:
+            where = query['sql'].split('WHERE', 1)[-1]
+            self.assertNotIn('auth_user', where)
+
+    def test_renaming_user_updates_search_name(self):
+        user = User.objects.get(username='petro')
+        user.first_name = 'Annette'
+        user.save()
+        user.profile.refresh_from_db()
+        self.assertEqual(user.profile.display_name, 'Annette Shevchenko')
+        self.assertIn('petro', self.search('annette'))
+
+
+class MediaServingTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.body = b'%PDF-1.4 ' + bytes(range(256)) * 40
+        profile = User.objects.create_user(username='alice', password='pass12345').profile
+        profile.resume_cv.save('cv.pdf', ContentFile(self.body))
+        self.name = profile.resume_cv.name
+        self.url = profile.resume_cv.url
+
+    def get(self, url=None, **headers):
+        response = self.client.get(url or self.url, headers=headers)
+        if response.streaming:
+            response.content_bytes = b''.join(response.streaming_content)
+            response.close()
+        return response
+
+    def test_name_has_content_hash_and_url_is_immutable(self):
+        self.assertRegex(self.name, r'^resumes/[0-9a-f-]+\.[0-9a-f]{16}\.pdf$')
+        with self.assertNumQueries(0):
+            response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content_bytes, self.body)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['Content-Length'], str(len(self.body)))
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+        self.assertEqual(self.get(**{'If-None-Match': response['ETag']}).status_code, 304)
+
+    def test_forged_hash_in_upload_name_is_replaced(self):
+        storage = HashedFileSystemStorage()
+        digest = content_hash(ContentFile(self.body))
+
+        name = storage.save('resumes/fake.0123456789abcdef.pdf', ContentFile(self.body))
+        self.assertEqual(name, f'resumes/fake.{digest}.pdf')
+
+        self.assertEqual(storage.save(f'resumes/cv.{digest}.pdf', ContentFile(self.body)), f'resumes/cv.{digest}.pdf')
+
+    def test_range_requests(self):
+        size = len(self.body)
+        response = self.get(Range='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{size}')
+        self.assertEqual(response.content_bytes, self.body[10:20])
+
+        response = self.get(Range='bytes=-5')
+        self.assertEqual(response.content_bytes, self.body[-5:])
+        self.assertEqual(self.get(Range=f'bytes={size}-').status_code, 416)
+        # Інша версія файлу — весь файл
+        response = self.get(Range='bytes=0-9', **{'If-Range': '"stale"'})
+        self.assertEqual((response.status_code, response.content_bytes), (200, self.body))
+
+    def test_front_server_backends_send_no_body(self):
+        with override_settings(MEDIA_SERVING={'BACKEND': 'x-accel-redirect'}):
+            response = self.get()
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.name}')
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+
+        with override_settings(MEDIA_SERVING={'BACKEND': 'x-sendfile'}):
+            response = self.get()
+        self.assertTrue(response['X-Sendfile'].endswith(self.name))
+
+    def test_paths_outside_media_root(self):
+        self.assertEqual(self.get('/media/../manage.py').status_code, 404)
+        self.assertEqual(self.get('/media/resumes/').status_code, 404)
+        self.assertEqual(self.get('/media/resumes/missing.pdf').status_code, 404)
+
+
+class ProfileSaveCascadeTests(TestCase):
+    def writes(self, queries):
+        return [q['sql'] for q in queries if q['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))]
+
+    def profile_updates(self, queries):
+        return [q['sql'] for q in queries if q['sql'].startswith('UPDATE "users_userprofile"')]
+
+    def test_registration_writes_user_and_profile_once(self):
+        data = {'username': 'alice', 'password': 'pass12345', 'confirm_password': 'pass12345',
+                'first_name': 'Alice', 'last_name': 'Smith'}
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(APIClient().post('/api/v1/register/', data, format='json').status_code, 201)
+        writes = self.writes(ctx.captured_queries)
+        self.assertEqual(len(writes), 2)
+        self.assertEqual(User.objects.get(username='alice').profile.display_name, 'Alice Smith')
+
+    def test_user_save_updates_profile_only_when_names_change(self):
+        user = User.objects.create_user(username='alice', password='pass12345')
+        user = User.objects.select_related('profile').get(pk=user.pk)
+        user.email = 'alice@example.com'
+        with CaptureQueriesContext(connection) as ctx:
+            user.save()
+        self.assertEqual(self.profile_updates(ctx.captured_queries), [])
+
+        user.last_name = 'Smith'
+        with CaptureQueriesContext(connection) as ctx:
+            user.save()
+        [profile_update] = self.profile_updates(ctx.captured_queries)
+        self.assertNotIn('"bio"', profile_update)
+        self.assertEqual(UserProfile.objects.get(user=user).display_name, 'Smith')
+
+        with self.assertNumQueries(1):
+            user.save(update_fields=['last_login'])
@@ -1,38 +1,36 @@
 from django.shortcuts import render
 
-from rest_framework import viewsets, permissions, generics, filters
+from rest_framework import viewsets, permissions, generics
 from rest_framework.decorators import action
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.contrib.auth.models import User
-from django.db.models import Q
 from django.shortcuts import get_object_or_404
+from portfolio.pagination import StandardResultsSetPagination
+from .cache import cache_profile_response
 from .models import UserProfile
+from .search import search_profiles
 from .serializers import UserProfileSerializer, RegisterSerializer
 from .permissions import IsOwnerOrReadOnly
 
 class UserProfileViewSet(viewsets.ModelViewSet):
     serializer_class = UserProfileSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['user__username', 'user__first_name', 'user__last_name']
+    pagination_class = StandardResultsSetPagination
 
     def get_queryset(self):
-        queryset = UserProfile.objects.all()
+        queryset = UserProfile.objects.select_related('user').order_by('pk')
+        # Один фільтр по денормалізованому search_name з ранжуванням (users.search)
         search_query = self.request.query_params.get('search', None)
         if search_query:
-            queryset = queryset.filter(
-                Q(user__username__icontains=search_query) |
-                Q(user__first_name__icontains=search_query) |
-                Q(user__last_name__icontains=search_query)
-            )
+            queryset = search_profiles(queryset, search_query)
         return queryset
 
     @action(detail=False, methods=['get'], url_path='by-username/(?P<username>[^/.]+)')
+    @cache_profile_response('profile')
     def retrieve_by_username(self, request, username=None):
-        user = get_object_or_404(User, username=username)
-        # Check if profile exists, if not 404
-        profile = get_object_or_404(UserProfile, user=user)
+        # Один запит замість двох: профіль разом з користувачем
+        profile = get_object_or_404(UserProfile.objects.select_related('user'), user__username=username)
         serializer = self.get_serializer(profile)
         return Response(serializer.data)
 
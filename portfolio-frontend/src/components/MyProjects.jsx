@@ -52,8 +52,17 @@ const MyProjects = ({ user }) => {
         setError('');
         setSuccess('');
         try {
-            const response = await api.post('projects/sync_github/');
-            setSuccess(`Синхронізовано: ${response.data.total_synced}, Нових: ${response.data.newly_created}`);
+            // Синхронізація йде у фоні — опитуємо стан задачі, поки вона не завершиться
+            let { data: job } = await api.post('projects/sync_github/');
+            while (job.status === 'pending' || job.status === 'running') {
+                await new Promise(resolve => setTimeout(resolve, 1000));
+                ({ data: job } = await api.get(`projects/sync_github/${job.id}/`));
+            }
+            if (job.status === 'failed') {
+                setError(job.error || 'Помилка синхронізації. Перевірте GitHub URL у налаштуваннях.');
+                return;
+            }
+            setSuccess(`Синхронізовано: ${job.total_synced}, Нових: ${job.newly_created}`);
             fetchProjects();
         } catch (err) {
             console.error(err);
@@ -49,7 +49,7 @@ const ProjectModal = ({ project = null, onClose, onSave }) => {
             }
 
             try {
-                const response = await axios.get(`http://127.0.0.1:8000/api/v1/technologies/?search=${techSearch}`);
+                const response = await axios.get(`http://127.0.0.1:8000/api/v1/technologies/autocomplete/?q=${encodeURIComponent(techSearch)}`);
                 // Filter out already selected technologies
                 const filtered = response.data.filter(
                     tech => !selectedTechnologies.some(selected => selected.id === tech.id)
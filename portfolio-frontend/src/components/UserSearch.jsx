@@ -30,7 +30,7 @@ const UserSearch = () => {
             if (query.trim()) {
                 try {
                     const response = await api.get(`profiles/?search=${encodeURIComponent(query)}`);
-                    setResults(response.data);
+                    setResults(response.data.results);
                     setShowDropdown(true);
                 } catch (error) {
                     console.error('Search error:', error);
@@ -76,7 +76,7 @@ const UserSearch = () => {
                             )}
                             <div className="search-info">
                                 <span className="search-name">
-                                    {profile.user.first_name || profile.user.username}
+                                    {profile.display_name}
                                 </span>
                                 <span className="search-username">@{profile.user.username}</span>
                             </div>
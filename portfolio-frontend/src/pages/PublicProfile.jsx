@@ -20,14 +20,17 @@ const PublicProfile = () => {
             setLoading(true);
             setError(null);
             try {
-                const profileRes = await api.get(`profiles/by-username/${username}/`);
-                setProfile(profileRes.data);
-
-                // Fetch projects
-                await fetchProjects(`projects/?username=${username}`);
-
-                // Fetch experiences
-                await fetchExperiences(username);
+                // Профіль, перша сторінка проєктів і досвід — одним запитом
+                const { data } = await api.get(`portfolio/${username}/?counts=1`);
+                setProfile(data.profile);
+                setProjects(data.projects);
+                setExperiences(data.experience);
+                setPrevPage(null);
+                setNextPage(
+                    data.counts.projects > data.projects.length
+                        ? `projects/?username=${username}&page=2`
+                        : null
+                );
             } catch (err) {
                 console.error(err);
                 if (err.response && err.response.status === 404) {
@@ -58,15 +61,6 @@ const PublicProfile = () => {
         }
     };
 
-    const fetchExperiences = async (username) => {
-        try {
-            const response = await api.get(`experience/?username=${username}`);
-            setExperiences(response.data);
-        } catch (err) {
-            console.error("Error fetching experiences:", err);
-        }
-    };
-
     const formatDate = (dateString) => {
         if (!dateString) return 'Теперішній час';
         const date = new Date(dateString);